@@ -1,11 +1,16 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
+# Bundle the tablebase next to the package modules when it has been built
+datas = []
+if os.path.exists('src\\orbito\\data\\orbito.tb'):
+    datas.append(('src\\orbito\\data\\orbito.tb', 'orbito\\data'))
 
 a = Analysis(
     ['src\\orbito\\main.py'],
     pathex=['src'],
     binaries=[],
-    datas=[],
+    datas=datas,
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,127 @@
+"""
+Perft: count the move sequences of a given length.
+
+``perft(game, depth)`` returns the number of leaf nodes after ``depth``
+full plies (place a ball, then orbit). A finished game has no moves, so
+lines that end early are not counted. The counts exercise the move
+generation, the orbit and the win detection; a change in any of them
+changes the numbers in ``EXPECTED``.
+
+Usage:
+    python benchmarks/perft.py 5
+    python benchmarks/perft.py 4 --position midgame-6 --divide
+"""
+import argparse
+import sys
+import time
+
+from orbito.core.game import OrbitGame
+
+# Fixed positions, as the cell indices (row * 4 + col) played from the start
+POSITIONS = {
+    'start': [],
+    'midgame-4': [5, 10, 0, 15],
+    'midgame-6': [12, 12, 6, 0, 5, 13],
+    'midgame-8': [1, 2, 2, 7, 5, 15, 5, 5],
+}
+
+# Known leaf counts by position, from depth 1
+EXPECTED = {
+    'start': [16, 240, 3360, 43680, 524160, 5765760],
+    'midgame-4': [12, 132, 1320, 11880, 93600, 636356],
+    'midgame-6': [10, 90, 648, 4424, 24012, 116060],
+    'midgame-8': [8, 56, 294, 1290, 4752, 9312],
+}
+
+
+def make_position(name):
+    """
+    Build one of the fixed positions.
+
+    Args:
+        name (str): Key of POSITIONS
+
+    Returns:
+        OrbitGame: Game after the moves of the position
+    """
+    game = OrbitGame()
+    for index in POSITIONS[name]:
+        if not game.push(index >> 2, index & 3) or game.move_made:
+            raise ValueError(f"{name}: move {index} is not playable")
+    return game
+
+
+def perft(game, depth):
+    """
+    Count the leaf nodes after a number of full plies.
+
+    Args:
+        game (OrbitGame): Position to expand, left unchanged
+        depth (int): Number of plies
+
+    Returns:
+        int: Number of move sequences of length ``depth``
+    """
+    if game.move_made or game.is_board_full():
+        return 0
+    empty = [index for index in range(16) if not (game.white | game.black) >> index & 1]
+    if depth == 1:
+        return len(empty)
+    nodes = 0
+    for index in empty:
+        game.push(index >> 2, index & 3)
+        nodes += perft(game, depth - 1)
+        game.pop()
+    return nodes
+
+
+def divide(game, depth):
+    """
+    Split the perft count by root move.
+
+    Args:
+        game (OrbitGame): Position to expand, left unchanged
+        depth (int): Number of plies, the root move included
+
+    Returns:
+        dict[tuple[int, int], int]: Leaf count below each root move
+    """
+    counts = {}
+    for index in range(16):
+        if game.is_valid_move(index >> 2, index & 3):
+            game.push(index >> 2, index & 3)
+            counts[divmod(index, 4)] = perft(game, depth - 1) if depth > 1 else 1
+            game.pop()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('depth', type=int, help="Number of plies")
+    parser.add_argument('--position', default='start', choices=sorted(POSITIONS),
+                        help="Position to start from")
+    parser.add_argument('--divide', action='store_true',
+                        help="Print the count below every root move")
+    args = parser.parse_args(argv)
+
+    game = make_position(args.position)
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(game, args.depth)
+        for (row, col), count in sorted(counts.items()):
+            print(f"({row}, {col}): {count}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(game, args.depth)
+    elapsed = time.perf_counter() - start
+    print(f"perft({args.depth}) from {args.position}: {nodes} in {elapsed:.2f}s")
+    known = EXPECTED[args.position]
+    expected = known[args.depth - 1] if 0 < args.depth <= len(known) else None
+    if expected is not None and nodes != expected:
+        print(f"MISMATCH: expected {expected}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
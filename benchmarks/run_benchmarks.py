@@ -0,0 +1,194 @@
+"""
+Run the Orbito benchmark suite.
+
+Times perft and the hot functions of the rules and the engines, checks
+the perft counts, and prints the results as JSON. With ``--baseline``,
+compares against an earlier result file and fails when a benchmark got
+slower by more than ``--threshold``.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --baseline before.json --threshold 0.15
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+
+from perft import EXPECTED, make_position, perft
+
+from orbito.core.ai import MCTSAI, MinimaxAI
+from orbito.core.ai.evaluator import evaluate_position
+from orbito.core.game import OrbitGame
+
+# Depth of the timed perft runs, by position
+PERFT_DEPTHS = {'start': 5, 'midgame-4': 5, 'midgame-6': 5, 'midgame-8': 6}
+
+
+def measure(func, repeat=5):
+    """
+    Time a callable.
+
+    The number of calls per run is chosen so that a run lasts at least
+    0.2 seconds; the fastest of ``repeat`` runs is kept.
+
+    Args:
+        func (callable): Function to time, called without arguments
+        repeat (int): Number of runs
+
+    Returns:
+        float: Seconds per call
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def bench_perft():
+    results = {}
+    for name, depth in PERFT_DEPTHS.items():
+        game = make_position(name)
+        elapsed = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            nodes = perft(game, depth)
+            elapsed = min(elapsed, time.perf_counter() - start)
+        expected = EXPECTED[name][depth - 1]
+        if nodes != expected:
+            raise AssertionError(f"perft({depth}) from {name}: {nodes}, expected {expected}")
+        results[f"perft/{name}/{depth}"] = {
+            'seconds': elapsed, 'nodes': nodes, 'nodes_per_second': nodes / elapsed}
+    return results
+
+
+def bench_rules():
+    game = make_position('midgame-6')
+    results = {}
+
+    # A game of its own, since every orbit moves the marbles on
+    orbit_game = make_position('midgame-6')
+
+    def orbit():
+        # Without a move this turn, orbit_move returns at once
+        orbit_game.move_made = True
+        orbit_game.orbit_move()
+
+    results['rules/orbit_move'] = {'seconds': measure(orbit)}
+    results['rules/check_win_for_player'] = {
+        'seconds': measure(lambda: game.check_win_for_player(1))}
+    results['rules/push_pop'] = {
+        'seconds': measure(lambda: (game.push(0, 1), game.pop()))}
+    results['eval/evaluate_position'] = {
+        'seconds': measure(lambda: evaluate_position(game, 2))}
+    try:
+        import numpy as np
+        from orbito.core.ai.batch_eval import evaluate_batch
+    except ImportError:
+        return results
+    boards = np.random.default_rng(0).integers(0, 3, (100000, 16)).astype(np.int8)
+    seconds = measure(lambda: evaluate_batch(boards, 1), repeat=3)
+    results['eval/evaluate_batch_100k'] = {
+        'seconds': seconds, 'boards_per_second': len(boards) / seconds}
+
+    from orbito.core.batch import BatchOrbitGame
+    plies = []
+
+    def random_games():
+        batch = BatchOrbitGame(10000)
+        batch.play_random(np.random.default_rng(0))
+        plies.append(int(batch.plies.sum()))
+
+    seconds = measure(random_games, repeat=3)
+    results['batch/random_games_10k'] = {
+        'seconds': seconds, 'plies_per_second': plies[0] / seconds}
+    return results
+
+
+def bench_engines():
+    results = {}
+    for name in ('start', 'midgame-4'):
+        for difficulty in ('easy', 'medium', 'hard'):
+            game = make_position(name)
+            # Deterministic engines start every search from an empty table
+            ai = MinimaxAI(game.current_player, difficulty, deterministic=True)
+            seconds = measure(lambda: ai.get_best_move(game), repeat=3)
+            results[f"minimax/{difficulty}/{name}"] = {'seconds': seconds, 'nodes': ai.nodes}
+
+    game = OrbitGame()
+    seconds = measure(lambda: MCTSAI(1, playouts=5000, seed=0).get_best_move(game), repeat=3)
+    results['mcts/5000_playouts/start'] = {
+        'seconds': seconds, 'playouts_per_second': 5000 / seconds}
+    return results
+
+
+def run_all():
+    """
+    Run every benchmark.
+
+    Returns:
+        dict: Machine description and ``benchmarks`` mapping each
+            benchmark name to its measurements; ``seconds`` is always
+            present and lower is better
+    """
+    benchmarks = {}
+    for suite in (bench_perft, bench_rules, bench_engines):
+        benchmarks.update(suite())
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'benchmarks': benchmarks,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Find the benchmarks that got slower than in a baseline.
+
+    Args:
+        results (dict): Output of ``run_all``
+        baseline (dict): Earlier output of ``run_all``
+        threshold (float): Allowed slowdown, e.g. 0.1 for 10%
+
+    Returns:
+        list[str]: One message per regression
+    """
+    regressions = []
+    for name, old in baseline['benchmarks'].items():
+        new = results['benchmarks'].get(name)
+        if new is None:
+            continue
+        ratio = new['seconds'] / old['seconds']
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {old['seconds']:.3g}s -> {new['seconds']:.3g}s "
+                               f"({(ratio - 1) * 100:+.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--output', help="Also write the JSON results to this file")
+    parser.add_argument('--baseline', help="Earlier JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Allowed slowdown against the baseline (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    results = run_all()
+    text = json.dumps(results, indent=2, sort_keys=True)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(text + '\n')
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
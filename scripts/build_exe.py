@@ -1,7 +1,15 @@
+import os
+
+# Bundle the tablebase next to the package modules when it has been built
+TABLEBASE = os.path.join("src", "orbito", "data", "orbito.tb")
+
 build_exe_options = {
     "packages": ["tkinter"],
     "includes": ["orbito.core", "orbito.gui"],
-    "include_files": [],
+    "include_files": (
+        [(TABLEBASE, os.path.join("lib", "orbito", "data", "orbito.tb"))]
+        if os.path.exists(TABLEBASE) else []
+    ),
     "excludes": [],
     "build_exe": "./build/exe"  # Spécifie explicitement le dossier de build
 }
\ No newline at end of file
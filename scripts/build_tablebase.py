@@ -0,0 +1,34 @@
+"""
+Generate the Orbito tablebase.
+
+Solves every position reachable from the empty board (or only the
+positions with at least ``--min-pieces`` balls) and writes the result
+to a file that ``Tablebase.load`` can read. Requires NumPy.
+
+Usage:
+    python scripts/build_tablebase.py orbito.tb --min-pieces 8
+"""
+import argparse
+import sys
+import time
+
+from orbito.core.ai.tablebase import generate_tablebase
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('output', help="Destination file")
+    parser.add_argument('--min-pieces', type=int, default=0,
+                        help="Only keep positions with at least this many balls")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    tablebase = generate_tablebase(min_pieces=args.min_pieces, progress=print)
+    tablebase.save(args.output)
+    print(f"{len(tablebase)} positions written to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
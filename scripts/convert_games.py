@@ -0,0 +1,46 @@
+"""
+Convert game record files to and from text.
+
+The text form has one game per line, in the notation of
+``orbito.core.records``. Converting to binary appends to the output file.
+
+Usage:
+    python scripts/convert_games.py to-text games.orb games.txt
+    python scripts/convert_games.py from-text games.txt games.orb --evals --times
+"""
+import argparse
+import sys
+
+from orbito.core.records import FLAG_EVALS, FLAG_TIMES, GameRecord, GameWriter, read_games
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('direction', choices=('to-text', 'from-text'))
+    parser.add_argument('source', help="File to convert")
+    parser.add_argument('output', help="Destination file")
+    parser.add_argument('--evals', action='store_true',
+                        help="Store move evaluations in the binary file")
+    parser.add_argument('--times', action='store_true',
+                        help="Store move times in the binary file")
+    args = parser.parse_args(argv)
+
+    count = 0
+    if args.direction == 'to-text':
+        with open(args.output, 'w') as output:
+            for record in read_games(args.source):
+                output.write(record.to_text() + '\n')
+                count += 1
+    else:
+        flags = (FLAG_EVALS if args.evals else 0) | (FLAG_TIMES if args.times else 0)
+        with open(args.source) as source, GameWriter(args.output, flags) as writer:
+            for line in source:
+                if line.strip():
+                    writer.write(GameRecord.from_text(line))
+                    count += 1
+    print(f"{count} games written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Export labelled training positions as sharded .npy arrays.
+
+Positions are read from game record files (see ``orbito-arena --record``)
+and/or random self-play games, deduplicated by symmetry class, optionally
+labelled with a minimax search and written to OUTPUT/positions-*.npy.
+Requires NumPy.
+
+Usage:
+    python scripts/export_dataset.py data --records match.orb --depth 6
+    python scripts/export_dataset.py data --random-games 1000000
+"""
+import argparse
+import itertools
+import sys
+import time
+
+import numpy as np
+
+from orbito.core.ai.dataset import export_dataset, random_positions, record_positions
+from orbito.core.records import read_games
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('output', help="Destination directory")
+    parser.add_argument('--records', nargs='+', default=[], metavar='FILE',
+                        help="Game record files to read")
+    parser.add_argument('--random-games', type=int, default=0,
+                        help="Number of random self-play games to add")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the random games")
+    parser.add_argument('--depth', type=int,
+                        help="Label every position with a search of this depth")
+    parser.add_argument('--shard-size', type=int, default=1 << 20,
+                        help="Positions per shard")
+    parser.add_argument('--keep-duplicates', action='store_true',
+                        help="Write every position, even if an equivalent one was written")
+    args = parser.parse_args(argv)
+
+    sources = [record_positions(read_games(path)) for path in args.records]
+    if args.random_games:
+        sources.append(random_positions(args.random_games, np.random.default_rng(args.seed)))
+
+    start = time.perf_counter()
+
+    def progress(writer):
+        print(f"\r{writer.positions} positions, {writer.duplicates} duplicates",
+              end='', file=sys.stderr, flush=True)
+
+    writer = export_dataset(itertools.chain(*sources), args.output, args.shard_size,
+                            not args.keep_duplicates, args.depth, progress)
+    print(file=sys.stderr)
+    print(f"{writer.positions} positions in {len(writer.shards)} shards written to "
+          f"{args.output} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Tune the evaluation weights on the outcomes of a position dataset.
+
+Reads the shards written by ``scripts/export_dataset.py``, fits the
+weights with logistic regression (Texel tuning) and writes them to a
+JSON parameter file, which ``MinimaxAI(weights=...)``, the ``Weights``
+option of ``orbito-engine`` and ``orbito-arena minimax:weights=FILE``
+load. Requires NumPy.
+
+Usage:
+    python scripts/tune_weights.py data weights.json
+    orbito-arena minimax:weights=weights.json minimax --games 1000
+"""
+import argparse
+import sys
+import time
+
+from orbito.core.ai.dataset import load_dataset
+from orbito.core.ai.evaluator import load_weights, save_weights
+from orbito.core.ai.tuning import tune_weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('dataset', help="Dataset directory")
+    parser.add_argument('output', help="Destination parameter file")
+    parser.add_argument('--start', metavar='FILE',
+                        help="Parameter file of the starting weights (default: built-in)")
+    parser.add_argument('--iterations', type=int, default=10, help="Maximum Newton steps")
+    parser.add_argument('--l2', type=float, default=1e-4,
+                        help="Pull towards the starting weights")
+    args = parser.parse_args(argv)
+
+    shards = load_dataset(args.dataset)
+    if not shards:
+        parser.error(f"no shards in {args.dataset}")
+    weights = load_weights(args.start) if args.start else None
+    start = time.perf_counter()
+
+    def progress(step, loss):
+        print(f"pass {step}: loss {loss:.5f} ({time.perf_counter() - start:.1f}s)")
+
+    result = tune_weights(shards, weights, args.iterations, args.l2, progress=progress)
+    save_weights(args.output, result.weights)
+    print(f"{sum(len(shard) for shard in shards)} positions, scale {result.scale:.5f}, "
+          f"loss {result.initial_loss:.5f} -> {result.loss:.5f}")
+    print(f"weights written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,428 @@
+"""
+Headless self-play arena comparing two engine configurations.
+
+Games are played in a process pool. Every opening (a few random moves) is
+played twice with the colours swapped, so neither side profits from a
+lucky opening or from moving first. Results are reported as win/draw/loss
+counts for the first configuration with its Elo difference and a 95%
+confidence interval. An optional sequential probability ratio test
+(SPRT) stops the match as soon as the result is statistically clear.
+
+Engines are described by specs such as ``minimax:difficulty=hard`` or
+``mcts:playouts=2000,seed=1``: an engine name followed by constructor
+arguments.
+
+Usage:
+    orbito-arena minimax:difficulty=hard minimax:difficulty=medium --games 1000
+    orbito-arena mcts:time_limit_ms=50 minimax:time_limit_ms=50 --sprt 0 20
+    orbito-arena minimax mcts --games 200 --record match.orb
+"""
+import argparse
+import math
+import os
+import random
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .core.ai.mcts import MCTSAI
+from .core.ai.minmax import MinimaxAI
+from .core.game import OrbitGame
+from .core import records
+
+ENGINES = {'minimax': MinimaxAI, 'mcts': MCTSAI}
+
+# Result of a game for the first configuration
+WIN = 1.0
+DRAW = 0.5
+LOSS = 0.0
+
+
+def parse_spec(text):
+    """
+    Parse an engine spec.
+
+    Args:
+        text (str): ``engine[:name=value,...]``; integer values are
+            converted to int
+
+    Returns:
+        dict: ``engine`` name plus constructor arguments
+
+    Raises:
+        ValueError: If the engine is unknown or an argument is malformed
+    """
+    name, _, args = text.partition(':')
+    if name not in ENGINES:
+        raise ValueError(f"unknown engine: {name}")
+    spec = {'engine': name}
+    for item in filter(None, args.split(',')):
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"invalid engine argument: {item}")
+        spec[key] = int(value) if value.lstrip('-').isdigit() else value
+    return spec
+
+
+def make_engine(spec, player):
+    """
+    Create an engine from a spec.
+
+    Args:
+        spec (dict): Output of ``parse_spec``
+        player (int): Player the engine plays
+
+    Returns:
+        BaseAI: New engine
+    """
+    kwargs = {key: value for key, value in spec.items() if key != 'engine'}
+    return ENGINES[spec['engine']](player, **kwargs)
+
+
+def random_opening(rng, plies):
+    """
+    Draw random opening moves that do not end the game.
+
+    Args:
+        rng (random.Random): Random generator
+        plies (int): Number of moves
+
+    Returns:
+        list[int]: Cell indices of the moves
+    """
+    game = OrbitGame()
+    moves = []
+    for _ in range(plies):
+        candidates = []
+        for index in range(16):
+            if game.push(index >> 2, index & 3):
+                if not (game.move_made or game.is_board_full()):
+                    candidates.append(index)
+                game.pop()
+        if not candidates:
+            break
+        index = rng.choice(candidates)
+        game.push(index >> 2, index & 3)
+        moves.append(index)
+    return moves
+
+
+def play_game(spec_a, spec_b, opening, a_is_white):
+    """
+    Play one game between two configurations.
+
+    Args:
+        spec_a (dict): First configuration
+        spec_b (dict): Second configuration
+        opening (list[int]): Cell indices played before the engines move
+        a_is_white (bool): The first configuration plays White
+
+    Returns:
+        tuple[float, list[int]]: (result for the first configuration,
+            every move of the game as cell indices)
+    """
+    white_spec, black_spec = (spec_a, spec_b) if a_is_white else (spec_b, spec_a)
+    engines = {1: make_engine(white_spec, 1), 2: make_engine(black_spec, 2)}
+    game = OrbitGame()
+    moves = []
+    try:
+        for index in opening:
+            game.push(index >> 2, index & 3)
+            moves.append(index)
+        while not (game.move_made or game.is_board_full()):
+            row, col = engines[game.current_player].get_best_move(game)
+            for engine in engines.values():
+                engine.notify_move(row, col)
+            game.push(row, col)
+            moves.append(row * 4 + col)
+    finally:
+        for engine in engines.values():
+            engine.close()
+
+    white_wins = game.check_win_for_player(1)
+    black_wins = game.check_win_for_player(2)
+    if white_wins == black_wins:
+        return DRAW, moves
+    return (WIN if white_wins == a_is_white else LOSS), moves
+
+
+def game_record(result, moves, a_is_white):
+    """
+    Build the record of an arena game.
+
+    Args:
+        result (float): Result for the first configuration
+        moves (list[int]): Every move of the game as cell indices
+        a_is_white (bool): The first configuration played White
+
+    Returns:
+        GameRecord: Record with the result seen from White
+    """
+    if result == DRAW:
+        return records.GameRecord(moves, records.DRAW)
+    white_won = (result == WIN) == a_is_white
+    return records.GameRecord(moves, records.WHITE_WINS if white_won else records.BLACK_WINS)
+
+
+def elo_difference(score):
+    """
+    Convert an expected score to an Elo difference.
+
+    Args:
+        score (float): Expected score between 0 and 1
+
+    Returns:
+        float: Elo difference, infinite for scores of 0 or 1
+    """
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return 400 * math.log10(score / (1 - score))
+
+
+def expected_score(elo):
+    """
+    Convert an Elo difference to an expected score.
+
+    Args:
+        elo (float): Elo difference
+
+    Returns:
+        float: Expected score between 0 and 1
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+class MatchResult:
+    """
+    Running score of a match, from the point of view of the first engine.
+
+    Attributes:
+        wins, draws, losses (int): Game counts
+    """
+
+    def __init__(self):
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    def add(self, result):
+        """
+        Count a game.
+
+        Args:
+            result (float): WIN, DRAW or LOSS
+        """
+        if result == WIN:
+            self.wins += 1
+        elif result == DRAW:
+            self.draws += 1
+        else:
+            self.losses += 1
+
+    @property
+    def games(self):
+        """int: Number of games counted."""
+        return self.wins + self.draws + self.losses
+
+    def score(self):
+        """
+        Get the mean score per game.
+
+        Returns:
+            float: Score between 0 and 1, 0.5 before any game
+        """
+        if not self.games:
+            return 0.5
+        return (self.wins + 0.5 * self.draws) / self.games
+
+    def variance(self):
+        """
+        Get the variance of the score of one game.
+
+        Returns:
+            float: Variance of the per-game score
+        """
+        if not self.games:
+            return 0.0
+        mean = self.score()
+        return (self.wins * (1 - mean) ** 2 + self.draws * (0.5 - mean) ** 2
+                + self.losses * mean ** 2) / self.games
+
+    def elo(self):
+        """
+        Estimate the Elo difference.
+
+        Returns:
+            float: Elo of the first engine relative to the second
+        """
+        return elo_difference(self.score())
+
+    def elo_interval(self, z=1.96):
+        """
+        Get a confidence interval of the Elo difference.
+
+        Args:
+            z (float): Normal quantile, 1.96 for 95% confidence
+
+        Returns:
+            tuple[float, float]: (low, high) Elo bounds
+        """
+        if not self.games:
+            return -math.inf, math.inf
+        margin = z * math.sqrt(self.variance() / self.games)
+        score = self.score()
+        return elo_difference(score - margin), elo_difference(score + margin)
+
+    def llr(self, elo0, elo1):
+        """
+        Get the log-likelihood ratio of H1 (``elo1``) against H0 (``elo0``).
+
+        Uses the normal approximation of the per-game score distribution.
+
+        Args:
+            elo0 (float): Elo difference under the null hypothesis
+            elo1 (float): Elo difference under the alternative hypothesis
+
+        Returns:
+            float: Log-likelihood ratio, 0 while the variance is unknown
+        """
+        variance = self.variance()
+        if not variance:
+            return 0.0
+        score0, score1 = expected_score(elo0), expected_score(elo1)
+        return (self.games * (score1 - score0) * (2 * self.score() - score0 - score1)
+                / (2 * variance))
+
+    def summary(self):
+        """
+        Describe the match in one line.
+
+        Returns:
+            str: Game counts, score and Elo with its 95% interval
+        """
+        low, high = self.elo_interval()
+        return (f"{self.games} games: +{self.wins} ={self.draws} -{self.losses}  "
+                f"score {self.score():.3f}  Elo {self.elo():+.1f} "
+                f"[{low:+.1f}, {high:+.1f}]")
+
+
+def sprt_bounds(alpha=0.05, beta=0.05):
+    """
+    Get the stopping bounds of the SPRT.
+
+    Args:
+        alpha (float): Probability of accepting H1 when H0 holds
+        beta (float): Probability of accepting H0 when H1 holds
+
+    Returns:
+        tuple[float, float]: (lower, upper) LLR bounds
+    """
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+def run_match(spec_a, spec_b, games=100, workers=None, opening_plies=2, seed=0,
+              sprt=None, progress=None, on_game=None):
+    """
+    Play a match between two configurations.
+
+    Args:
+        spec_a (dict): First configuration
+        spec_b (dict): Second configuration
+        games (int): Maximum number of games, rounded up to an even number
+        workers (int): Worker processes, None for one per CPU core
+        opening_plies (int): Random moves played before the engines move
+        seed (int): Seed of the opening generator
+        sprt (tuple[float, float]): (elo0, elo1) to stop the match early
+            once H0 or H1 is accepted with 5% error rates, or None
+        progress (callable): Called with the MatchResult after every game
+        on_game (callable): Called with (result, moves, a_is_white) after
+            every game, e.g. to record it
+
+    Returns:
+        tuple[MatchResult, str or None]: Result and SPRT decision
+            ('H0', 'H1' or None if no bound was reached)
+    """
+    rng = random.Random(seed)
+    result = MatchResult()
+    lower, upper = sprt_bounds()
+    decision = None
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        for _ in range((games + 1) // 2):
+            opening = random_opening(rng, opening_plies)
+            for a_is_white in (True, False):
+                future = executor.submit(play_game, spec_a, spec_b, opening, a_is_white)
+                pending[future] = a_is_white
+        while pending and decision is None:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                a_is_white = pending.pop(future)
+                game_result, moves = future.result()
+                result.add(game_result)
+                if on_game:
+                    on_game(game_result, moves, a_is_white)
+                if progress:
+                    progress(result)
+                if sprt is not None:
+                    llr = result.llr(*sprt)
+                    if llr >= upper:
+                        decision = 'H1'
+                    elif llr <= lower:
+                        decision = 'H0'
+        for future in pending:
+            future.cancel()
+    return result, decision
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a self-play match between two engines")
+    parser.add_argument('engine_a', help="First engine spec, e.g. minimax:difficulty=hard")
+    parser.add_argument('engine_b', help="Second engine spec, e.g. mcts:playouts=2000")
+    parser.add_argument('--games', type=int, default=100, help="Maximum number of games")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--opening-plies', type=int, default=2,
+                        help="Random moves at the start of every opening")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the openings")
+    parser.add_argument('--sprt', type=float, nargs=2, metavar=('ELO0', 'ELO1'),
+                        help="Stop early once H0 (ELO0) or H1 (ELO1) is accepted")
+    parser.add_argument('--record', metavar='FILE',
+                        help="Append every game to this game record file")
+    args = parser.parse_args(argv)
+
+    try:
+        spec_a, spec_b = parse_spec(args.engine_a), parse_spec(args.engine_b)
+    except ValueError as error:
+        parser.error(str(error))
+
+    def progress(result):
+        print(f"\r{result.summary()}", end='', file=sys.stderr, flush=True)
+
+    try:
+        writer = records.GameWriter(args.record) if args.record else None
+    except (records.RecordError, OSError) as error:
+        parser.error(str(error))
+
+    def on_game(game_result, moves, a_is_white):
+        writer.write(game_record(game_result, moves, a_is_white))
+
+    try:
+        result, decision = run_match(spec_a, spec_b, args.games, args.workers,
+                                     args.opening_plies, args.seed, args.sprt, progress,
+                                     on_game if writer else None)
+    finally:
+        if writer:
+            writer.close()
+    print(file=sys.stderr)
+    print(result.summary())
+    if args.sprt:
+        lower, upper = sprt_bounds()
+        print(f"SPRT [{args.sprt[0]:+g}, {args.sprt[1]:+g}]: "
+              f"LLR {result.llr(*args.sprt):.2f} in [{lower:.2f}, {upper:.2f}], "
+              f"{'accepted ' + decision if decision else 'inconclusive'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
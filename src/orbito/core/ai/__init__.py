@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: MIT
 
+from .mcts import MCTSAI
 from .minmax import MinimaxAI
 
-__all__ = ['MinimaxAI']
\ No newline at end of file
+__all__ = ['MCTSAI', 'MinimaxAI']
\ No newline at end of file
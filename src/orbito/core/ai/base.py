@@ -1,19 +1,25 @@
 """Base class for AI players."""
+import threading
 from abc import ABC, abstractmethod
 
 class BaseAI(ABC):
     """Abstract base class for AI implementations."""
     
-    def __init__(self, player_number=2, difficulty='medium'):
+    def __init__(self, player_number=2, difficulty='medium', time_limit_ms=None):
         """
         Initialize AI player.
         
         Args:
             player_number (int): AI player number (1:white, 2:black)
             difficulty (str): 'easy', 'medium', or 'hard'
+            time_limit_ms (int): Wall-clock budget per move in milliseconds.
+                When set, engines search as deep as the budget allows
+                instead of using the fixed ``depth_map`` depth.
         """
         self.player = player_number
         self.difficulty = difficulty
+        self.time_limit_ms = time_limit_ms
+        self._stop_event = threading.Event()
         self.depth_map = {
             'easy': 2,
             'medium': 3,
@@ -23,4 +29,42 @@ class BaseAI(ABC):
     @abstractmethod
     def get_best_move(self, game):
         """Get best move for current game state."""
-        pass
\ No newline at end of file
+        pass
+
+    def notify_move(self, row, col):
+        """
+        Tell the engine a move was played in the game it follows.
+
+        Call it for every move of the game, the engine's own included,
+        once the ball is placed. Engines that keep search results between
+        moves use it to follow the game and discard what became
+        unreachable; the default does nothing.
+
+        Args:
+            row (int): Row of the ball placed
+            col (int): Column of the ball placed
+        """
+
+    def new_game(self):
+        """Tell the engine a new game starts, so it drops results kept so far."""
+
+    def close(self):
+        """Release the resources held by the engine, such as worker processes."""
+
+    def stop(self):
+        """
+        Ask a running search to finish as soon as possible.
+
+        Safe to call from another thread. The search returns its best move
+        so far; the request is cleared when the next search starts.
+        """
+        self._stop_event.set()
+
+    def stop_requested(self):
+        """
+        Check whether ``stop`` was called during the current search.
+
+        Returns:
+            bool: True if the search should finish now
+        """
+        return self._stop_event.is_set()
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Vectorized evaluation of many positions at once.
+
+``evaluate_batch`` gives the same scores as ``evaluate_position`` for a
+whole ``(N, 16)`` board array (see ``orbito.core.batch``). Line counts
+come from one matrix product per colour with a cell-to-window membership
+matrix: a window is filled when its count equals its length.
+
+The score is linear in the weights: ``mask_features`` counts every term
+(filled windows, open lines, balls per cell) for the player minus the
+opponent, and the score is their dot product with ``weight_vector``. The
+terms of one colour come from tables indexed by its 16-bit mask. The
+tuner (see ``tuning``) fits the weights on the same features.
+
+This module requires NumPy, which is an optional dependency of the
+package (``pip install orbito[numpy]``).
+"""
+
+import numpy as np
+
+from ..batch import masks_from_boards
+from ..bitboard import CELL_BITS, CELL_COUNT, FULL_MASK, WIN_MASKS
+from .evaluator import CENTER_CELLS, DEFAULT_WEIGHTS, WIN_SCORE, WINDOWS, complete_weights
+
+
+def _membership(masks):
+    # Column j holds the cells of window j
+    return np.array([[1.0 if mask & bit else 0.0 for mask in masks] for bit in CELL_BITS],
+                    dtype=np.float32)
+
+
+# Membership matrices, shape (16, windows): aligned windows then winning lines
+WINDOW_MATRIX = _membership(WINDOWS[3] + WINDOWS[2])
+WINDOW_LENGTHS = np.array([3] * len(WINDOWS[3]) + [2] * len(WINDOWS[2]), dtype=np.float32)
+WIN_MATRIX = _membership(WIN_MASKS)
+CENTER_INDEX = np.array(CENTER_CELLS, dtype=np.intp)
+
+# The evaluation is linear in its weights: features times WEIGHT_NAMES
+WEIGHT_NAMES = ('three', 'two', 'open_two', 'open_three') + tuple(
+    f'cell_{index}' for index in range(CELL_COUNT))
+
+
+def weight_vector(weights=None):
+    """
+    Flatten evaluation weights in WEIGHT_NAMES order.
+
+    The centre weight is added to the weights of the centre cells.
+
+    Args:
+        weights (dict): Evaluation weights, DEFAULT_WEIGHTS if None
+
+    Returns:
+        np.ndarray: float64 vector of len(WEIGHT_NAMES)
+    """
+    weights = complete_weights(DEFAULT_WEIGHTS if weights is None else weights)
+    cells = np.array(weights['cells'], dtype=np.float64)
+    cells[CENTER_INDEX] += weights['center']
+    terms = [weights['three'], weights['two'], weights['open_two'], weights['open_three']]
+    return np.concatenate([terms, cells])
+
+
+def vector_weights(vector):
+    """
+    Convert a vector in WEIGHT_NAMES order to evaluation weights.
+
+    Args:
+        vector (array-like): Weights in WEIGHT_NAMES order
+
+    Returns:
+        dict: Integer weights, with the centre bonus in ``cells``
+    """
+    values = [int(round(value)) for value in vector]
+    return complete_weights({'three': values[0], 'two': values[1], 'open_two': values[2],
+                             'open_three': values[3], 'center': 0, 'cells': values[4:]})
+
+
+def _mask_tables():
+    # Features that only depend on one colour, and its count on every
+    # winning line, for all 65536 masks
+    cells = (np.arange(FULL_MASK + 1)[:, None] >> np.arange(CELL_COUNT) & 1).astype(np.float32)
+    filled = cells @ WINDOW_MATRIX == WINDOW_LENGTHS
+    features = np.zeros((FULL_MASK + 1, len(WEIGHT_NAMES)), dtype=np.int8)
+    features[:, 0] = filled[:, WINDOW_LENGTHS == 3].sum(axis=1)
+    features[:, 1] = filled[:, WINDOW_LENGTHS == 2].sum(axis=1)
+    features[:, 4:] = cells
+    return features, (cells @ WIN_MATRIX).astype(np.int8)
+
+
+MASK_FEATURES, LINE_COUNTS = _mask_tables()
+
+
+def mask_features(own, other):
+    """
+    Compute the evaluation features of a batch of positions.
+
+    Args:
+        own (array-like): Occupancy masks of the player, shape ``(N,)``
+        other (array-like): Occupancy masks of the opponent
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: (features, own_wins,
+            other_wins); features is float32 of shape
+            ``(N, len(WEIGHT_NAMES))`` and holds the counts of the player
+            minus those of the opponent
+    """
+    own = np.asarray(own, dtype=np.intp)
+    other = np.asarray(other, dtype=np.intp)
+    features = MASK_FEATURES[own].astype(np.float32)
+    features -= MASK_FEATURES[other]
+    own_lines, other_lines = LINE_COUNTS[own], LINE_COUNTS[other]
+    own_open = np.where(other_lines == 0, own_lines, 0)
+    other_open = np.where(own_lines == 0, other_lines, 0)
+    for column, count in ((2, 2), (3, 3)):
+        features[:, column] = ((own_open == count).sum(axis=1)
+                               - (other_open == count).sum(axis=1))
+    return features, (own_lines == 4).any(axis=1), (other_lines == 4).any(axis=1)
+
+
+def batch_features(boards, player):
+    """
+    Compute the evaluation features of a batch of boards.
+
+    Args:
+        boards (np.ndarray): Boards of shape ``(N, 16)`` (0: empty,
+            1: white, 2: black)
+        player (int or np.ndarray): Player the features are given for,
+            per board or for all boards
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Same as ``mask_features``
+    """
+    white, black = masks_from_boards(np.asarray(boards))
+    is_white = np.asarray(player) == 1
+    return mask_features(np.where(is_white, white, black), np.where(is_white, black, white))
+
+
+def evaluate_batch(boards, player, weights=None):
+    """
+    Evaluate a batch of positions.
+
+    Args:
+        boards (np.ndarray): Boards of shape ``(N, 16)`` (0: empty,
+            1: white, 2: black)
+        player (int or np.ndarray): Player the scores are given for, per
+            board or for all boards
+        weights (dict): Evaluation weights, DEFAULT_WEIGHTS if None
+
+    Returns:
+        np.ndarray: int32 scores of shape ``(N,)``, equal to
+            ``evaluate_position`` on each board
+    """
+    features, own_wins, other_wins = batch_features(boards, player)
+    scores = (features @ weight_vector(weights).astype(np.float32)).astype(np.int32)
+    scores[own_wins] = WIN_SCORE
+    scores[other_wins] = -WIN_SCORE
+    scores[own_wins & other_wins] = 0
+    return scores
@@ -0,0 +1,343 @@
+"""
+Labelled training positions for tuning and learning evaluations.
+
+A dataset is a directory of shards ``positions-00000.npy``,
+``positions-00001.npy``... Each shard is a structured array with the
+POSITION_DTYPE fields, ready for ``np.load(path, mmap_mode='r')``:
+
+    white, black    Occupancy masks of the canonical representative of
+                    the position (see ``symmetry``), at the start of a turn
+    player          Player to move
+    outcome         Final result for the player to move: 1 win, 0 draw,
+                    -1 loss
+    score           Minimax score for the player to move, NO_SCORE when
+                    the position was not searched
+
+Positions come from game records (``record_positions``) or from random
+self-play (``random_positions``) as chunks of POSITION_DTYPE arrays, and
+``export_dataset`` streams them into a ``DatasetWriter``. The writer keeps
+one shard in memory and a bitset with one bit per possible board (3^16
+bits, 5.4 MB) to drop positions already written, so memory use does not
+grow with the number of positions read.
+
+This module requires NumPy, which is an optional dependency of the
+package (``pip install orbito[numpy]``).
+"""
+import os
+
+import numpy as np
+
+from ..batch import BatchOrbitGame, masks_from_boards
+from ..bitboard import CELL_COUNT
+from ..game import OrbitGame
+from ..records import BLACK_WINS, DRAW, ONGOING, WHITE_WINS
+from ..symmetry import SYMMETRIES, transform_mask
+from .minmax import MinimaxAI
+
+POSITION_DTYPE = np.dtype([
+    ('white', '<u2'),
+    ('black', '<u2'),
+    ('player', 'u1'),
+    ('outcome', 'i1'),
+    ('score', '<i4'),
+])
+NO_SCORE = np.iinfo(np.int32).min
+
+SHARD_PATTERN = 'positions-{:05d}.npy'
+BOARD_COUNT = 3 ** CELL_COUNT
+
+# Base-3 value of the cells set in a mask: white is 1 and black 2 per digit
+_TERNARY = np.zeros(1 << CELL_COUNT, dtype=np.uint32)
+for _cell in range(CELL_COUNT):
+    _TERNARY[1 << _cell:2 << _cell] = _TERNARY[:1 << _cell] + 3 ** _cell
+del _cell
+
+# Byte lookup tables of every symmetry, as in ``symmetry.transform_mask``
+_SYMMETRY_TABLES = [
+    (np.array([transform_mask(byte, s) for byte in range(256)], dtype=np.uint32),
+     np.array([transform_mask(byte << 8, s) for byte in range(256)], dtype=np.uint32))
+    for s in range(len(SYMMETRIES))
+]
+
+
+def canonical_masks(white, black):
+    """
+    Map a batch of positions to their canonical representatives.
+
+    Gives the same representatives as ``symmetry.canonical``.
+
+    Args:
+        white (array-like): White occupancy masks, shape ``(N,)``
+        black (array-like): Black occupancy masks, shape ``(N,)``
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Canonical (white, black) masks as uint32
+    """
+    white = np.asarray(white, dtype=np.uint32)
+    black = np.asarray(black, dtype=np.uint32)
+    best_white, best_black = white, black
+    best_key = white.astype(np.uint64) | black.astype(np.uint64) << np.uint64(16)
+    for low, high in _SYMMETRY_TABLES[1:]:
+        new_white = low[white & 0xFF] | high[white >> 8]
+        new_black = low[black & 0xFF] | high[black >> 8]
+        key = new_white.astype(np.uint64) | new_black.astype(np.uint64) << np.uint64(16)
+        better = key < best_key
+        best_key = np.where(better, key, best_key)
+        best_white = np.where(better, new_white, best_white)
+        best_black = np.where(better, new_black, best_black)
+    return best_white, best_black
+
+
+def board_numbers(white, black):
+    """
+    Number boards densely, as base-3 digits of their cells.
+
+    Args:
+        white (np.ndarray): White occupancy masks
+        black (np.ndarray): Black occupancy masks
+
+    Returns:
+        np.ndarray: Distinct numbers below BOARD_COUNT, as uint32
+    """
+    return _TERNARY[white] + 2 * _TERNARY[black]
+
+
+def _outcomes(result, player):
+    """Outcome of a game for the player to move, -1, 0 or 1."""
+    outcome = np.where(result == player, 1, -1)
+    return np.where(result == DRAW, 0, outcome).astype(np.int8)
+
+
+def record_positions(records):
+    """
+    Extract the positions of finished games.
+
+    Unfinished games are skipped since their outcome is unknown.
+
+    Args:
+        records (iterable[GameRecord]): Games, e.g. from
+            ``records.read_games``
+
+    Yields:
+        np.ndarray: POSITION_DTYPE array of the positions at the start of
+            every turn of one game, without scores
+    """
+    for record in records:
+        if record.result == ONGOING:
+            continue
+        game = record.replay()
+        # Undo the moves to list the positions before each one
+        count = len(record.moves)
+        chunk = np.empty(count, dtype=POSITION_DTYPE)
+        for turn in range(count - 1, -1, -1):
+            game.pop()
+            chunk[turn] = (game.white, game.black, game.current_player, 0, NO_SCORE)
+        result = {WHITE_WINS: 1, BLACK_WINS: 2, DRAW: DRAW}[record.result]
+        chunk['outcome'] = _outcomes(result, chunk['player'])
+        yield chunk
+
+
+def random_positions(games, rng, batch_size=10000):
+    """
+    Play random games and extract their positions.
+
+    Args:
+        games (int): Number of games
+        rng (np.random.Generator): Random generator
+        batch_size (int): Games played in lockstep at a time
+
+    Yields:
+        np.ndarray: POSITION_DTYPE array of the positions at the start of
+            every turn of one batch of games, without scores
+    """
+    for start in range(0, games, batch_size):
+        batch = BatchOrbitGame(min(batch_size, games - start))
+        steps = []
+        while not batch.is_over():
+            live = np.flatnonzero(batch.live())
+            white, black = masks_from_boards(batch.boards[live])
+            steps.append((live, white, black, batch.current_player[live].copy()))
+            batch.step(batch.random_moves(rng))
+        chunk = np.empty(sum(len(step[0]) for step in steps), dtype=POSITION_DTYPE)
+        offset = 0
+        for live, white, black, player in steps:
+            view = chunk[offset:offset + len(live)]
+            view['white'], view['black'], view['player'] = white, black, player
+            view['outcome'] = _outcomes(batch.results[live], player)
+            view['score'] = NO_SCORE
+            offset += len(live)
+        yield chunk
+
+
+def search_scores(chunk, depth, ais=None):
+    """
+    Label positions with the minimax score for the player to move.
+
+    Args:
+        chunk (np.ndarray): POSITION_DTYPE array, updated in place
+        depth (int): Search depth, the first move included
+        ais (dict): MinimaxAI by player, reused between calls to keep
+            their transposition tables; created if None
+
+    Returns:
+        np.ndarray: The chunk
+    """
+    if ais is None:
+        ais = {}
+    for player in (1, 2):
+        if player not in ais:
+            ais[player] = MinimaxAI(player, max_depth=depth)
+    game = OrbitGame()
+    for index, (white, black, player, _, _) in enumerate(chunk.tolist()):
+        game.set_state(white, black, player)
+        ais[player].get_best_move(game)
+        chunk['score'][index] = ais[player].info.score
+    return chunk
+
+
+class DatasetWriter:
+    """
+    Writer of a sharded position dataset.
+
+    Attributes:
+        directory (str): Destination directory
+        shard_size (int): Positions per shard
+        deduplicate (bool): Drop positions equivalent to one already written
+        shards (list[str]): Paths of the shards written so far
+        positions (int): Positions accepted, including the unwritten buffer
+        duplicates (int): Positions dropped as duplicates
+    """
+
+    def __init__(self, directory, shard_size=1 << 20, deduplicate=True):
+        """
+        Start a dataset.
+
+        Args:
+            directory (str): Destination directory, created if needed
+            shard_size (int): Positions per shard
+            deduplicate (bool): Drop positions whose canonical
+                representative was already written
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shard_size = shard_size
+        self.deduplicate = deduplicate
+        self.shards = []
+        self.positions = 0
+        self.duplicates = 0
+        self._buffer = np.empty(shard_size, dtype=POSITION_DTYPE)
+        self._count = 0
+        self._seen = np.zeros((BOARD_COUNT + 7) // 8, dtype=np.uint8)
+
+    def filter_new(self, chunk):
+        """
+        Canonicalize positions and drop those already written.
+
+        Only the first of several equivalent positions is kept, and every
+        kept position counts as written from then on.
+
+        Args:
+            chunk (np.ndarray): POSITION_DTYPE array
+
+        Returns:
+            np.ndarray: New array of the positions to write
+        """
+        chunk = chunk.copy()
+        chunk['white'], chunk['black'] = canonical_masks(chunk['white'], chunk['black'])
+        if not self.deduplicate:
+            return chunk
+        numbers = board_numbers(chunk['white'], chunk['black'])
+        numbers, first = np.unique(numbers, return_index=True)
+        new = (self._seen[numbers >> 3] >> (numbers & 7) & 1) == 0
+        numbers, first = numbers[new], np.sort(first[new])
+        np.bitwise_or.at(self._seen, numbers >> 3, (1 << (numbers & 7)).astype(np.uint8))
+        self.duplicates += len(chunk) - len(first)
+        return chunk[first]
+
+    def write(self, chunk, filtered=False):
+        """
+        Add positions, writing shards as the buffer fills.
+
+        Args:
+            chunk (np.ndarray): POSITION_DTYPE array
+            filtered (bool): The chunk already went through ``filter_new``
+        """
+        if not filtered:
+            chunk = self.filter_new(chunk)
+        self.positions += len(chunk)
+        while len(chunk):
+            take = min(len(chunk), self.shard_size - self._count)
+            self._buffer[self._count:self._count + take] = chunk[:take]
+            self._count += take
+            chunk = chunk[take:]
+            if self._count == self.shard_size:
+                self.flush()
+
+    def flush(self):
+        """Write the buffered positions as a new shard."""
+        if not self._count:
+            return
+        path = os.path.join(self.directory, SHARD_PATTERN.format(len(self.shards)))
+        np.save(path, self._buffer[:self._count])
+        self.shards.append(path)
+        self._count = 0
+
+    def close(self):
+        """Write the last shard."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def export_dataset(chunks, directory, shard_size=1 << 20, deduplicate=True,
+                   search_depth=None, progress=None):
+    """
+    Stream positions into a dataset.
+
+    Duplicates are dropped before the search, so each distinct position
+    is searched once.
+
+    Args:
+        chunks (iterable[np.ndarray]): POSITION_DTYPE arrays, e.g. from
+            ``record_positions`` or ``random_positions``
+        directory (str): Destination directory
+        shard_size (int): Positions per shard
+        deduplicate (bool): Keep one position per symmetry class
+        search_depth (int): Label positions with a search of this depth,
+            or None to keep only outcomes
+        progress (callable): Called with the writer after every chunk
+
+    Returns:
+        DatasetWriter: Closed writer with the shard list and counts
+    """
+    ais = {}
+    with DatasetWriter(directory, shard_size, deduplicate) as writer:
+        for chunk in chunks:
+            chunk = writer.filter_new(chunk)
+            if search_depth is not None:
+                search_scores(chunk, search_depth, ais)
+            writer.write(chunk, filtered=True)
+            if progress:
+                progress(writer)
+    for ai in ais.values():
+        ai.close()
+    return writer
+
+
+def load_dataset(directory):
+    """
+    Memory-map the shards of a dataset.
+
+    Args:
+        directory (str): Dataset directory
+
+    Returns:
+        list[np.ndarray]: Read-only POSITION_DTYPE arrays, in shard order
+    """
+    names = sorted(name for name in os.listdir(directory)
+                   if name.startswith('positions-') and name.endswith('.npy'))
+    return [np.load(os.path.join(directory, name), mmap_mode='r') for name in names]
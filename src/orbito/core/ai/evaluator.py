@@ -1,4 +1,201 @@
-"""Board evaluation functions for AI."""
+"""
+Board evaluation functions for AI.
+
+The score of a colour only depends on its own occupancy mask: every
+window of 3 or 2 aligned cells filled by the colour and every centre cell
+it holds adds a weight. ``pattern_table`` precomputes that score for all
+65536 masks, so a leaf evaluation is two table lookups whatever the
+position, and the masks are already kept up to date by ``OrbitGame`` on
+every placement and orbit.
+
+The table is built incrementally from a cell-to-window incidence map:
+the score of a mask is the score of the mask without its lowest cell,
+plus the weights of the windows through that cell that the mask fills.
+
+Open lines (winning lines holding balls of one colour only) depend on
+both masks, so they are counted line by line, and only when their
+weights are not zero as in the default weights.
+
+Weights can be saved to and loaded from a JSON parameter file, such as
+the one written by ``scripts/tune_weights.py``.
+"""
+import json
+from array import array
+
+from ..bitboard import CELL_BITS, FULL_MASK, WIN_MASKS, WIN_TABLE, cell_index
+from ..symmetry import SYMMETRIES
+
+WIN_SCORE = 1000
+
+# Weights of the evaluation terms, per colour
+DEFAULT_WEIGHTS = {
+    'three': 50,            # 3 aligned
+    'two': 10,              # 2 aligned
+    'center': 5,            # Control of center
+    'cells': (0,) * 16,     # Bonus of every cell, by cell index
+    'open_two': 0,          # Winning line holding 2 own balls and no opponent ball
+    'open_three': 0,        # Winning line holding 3 own balls and no opponent ball
+}
+_DEFAULT_KEY = tuple(sorted(DEFAULT_WEIGHTS.items()))
+
+_POPCOUNT = bytes(bin(mask).count('1') for mask in range(FULL_MASK + 1))
+
+CENTER_CELLS = tuple(cell_index(row, col) for row, col in [(1, 1), (1, 2), (2, 1), (2, 2)])
+
+
+def _windows(length):
+    # Same windows as count_aligned_pieces, as cell masks
+    directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
+    masks = []
+    for d_row, d_col in directions:
+        for row in range(4):
+            for col in range(4):
+                cells = [(row + k * d_row, col + k * d_col) for k in range(length)]
+                if all(0 <= r < 4 and 0 <= c < 4 for r, c in cells):
+                    mask = 0
+                    for r, c in cells:
+                        mask |= CELL_BITS[cell_index(r, c)]
+                    masks.append(mask)
+    return tuple(masks)
+
+
+# Aligned windows by length, and the windows through every cell
+WINDOWS = {3: _windows(3), 2: _windows(2)}
+CELL_WINDOWS = tuple(
+    tuple((mask, length) for length, masks in WINDOWS.items()
+          for mask in masks if mask & CELL_BITS[index])
+    for index in range(16)
+)
+
+_TABLES = {}
+
+
+def complete_weights(weights):
+    """
+    Fill in the terms missing from a set of weights.
+
+    Args:
+        weights (dict): Weights by term name, possibly partial
+
+    Returns:
+        dict: Weights with every DEFAULT_WEIGHTS term; ``cells`` is a tuple
+
+    Raises:
+        ValueError: If a term is unknown or ``cells`` does not have 16 values
+    """
+    unknown = set(weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise ValueError(f"unknown evaluation terms: {', '.join(sorted(unknown))}")
+    weights = dict(DEFAULT_WEIGHTS, **weights)
+    weights['cells'] = tuple(weights['cells'])
+    if len(weights['cells']) != 16:
+        raise ValueError("'cells' needs one weight per cell")
+    return weights
+
+
+def is_symmetric(weights=None):
+    """
+    Check whether weights score symmetric positions alike.
+
+    Only the cell bonuses can tell symmetric positions apart: the other
+    terms count windows, lines and centre cells, which the symmetries map
+    onto each other. Tuned weights tie the bonuses of symmetric cells, but
+    a hand-edited parameter file may not.
+
+    Args:
+        weights (dict): Weights by term name, DEFAULT_WEIGHTS if None
+
+    Returns:
+        bool: True if every symmetry leaves the score unchanged
+    """
+    cells = complete_weights(weights or {})['cells']
+    return all(cells[cell_map[index]] == cells[index]
+               for cell_map in SYMMETRIES for index in range(16))
+
+
+def load_weights(path):
+    """
+    Read evaluation weights from a JSON parameter file.
+
+    Args:
+        path (str): Parameter file holding an object of weights by term
+            name; missing terms keep their default
+
+    Returns:
+        dict: Complete weights
+
+    Raises:
+        ValueError: If the file holds unknown terms
+    """
+    with open(path) as handle:
+        return complete_weights(json.load(handle))
+
+
+def save_weights(path, weights):
+    """
+    Write evaluation weights to a JSON parameter file.
+
+    Args:
+        path (str): Destination file
+        weights (dict): Weights by term name
+    """
+    weights = complete_weights(weights)
+    weights['cells'] = list(weights['cells'])
+    with open(path, 'w') as handle:
+        json.dump(weights, handle, indent=4)
+        handle.write('\n')
+
+
+def pattern_table(weights=None):
+    """
+    Get the score of every occupancy mask for a set of weights.
+
+    Tables are built on first use and cached per set of weights.
+
+    Args:
+        weights (dict): Weights by term name, DEFAULT_WEIGHTS if None
+
+    Returns:
+        array: Score of the mask for the colour that owns it, indexed by
+            16-bit mask, without the open line terms
+    """
+    weights = DEFAULT_WEIGHTS if weights is None else complete_weights(weights)
+    cache_key = tuple(sorted(weights.items()))
+    table = _TABLES.get(cache_key)
+    if table is not None:
+        return table
+    length_weights = {3: weights['three'], 2: weights['two']}
+    cell_terms = []
+    for index in range(16):
+        terms = [(mask, length_weights[length]) for mask, length in CELL_WINDOWS[index]]
+        cell = weights['cells'][index] + (weights['center'] if index in CENTER_CELLS else 0)
+        cell_terms.append((terms, cell))
+    table = array('i', bytes(4 * (FULL_MASK + 1)))
+    for mask in range(1, FULL_MASK + 1):
+        low = mask & -mask
+        terms, score = cell_terms[low.bit_length() - 1]
+        score += table[mask ^ low]
+        for window, weight in terms:
+            if mask & window == window:
+                score += weight
+        table[mask] = score
+    _TABLES[cache_key] = table
+    return table
+
+
+# Weights evaluate_position used last, with their table and open line weights
+_last_model = (None, None, None)
+
+
+def _model(weights):
+    """Get the pattern table and open line weights (None if all zero)."""
+    global _last_model
+    if weights is _last_model[0]:
+        return _last_model[1:]
+    complete = complete_weights(weights)
+    open_weights = (0, 0, complete['open_two'], complete['open_three'], 0)
+    _last_model = (weights, pattern_table(complete), open_weights if any(open_weights) else None)
+    return _last_model[1:]
 
 def count_aligned_pieces(board, player, length):
     """Count number of aligned pieces of given length."""
@@ -26,35 +223,45 @@ def count_aligned_pieces(board, player, length):
                 count += 1
     return count
 
-def evaluate_position(game, ai_player):
+def evaluate_position(game, ai_player, weights=None):
     """
     Evaluate current board position.
-    
+
+    Args:
+        game (OrbitGame): Position to evaluate
+        ai_player (int): Player the score is given for
+        weights (dict): Evaluation weights, DEFAULT_WEIGHTS if None;
+            treated as read-only, since the tables derived from them are
+            reused while the same dict is passed
+
     Returns:
         int: Score (positive favors AI, negative favors opponent)
     """
-    score = 0
-    board = game.get_board()
-    opponent = 3 - ai_player
-    
-    # Check for wins
-    if game.check_win_for_player(ai_player):
-        return 1000
-    if game.check_win_for_player(opponent):
-        return -1000
-        
-    # Count aligned pieces
-    score += count_aligned_pieces(board, ai_player, 3) * 50  # 3 aligned
-    score += count_aligned_pieces(board, ai_player, 2) * 10  # 2 aligned
-    score -= count_aligned_pieces(board, opponent, 3) * 50   # opponent 3 aligned
-    score -= count_aligned_pieces(board, opponent, 2) * 10   # opponent 2 aligned
-    
-    # Control of center
-    center_positions = [(1,1), (1,2), (2,1), (2,2)]
-    for row, col in center_positions:
-        if board[row][col] == ai_player:
-            score += 5
-        elif board[row][col] == opponent:
-            score -= 5
-            
-    return score
\ No newline at end of file
+    if ai_player == 1:
+        own, other = game.white, game.black
+    else:
+        own, other = game.black, game.white
+
+    # Check for wins (aligning at the same time is a draw)
+    ai_wins = WIN_TABLE[own]
+    opponent_wins = WIN_TABLE[other]
+    if ai_wins and opponent_wins:
+        return 0
+    if ai_wins:
+        return WIN_SCORE
+    if opponent_wins:
+        return -WIN_SCORE
+
+    # Aligned pieces and control of center
+    if weights is None:
+        table = _TABLES.get(_DEFAULT_KEY) or pattern_table()
+        return table[own] - table[other]
+    table, open_weights = _model(weights)
+    score = table[own] - table[other]
+    if open_weights is not None:
+        for line in WIN_MASKS:
+            if not other & line:
+                score += open_weights[_POPCOUNT[own & line]]
+            elif not own & line:
+                score -= open_weights[_POPCOUNT[other & line]]
+    return score
@@ -0,0 +1,275 @@
+"""Monte Carlo tree search AI implementation."""
+import math
+import random
+import time
+from array import array
+
+from ..bitboard import CELL_BITS, FULL_MASK, WIN_TABLE, orbit_mask
+from .base import BaseAI
+
+# ORBIT_TABLE[mask] is the mask after the orbit move, for rollouts
+ORBIT_TABLE = array('H', (orbit_mask(mask) for mask in range(FULL_MASK + 1)))
+
+# Exploration constant of the UCT formula
+EXPLORATION = 1.4
+
+# Result of a game: winning player, or DRAW
+DRAW = 0
+
+
+def game_result(white, black):
+    """
+    Get the result of a position reached after an orbit.
+
+    Args:
+        white (int): White occupancy mask
+        black (int): Black occupancy mask
+
+    Returns:
+        int or None: 1 or 2 for the winner, DRAW, or None if the game goes on
+    """
+    white_wins = WIN_TABLE[white]
+    black_wins = WIN_TABLE[black]
+    if white_wins or black_wins:
+        if white_wins and black_wins:
+            return DRAW
+        return 1 if white_wins else 2
+    if white | black == FULL_MASK:
+        return DRAW
+    return None
+
+
+class Node:
+    """
+    Search tree node: a position at the start of a turn.
+
+    Attributes:
+        white, black (int): Occupancy masks
+        player (int): Player to move
+        move (int): Cell index of the move leading here, -1 at the root
+        parent (Node): Parent node, None at the root
+        children (list[Node]): Expanded children
+        untried (list[int]): Moves not expanded yet
+        result (int or None): Game result if the position is final
+        visits (int): Playouts through the node
+        score (float): Points of those playouts for the player who moved
+            into the node (1 for a win, 0.5 for a draw)
+    """
+
+    __slots__ = ('white', 'black', 'player', 'move', 'parent', 'children',
+                 'untried', 'result', 'visits', 'score')
+
+    def __init__(self, white, black, player, move=-1, parent=None, result=None):
+        self.white = white
+        self.black = black
+        self.player = player
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.result = result
+        empty = ~(white | black) & FULL_MASK
+        self.untried = [] if result is not None else [
+            index for index in range(16) if empty >> index & 1]
+        self.visits = 0
+        self.score = 0.0
+
+    def state(self):
+        """
+        Get the compact game state of the node.
+
+        Returns:
+            tuple[int, int, int]: (white_mask, black_mask, current_player)
+        """
+        return self.white, self.black, self.player
+
+    def expand(self, move):
+        """
+        Add the child reached by a move.
+
+        Args:
+            move (int): Cell index of an untried move
+
+        Returns:
+            Node: New child
+        """
+        self.untried.remove(move)
+        white, black = self.white, self.black
+        if self.player == 1:
+            white |= CELL_BITS[move]
+        else:
+            black |= CELL_BITS[move]
+        white, black = ORBIT_TABLE[white], ORBIT_TABLE[black]
+        child = Node(white, black, 3 - self.player, move, self,
+                     game_result(white, black))
+        self.children.append(child)
+        return child
+
+
+class MCTSAI(BaseAI):
+    """
+    Monte Carlo tree search with UCT selection and random rollouts.
+
+    Each playout walks down the tree choosing the child with the best
+    upper confidence bound, expands one new child, plays random moves on
+    the occupancy masks until the game ends and credits the result to
+    every node on the path. The most visited root move is played.
+
+    The search runs for ``time_limit_ms`` when it is set, otherwise for the
+    ``playout_map`` budget of the difficulty. The tree is kept between
+    moves: ``notify_move`` re-roots it at the child of the move played
+    and drops the other subtrees. Without notifications, the next search
+    still looks for the position two plies below the previous root.
+
+    Attributes:
+        playouts (int): Playouts of the last search
+        playouts_per_second (float): Speed of the last search
+        playout_map (dict): Playout budget by difficulty
+        root (Node): Root of the last search tree
+    """
+
+    def __init__(self, player_number=2, difficulty='medium', time_limit_ms=None,
+                 playouts=None, exploration=EXPLORATION, seed=None):
+        """
+        Initialize MCTS AI player.
+
+        Args:
+            player_number (int): AI player number (1:white, 2:black)
+            difficulty (str): 'easy', 'medium', or 'hard'
+            time_limit_ms (int): Wall-clock budget per move in milliseconds
+            playouts (int): Playout budget, overrides the difficulty
+            exploration (float): UCT exploration constant
+            seed (int): Seed of the rollout random generator
+        """
+        super().__init__(player_number, difficulty, time_limit_ms)
+        self.playout_map = {
+            'easy': 500,
+            'medium': 3000,
+            'hard': 15000
+        }
+        self.max_playouts = playouts
+        self.exploration = exploration
+        self.random = random.Random(seed)
+        self.playouts = 0
+        self.playouts_per_second = 0.0
+        self.root = None
+
+    def get_best_move(self, game):
+        """Find best move by Monte Carlo tree search."""
+        self._stop_event.clear()
+        root = self._find_root(game.get_state())
+        if root.result is not None or not (root.untried or root.children):
+            return None
+        self.root = root
+
+        budget = self.max_playouts or self.playout_map[self.difficulty]
+        deadline = None
+        if self.time_limit_ms is not None:
+            budget = None
+            deadline = time.perf_counter() + self.time_limit_ms / 1000
+        start = time.perf_counter()
+        self.playouts = 0
+        while budget is None or self.playouts < budget:
+            self._playout(root)
+            self.playouts += 1
+            if not self.playouts & 63 and (
+                    self._stop_event.is_set()
+                    or deadline is not None and time.perf_counter() >= deadline):
+                break
+        elapsed = time.perf_counter() - start
+        self.playouts_per_second = self.playouts / elapsed if elapsed > 0 else 0.0
+
+        best = max(root.children, key=lambda child: child.visits)
+        return divmod(best.move, 4)
+
+    def notify_move(self, row, col):
+        """Re-root the tree at the position reached by a move."""
+        if self.root is None:
+            return
+        index = row * 4 + col
+        for child in self.root.children:
+            if child.move == index:
+                child.parent = None
+                self.root = child
+                return
+        self.root = None  # The move was never expanded
+
+    def new_game(self):
+        """Drop the search tree."""
+        self.root = None
+
+    def _find_root(self, state):
+        """
+        Find the node of a position in the previous tree, or make a new one.
+
+        The previous root is followed by the AI's move and the opponent's
+        reply, so the position is searched up to two plies down.
+        """
+        if self.root is not None:
+            if self.root.state() == state:
+                return self.root
+            for child in self.root.children:
+                for grandchild in child.children:
+                    if grandchild.state() == state:
+                        grandchild.parent = None
+                        return grandchild
+        white, black, player = state
+        return Node(white, black, player, result=game_result(white, black))
+
+    def _playout(self, root):
+        """Run one selection, expansion, rollout and backpropagation."""
+        node = root
+        # Selection
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            best_value = -1.0
+            for child in node.children:
+                value = (child.score / child.visits
+                         + self.exploration * math.sqrt(log_visits / child.visits))
+                if value > best_value:
+                    best_value, best_child = value, child
+            node = best_child
+        # Expansion
+        if node.untried:
+            node = node.expand(self.random.choice(node.untried))
+        # Rollout
+        result = node.result
+        if result is None:
+            result = self._rollout(node.white, node.black, node.player)
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if result == DRAW:
+                node.score += 0.5
+            elif node.parent is not None and result == node.parent.player:
+                node.score += 1.0
+            node = node.parent
+
+    def _rollout(self, white, black, player):
+        """
+        Play random moves until the game ends.
+
+        Returns:
+            int: Winning player or DRAW
+        """
+        getrandbits = self.random.getrandbits
+        orbit = ORBIT_TABLE
+        wins = WIN_TABLE
+        while True:
+            occupied = white | black
+            # Rejection sampling is cheaper than listing the empty cells
+            bit = CELL_BITS[getrandbits(4)]
+            while occupied & bit:
+                bit = CELL_BITS[getrandbits(4)]
+            if player == 1:
+                white = orbit[white | bit]
+                black = orbit[black]
+            else:
+                white = orbit[white]
+                black = orbit[black | bit]
+            if wins[white] or wins[black]:
+                if wins[white] and wins[black]:
+                    return DRAW
+                return 1 if wins[white] else 2
+            if white | black == FULL_MASK:
+                return DRAW
+            player = 3 - player
@@ -1,69 +1,464 @@
 """Minimax AI implementation."""
-from copy import deepcopy
+import copy
+import os
+import time
+
+from ..bitboard import CELL_BITS, has_win, orbit_mask
+from ..symmetry import INVERSES, SYMMETRIES, canonical
+from ..zobrist import SIDE_KEYS, board_key
 from .base import BaseAI
-from .evaluator import evaluate_position
+from .evaluator import evaluate_position, is_symmetric, load_weights
+from .ordering import HeuristicOrderer
+from .search_info import IterationInfo, SearchInfo
+from .tablebase import Tablebase, load_default_tablebase
+from .transposition import EXACT, LOWER, UPPER, TranspositionTable
+
+# Score of a won game, reduced by the number of plies needed to win
+MATE_SCORE = 10000
+# Scores beyond this bound are wins or losses, never static evaluations
+MATE_BOUND = MATE_SCORE - 100
+INFINITY = MATE_SCORE + 1
+# The clock is read once every this many nodes (a power of two minus one)
+CLOCK_CHECK_MASK = 63
+# Shallower iterations are too cheap to be worth splitting across processes
+PARALLEL_MIN_DEPTH = 3
+# Default tablebase: the installed one, if any, at the 'hard' difficulty
+_DEFAULT_TABLEBASE = object()
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget is spent or on stop."""
+
 
 class MinimaxAI(BaseAI):
+    """
+    Alpha-beta minimax searching complete turns.
+
+    Every ply of the tree is a real turn: place a ball, orbit the board,
+    check both players for a win and switch player. If both players align
+    four balls after the same orbit the game is scored as a draw.
+
+    Results are cached in a transposition table keyed by the Zobrist key
+    of the game, which persists between moves. By default the key is that
+    of the canonical position (see ``symmetry``), so the four rotations
+    of a position share one entry.
+
+    The search deepens iteratively, one ply at a time. Without a time
+    limit it stops at the ``depth_map`` depth of the difficulty; with
+    ``time_limit_ms`` it keeps deepening until the budget is spent and
+    plays the best move of the deepest completed iteration. Each
+    iteration searches the previous best move first. ``stop`` ends the
+    search the same way as an expired budget.
+
+    Moves are ordered by a pluggable ``MoveOrderer``, which also collects
+    the cutoff statistics of the last search.
+
+    When a ``Tablebase`` is given and covers the position, its perfect
+    move is played without searching.
+
+    With ``workers`` above 1, iterations from ``PARALLEL_MIN_DEPTH`` on
+    search the root moves in a pool of worker processes (see
+    ``parallel``), started with the engine and kept until ``close``. With
+    ``deterministic``, fixed-depth searches give the same move for the
+    same position whatever the number of workers and the earlier games.
+
+    The principal variation of a search is kept for the next one. Moves
+    reported with ``notify_move`` advance it, and when the next search
+    starts from the position it leads to, its first move is searched
+    first even if the transposition table entry was overwritten.
+
+    Every search fills a ``SearchInfo`` with its statistics, and
+    ``info_callback`` receives it after each completed iteration, from
+    the thread running the search.
+
+    Attributes:
+        nodes (int): Number of positions visited by the last search
+        depth_reached (int): Depth of the deepest completed iteration
+        pv (list[int]): Expected line of play from the position of the
+            last search (or after the moves notified since), as cell indices
+        tt (TranspositionTable): Transposition table shared by all searches
+        orderer (MoveOrderer): Move ordering strategy
+        tablebase (Tablebase): Exact position values, or None
+        workers (int): Number of processes searching the root moves
+        deterministic (bool): Search every move from a clean state
+        info (SearchInfo): Statistics of the last search
+        info_callback (callable): Called with ``info`` after every
+            completed iteration, or None
+        max_depth (int): Depth limit overriding the difficulty, or None
+        weights (dict): Evaluation weights, None for the defaults
+    """
+
+    def __init__(self, player_number=2, difficulty='medium', time_limit_ms=None,
+                 tt_size_mb=16, orderer=None, tablebase=_DEFAULT_TABLEBASE, canonical_tt=True,
+                 workers=1, deterministic=False, info_callback=None, max_depth=None,
+                 weights=None):
+        """
+        Initialize minimax AI player.
+
+        Args:
+            player_number (int): AI player number (1:white, 2:black)
+            difficulty (str): 'easy', 'medium', or 'hard'
+            time_limit_ms (int): Wall-clock budget per move in milliseconds
+            tt_size_mb (float): Memory budget of the transposition table
+            orderer (MoveOrderer): Move ordering strategy, defaults to
+                ``HeuristicOrderer``
+            tablebase (Tablebase or str): Exact position values to play
+                from, or the path of a tablebase file to open; by default
+                the installed tablebase (see ``load_default_tablebase``)
+                at the 'hard' difficulty, and None disables it
+            canonical_tt (bool): Share transposition table entries between
+                symmetric positions; turned off when the weights do not
+                score them alike (see ``is_symmetric``)
+            workers (int): Processes searching the root moves, None for
+                one per CPU core
+            deterministic (bool): Clear the table and the ordering state
+                before every search (and every parallel task), so the move
+                only depends on the position
+            info_callback (callable): Called with the ``SearchInfo`` after
+                every completed iteration
+            max_depth (int): Deepest iteration, the root move included;
+                overrides the difficulty and also applies with a time limit
+            weights (dict or str): Evaluation weights, or the path of a
+                parameter file to load them from (see ``load_weights``)
+        """
+        super().__init__(player_number, difficulty, time_limit_ms)
+        self.nodes = 0
+        self.depth_reached = 0
+        self.tt_size_mb = tt_size_mb
+        self.tt = TranspositionTable(tt_size_mb)
+        self.orderer = orderer if orderer is not None else HeuristicOrderer()
+        self._orderer_template = copy.deepcopy(self.orderer)
+        if tablebase is _DEFAULT_TABLEBASE:
+            tablebase = load_default_tablebase() if difficulty == 'hard' else None
+        elif isinstance(tablebase, str):
+            tablebase = Tablebase.load(tablebase)
+        self.tablebase = tablebase
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.deterministic = deterministic
+        self._splitter = None
+        self.pv = []
+        self._pv_state = None
+        self.info = SearchInfo()
+        self.info_callback = info_callback
+        self.max_depth = max_depth
+        self.weights = load_weights(weights) if isinstance(weights, str) else weights
+        # Symmetric positions only share a score, and so an entry, if the
+        # evaluation cannot tell them apart
+        self.canonical_tt = canonical_tt and is_symmetric(self.weights)
+        self._root_move = -1
+        self._deadline = None
+        # Set by the ponderer: successive searches share one table age
+        self._same_search = False
+        if self.workers > 1 and (max_depth is None or max_depth >= PARALLEL_MIN_DEPTH):
+            # Start the pool now rather than in the first timed search
+            from .parallel import RootSplitter
+            self._splitter = RootSplitter(self, self.workers)
+
     def get_best_move(self, game):
-        """Find best move using minimax algorithm."""
-        best_score = float('-inf')
-        best_move = None
-        
-        for row in range(4):
-            for col in range(4):
-                if game.is_valid_move(row, col):
-                    game_copy = deepcopy(game)
-                    game_copy.make_move(row, col)
-                    score = self._minimax(
-                        game_copy, 
-                        self.depth_map[self.difficulty], 
-                        False
-                    )
-                    if score > best_score:
-                        best_score = score
-                        best_move = (row, col)
-                        
-        return best_move
-        
-    def _minimax(self, game, depth, maximizing_player, alpha=float('-inf'), beta=float('inf')):
+        """Find best move using iteratively deepened minimax."""
+        start = time.perf_counter()
+        self._stop_event.clear()
+        self.info = SearchInfo()
+        self.nodes = 0
+        self.depth_reached = 0
+        if self.deterministic:
+            self.tt.clear()
+            self.orderer = copy.deepcopy(self._orderer_template)
+        if not self._same_search:
+            self.tt.new_search()
+            self.orderer.new_search()
+        self._root_move = -1
+        if self.pv and self._pv_state == game.get_state() and not self.deterministic:
+            self._root_move = self.pv[0]
+
+        if self.tablebase is not None:
+            found = self.tablebase.best_move(game)
+            if found is not None:
+                row, col = found[0]
+                self.pv, self._pv_state = [row * 4 + col], game.get_state()
+                self.info.move = found[0]
+                self._update_info(start)
+                return found[0]
+
+        empty_cells = 16 - bin(game.white | game.black).count('1')
+        if self.max_depth is not None:
+            max_depth = min(self.max_depth, empty_cells)
+        elif self.time_limit_ms is None:
+            # The root move itself is one ply on top of the difficulty depth
+            max_depth = min(self.depth_map[self.difficulty] + 1, empty_cells)
+        else:
+            max_depth = empty_cells
+        if self.time_limit_ms is None:
+            self._deadline = None
+        else:
+            self._deadline = time.perf_counter() + self.time_limit_ms / 1000
+
+        best_move = -1
+        root_pv = None
+        history_size = len(game.history)
+        if self.workers > 1 and max_depth >= PARALLEL_MIN_DEPTH:
+            if self._splitter is None:
+                from .parallel import RootSplitter
+                self._splitter = RootSplitter(self, self.workers)
+            if not self._same_search:
+                self._splitter.new_search()
+        for depth in range(1, max_depth + 1):
+            try:
+                if self.workers > 1 and depth >= PARALLEL_MIN_DEPTH:
+                    score, root_pv = self._search_parallel(game, depth)
+                else:
+                    score = self._minimax(game, depth, True, -INFINITY, INFINITY)
+            except SearchTimeout:
+                while len(game.history) > history_size:
+                    game.pop()
+                break
+            best_move = self._root_move
+            self.depth_reached = depth
+            self._update_info(start)
+            self.info.depth, self.info.score = depth, score
+            self.info.move = divmod(best_move, 4)
+            if root_pv is None:
+                line = self._extract_pv(game, best_move, depth)
+            else:
+                # The workers' tables hold the line, not this one
+                line = root_pv
+            self.info.pv = [divmod(index, 4) for index in line]
+            iterations = self.info.iterations
+            previous = iterations[-1].elapsed if iterations else 0.0
+            iterations.append(IterationInfo(depth, score, self.info.move, self.nodes,
+                                            self.info.elapsed, self.info.elapsed - previous))
+            if self.info_callback is not None:
+                self.info_callback(self.info)
+            if abs(score) > MATE_BOUND:
+                break
+
+        if best_move < 0:
+            # Not even the first iteration finished: play any legal move
+            moves = self.orderer.order(game, 0, self._root_move)
+            if not moves:
+                return None
+            best_move = moves[0]
+        self._update_info(start)
+        if root_pv is None:
+            self.pv = self._extract_pv(game, best_move, max(self.depth_reached, 1))
+        else:
+            self.pv = root_pv
+        self._pv_state = game.get_state()
+        self.info.move = divmod(best_move, 4)
+        self.info.pv = [divmod(index, 4) for index in self.pv]
+        return divmod(best_move, 4)
+
+    def _update_info(self, start):
+        """Copy the running statistics of the search into ``info``."""
+        info = self.info
+        info.nodes = self.nodes
+        info.elapsed = time.perf_counter() - start
+        info.tt_hit_rate = self.tt.hit_rate()
+        info.cutoffs = self.orderer.cutoffs
+        info.first_move_cutoffs = self.orderer.first_move_cutoffs
+        info.cutoff_rate = self.orderer.cutoff_rate()
+
+    def notify_move(self, row, col):
+        """Advance the principal variation, or drop it if the move leaves it."""
+        index = row * 4 + col
+        if not self.pv or self.pv[0] != index or self._pv_state is None:
+            self.pv, self._pv_state = [], None
+            return
+        white, black, player = self._pv_state
+        if player == 1:
+            white |= CELL_BITS[index]
+        else:
+            black |= CELL_BITS[index]
+        self._pv_state = orbit_mask(white), orbit_mask(black), 3 - player
+        self.pv = self.pv[1:]
+
+    def new_game(self):
+        """Forget the principal variation of the previous game."""
+        self.pv, self._pv_state = [], None
+
+    def _extract_pv(self, game, best_move, length):
+        """
+        Follow the best moves stored in the transposition table.
+
+        Args:
+            game: Root position, left unchanged
+            best_move (int): Best root move found by the search
+            length (int): Maximum number of moves
+
+        Returns:
+            list[int]: Principal variation as cell indices
+        """
+        pv = []
+        move = best_move
+        while move >= 0 and len(pv) < length and game.is_valid_move(move >> 2, move & 3):
+            pv.append(move)
+            game.push(move >> 2, move & 3)
+            if game.move_made or game.is_board_full():
+                break
+            move = self._tt_move(game)
+        for _ in pv:
+            game.pop()
+        return pv
+
+    def _tt_move(self, game):
+        """Get the best move stored for a position, or -1."""
+        if self.canonical_tt:
+            white, black, symmetry = canonical(game.white, game.black)
+            key = board_key(white, black) ^ SIDE_KEYS[game.current_player]
+        else:
+            key = game.hash_key()
+            symmetry = 0
+        entry = self.tt.probe(key)
+        if entry is None or entry[3] < 0:
+            return -1
+        return SYMMETRIES[INVERSES[symmetry]][entry[3]] if symmetry else entry[3]
+
+    def _search_parallel(self, game, depth):
+        """
+        Run one iteration with the root moves split across processes.
+
+        Args:
+            game: Root position
+            depth: Depth of the iteration
+
+        Returns:
+            tuple[int, list[int]]: Score of the best root move and its
+                principal variation
+        """
+        moves = self.orderer.order(game, 0, self._root_move)
+        best_move, score, nodes, pv = self._splitter.search(self, game, depth, moves,
+                                                            self.deterministic)
+        self.nodes += nodes
+        self._root_move = best_move
+        return score, pv
+
+    def close(self):
+        """Shut down the worker processes of parallel searches, if any."""
+        if self._splitter is not None:
+            self._splitter.close()
+            self._splitter = None
+
+    def _minimax(self, game, depth, maximizing_player, alpha=-INFINITY, beta=INFINITY, ply=0):
         """
         Minimax algorithm with alpha-beta pruning.
-        
+
+        Children are explored in place with ``game.push`` / ``game.pop``,
+        so the game is left unchanged when the call returns.
+
         Args:
             game: Current game state
             depth: Search depth remaining
             maximizing_player: True if AI's turn
             alpha, beta: Alpha-beta pruning bounds
-            
+            ply: Distance from the root of the search
+
         Returns:
             int: Position score
         """
-        if depth == 0 or game.check_win_for_player(1) or game.check_win_for_player(2):
-            return evaluate_position(game, self.player)
-            
-        if maximizing_player:
-            max_eval = float('-inf')
-            for row in range(4):
-                for col in range(4):
-                    if game.is_valid_move(row, col):
-                        game_copy = deepcopy(game)
-                        game_copy.make_move(row, col)
-                        eval = self._minimax(game_copy, depth - 1, False, alpha, beta)
-                        max_eval = max(max_eval, eval)
-                        alpha = max(alpha, eval)
-                        if beta <= alpha:
-                            break
-            return max_eval
+        self.nodes += 1
+        if not self.nodes & CLOCK_CHECK_MASK and (
+                self._stop_event.is_set()
+                or self._deadline is not None and time.perf_counter() >= self._deadline):
+            raise SearchTimeout()
+        score = self._terminal_score(game, ply)
+        if score is not None:
+            return score
+        if depth == 0:
+            return evaluate_position(game, self.player, self.weights)
+
+        if self.canonical_tt:
+            # Key the table on the canonical position; moves are stored in
+            # the canonical frame and mapped back on retrieval
+            white, black, symmetry = canonical(game.white, game.black)
+            key = board_key(white, black) ^ SIDE_KEYS[game.current_player]
+        else:
+            key = game.hash_key()
+            symmetry = 0
+        entry = self.tt.probe(key)
+        tt_move = -1
+        if entry is not None:
+            entry_depth, flag, entry_score, tt_move = entry
+            if symmetry and tt_move >= 0:
+                tt_move = SYMMETRIES[INVERSES[symmetry]][tt_move]
+            if entry_depth >= depth and ply:
+                entry_score = _score_from_tt(entry_score, ply)
+                if flag == EXACT:
+                    return entry_score
+                if flag == LOWER:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    return entry_score
+        if ply == 0 and tt_move < 0:
+            tt_move = self._root_move
+
+        alpha_orig, beta_orig = alpha, beta
+        best_score = -INFINITY if maximizing_player else INFINITY
+        best_move = -1
+        for move_number, index in enumerate(self.orderer.order(game, ply, tt_move)):
+            game.push(index >> 2, index & 3)
+            eval = self._minimax(game, depth - 1, game.current_player == self.player,
+                                 alpha, beta, ply + 1)
+            game.pop()
+            if maximizing_player:
+                if eval > best_score:
+                    best_score, best_move = eval, index
+                alpha = max(alpha, eval)
+            else:
+                if eval < best_score:
+                    best_score, best_move = eval, index
+                beta = min(beta, eval)
+            if beta <= alpha:
+                self.orderer.record_cutoff(game.current_player, ply, index,
+                                           depth, move_number)
+                break
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta_orig:
+            flag = LOWER
         else:
-            min_eval = float('inf')
-            for row in range(4):
-                for col in range(4):
-                    if game.is_valid_move(row, col):
-                        game_copy = deepcopy(game)
-                        game_copy.make_move(row, col)
-                        eval = self._minimax(game_copy, depth - 1, True, alpha, beta)
-                        min_eval = min(min_eval, eval)
-                        beta = min(beta, eval)
-                        if beta <= alpha:
-                            break
-            return min_eval
\ No newline at end of file
+            flag = EXACT
+        stored_move = SYMMETRIES[symmetry][best_move] if best_move >= 0 else -1
+        self.tt.store(key, depth, flag, _score_to_tt(best_score, ply), stored_move)
+        if ply == 0:
+            self._root_move = best_move
+        return best_score
+
+    def _terminal_score(self, game, ply):
+        """
+        Score a finished game, or return None if the game goes on.
+
+        Wins are worth more the sooner they happen, so the search prefers
+        quick wins and slow losses.
+        """
+        white_wins = has_win(game.white)
+        black_wins = has_win(game.black)
+        if white_wins and black_wins:
+            return 0
+        if white_wins or black_wins:
+            winner = 1 if white_wins else 2
+            score = MATE_SCORE - ply
+            return score if winner == self.player else -score
+        if game.is_board_full():
+            return 0
+        return None
+
+
+def _score_to_tt(score, ply):
+    """Make a win score relative to the stored node instead of the root."""
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    """Make a stored win score relative to the root again."""
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
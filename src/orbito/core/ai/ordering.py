@@ -0,0 +1,180 @@
+"""Move ordering for the alpha-beta search."""
+from ..bitboard import CELL_BITS, FULL_MASK, ORBIT_TARGET, WIN_TABLE, orbit_mask
+
+# Deepest ply the killer tables cover (a game lasts at most 16 turns)
+MAX_PLY = 17
+
+# Bit of the cell each ball lands on after the orbit, by source cell
+_LANDING_BITS = tuple(CELL_BITS[target] for target in ORBIT_TARGET)
+
+
+class MoveOrderer:
+    """
+    Plain move ordering: transposition table move first, then raster order.
+
+    Subclasses refine ``order`` and ``record_cutoff``. The base class
+    keeps the per-search cutoff statistics shared by all orderers.
+
+    Attributes:
+        nodes (int): Interior nodes whose moves were ordered
+        cutoffs (int): Nodes that ended with a beta cutoff
+        first_move_cutoffs (int): Cutoffs produced by the first move tried
+    """
+
+    def __init__(self):
+        """Initialize ordering state and statistics."""
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def new_search(self):
+        """Reset statistics before a new search."""
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def order(self, game, ply, tt_move=-1):
+        """
+        List the moves of a position in the order they should be searched.
+
+        Args:
+            game: Current game state
+            ply: Distance from the root of the search
+            tt_move (int): Best cell index stored for the position, or -1
+
+        Returns:
+            list[int]: Empty cell indices
+        """
+        self.nodes += 1
+        empty = ~(game.white | game.black) & FULL_MASK
+        moves = [index for index in range(16) if empty >> index & 1]
+        if tt_move >= 0 and empty >> tt_move & 1:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        return moves
+
+    def record_cutoff(self, player, ply, move, depth, move_number):
+        """
+        Record a move that caused a beta cutoff.
+
+        Args:
+            player (int): Player who played the move
+            ply: Distance from the root of the search
+            move (int): Cell index of the move
+            depth: Remaining depth of the node
+            move_number (int): Position of the move in the ordered list
+        """
+        self.cutoffs += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+
+    def cutoff_rate(self):
+        """
+        Get the share of ordered nodes that ended with a cutoff.
+
+        Returns:
+            float: Cutoff rate between 0 and 1
+        """
+        return self.cutoffs / self.nodes if self.nodes else 0.0
+
+    def first_move_cutoff_rate(self):
+        """
+        Get the share of cutoffs produced by the first move searched.
+
+        Returns:
+            float: First-move cutoff rate between 0 and 1
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+
+class HeuristicOrderer(MoveOrderer):
+    """
+    Move ordering with tactical, killer and history heuristics.
+
+    Moves are searched in this order:
+    1. Transposition table move
+    2. Immediate wins: the ball completes a line after the orbit
+    3. Blocks: the ball lands on the cell where the opponent's next ball
+       would complete a line after the following orbit
+    4. Killer moves: the last two moves that caused a cutoff at this ply
+    5. Remaining moves by history score, highest first
+
+    The history score of a move grows with the square of the depth of
+    every cutoff it causes and is halved at each new search.
+    """
+
+    def __init__(self):
+        """Initialize killer and history tables."""
+        super().__init__()
+        self.killers = [[-1, -1] for _ in range(MAX_PLY)]
+        self.history = [[0] * 16 for _ in range(3)]
+
+    def new_search(self):
+        """Reset statistics and killers, age the history scores."""
+        super().new_search()
+        for killers in self.killers:
+            killers[0] = killers[1] = -1
+        for scores in self.history:
+            for index in range(16):
+                scores[index] >>= 1
+
+    def order(self, game, ply, tt_move=-1):
+        """
+        List the moves of a position in the order they should be searched.
+
+        Args:
+            game: Current game state
+            ply: Distance from the root of the search
+            tt_move (int): Best cell index stored for the position, or -1
+
+        Returns:
+            list[int]: Empty cell indices
+        """
+        self.nodes += 1
+        player = game.current_player
+        if player == 1:
+            own, other = game.white, game.black
+        else:
+            own, other = game.black, game.white
+        empty = ~(own | other) & FULL_MASK
+        # The orbit moves every ball independently, so the rotated mask of
+        # a placement is the rotated mask plus the landing cell of the ball
+        own_orbit = orbit_mask(own)
+        other_orbit = orbit_mask(other)
+        killers = self.killers[ply]
+        scores = self.history[player]
+
+        first, wins, blocks, killer_moves, quiet = [], [], [], [], []
+        for index in range(16):
+            if not empty >> index & 1:
+                continue
+            if index == tt_move:
+                first.append(index)
+            elif WIN_TABLE[own_orbit | _LANDING_BITS[index]]:
+                wins.append(index)
+            elif WIN_TABLE[orbit_mask(other_orbit | _LANDING_BITS[index])]:
+                blocks.append(index)
+            elif index == killers[0] or index == killers[1]:
+                killer_moves.append(index)
+            else:
+                quiet.append(index)
+        quiet.sort(key=scores.__getitem__, reverse=True)
+        return first + wins + blocks + killer_moves + quiet
+
+    def record_cutoff(self, player, ply, move, depth, move_number):
+        """
+        Record a move that caused a beta cutoff.
+
+        Args:
+            player (int): Player who played the move
+            ply: Distance from the root of the search
+            move (int): Cell index of the move
+            depth: Remaining depth of the node
+            move_number (int): Position of the move in the ordered list
+        """
+        super().record_cutoff(player, ply, move, depth, move_number)
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[player][move] += depth * depth
@@ -0,0 +1,189 @@
+"""
+Parallel root search across processes.
+
+An iteration of the search is split at the root: the first root move,
+usually the best move of the previous iteration, is searched alone to get
+a bound, then the other root moves are searched at the same time by a
+``ProcessPoolExecutor``, each with that bound as alpha. Moves that cannot
+beat the first one fail low quickly; the others return exact scores.
+
+Every worker process owns a ``MinimaxAI`` with its own transposition
+table, kept between tasks. In deterministic mode each task starts from an
+empty table and a fresh orderer instead, so the result only depends on
+the position and the search settings, never on which worker ran what.
+"""
+import copy
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from ..game import OrbitGame
+from .minmax import INFINITY, MinimaxAI, SearchTimeout
+
+# Seconds between two checks of the stop request and the deadline
+_WAIT_SECONDS = 0.005
+
+# Engine of the current worker process, set by _init_worker
+_worker_ai = None
+_worker_orderer = None
+_worker_search_id = None
+
+
+def _init_worker(player, tt_size_mb, canonical_tt, orderer, weights, stop_event):
+    """Create the engine of a worker process."""
+    global _worker_ai, _worker_orderer
+    _worker_orderer = orderer
+    _worker_ai = MinimaxAI(player, tt_size_mb=tt_size_mb, orderer=copy.deepcopy(orderer),
+                           canonical_tt=canonical_tt, weights=weights)
+    # Share the pool-wide stop flag: the search checks it with its clock
+    _worker_ai._stop_event = stop_event
+
+
+def search_root_move(search_id, state, move, depth, alpha, time_left_ms, fresh):
+    """
+    Search one root move in a worker process.
+
+    Args:
+        search_id (int): Identifier of the calling search; the table ages
+            once per search, as in a serial search
+        state (tuple[int, int, int]): Root position from ``get_state``
+        move (int): Cell index of the root move
+        depth (int): Depth of the iteration, the root move included
+        alpha (int): Score the move has to beat
+        time_left_ms (float): Remaining budget, or None
+        fresh (bool): Start from an empty table and a fresh orderer
+
+    Returns:
+        tuple[int or None, int, list[int]]: (score, nodes, pv); the score
+            is None when the search was stopped or ran out of time, and
+            the principal variation starts with ``move``
+    """
+    global _worker_search_id
+    ai = _worker_ai
+    if fresh:
+        ai.tt.clear()
+        ai.orderer = copy.deepcopy(_worker_orderer)
+    if fresh or search_id != _worker_search_id:
+        _worker_search_id = search_id
+        ai.tt.new_search()
+        ai.orderer.new_search()
+    ai.nodes = 0
+    ai._deadline = None if time_left_ms is None else time.perf_counter() + time_left_ms / 1000
+
+    game = OrbitGame()
+    game.set_state(*state)
+    game.push(move >> 2, move & 3)
+    try:
+        score = ai._minimax(game, depth - 1, game.current_player == ai.player,
+                            alpha, INFINITY, 1)
+    except SearchTimeout:
+        return None, ai.nodes, [move]
+    pv = [move]
+    if not (game.move_made or game.is_board_full()):
+        pv += ai._extract_pv(game, ai._tt_move(game), depth - 1)
+    return score, ai.nodes, pv
+
+
+def _ping():
+    """Empty task, run once the worker process is initialized."""
+    return None
+
+
+class RootSplitter:
+    """
+    Process pool searching the root moves of an engine in parallel.
+
+    Attributes:
+        workers (int): Number of worker processes
+    """
+
+    def __init__(self, ai, workers):
+        """
+        Start the worker processes.
+
+        Workers are spawned rather than forked, so they are safe to start
+        from a program that runs threads, such as the GUI.
+
+        Args:
+            ai (MinimaxAI): Engine whose settings the workers copy
+            workers (int): Number of worker processes
+        """
+        context = multiprocessing.get_context('spawn')
+        self.workers = workers
+        self._stop_event = context.Event()
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(ai.player, ai.tt_size_mb, ai.canonical_tt, ai._orderer_template,
+                      ai.weights, self._stop_event)
+        )
+        self._search_id = 0
+        # Spawning and importing take longer than a fast move: pay it now
+        wait([self._executor.submit(_ping) for _ in range(workers)])
+
+    def new_search(self):
+        """Start a new search: worker tables age once."""
+        self._search_id += 1
+
+    def search(self, ai, game, depth, moves, deterministic):
+        """
+        Search every root move of an iteration.
+
+        Args:
+            ai (MinimaxAI): Calling engine; its stop request and deadline
+                end the iteration
+            game (OrbitGame): Root position
+            depth (int): Depth of the iteration
+            moves (list[int]): Root moves, most promising first
+            deterministic (bool): Search each move from a clean state
+
+        Returns:
+            tuple[int, int, int, list[int]]: (best_move, best_score, nodes,
+                principal variation)
+
+        Raises:
+            SearchTimeout: If the engine was stopped or ran out of time
+                before the iteration completed
+        """
+        state = game.get_state()
+
+        def submit(move, alpha):
+            time_left_ms = None
+            if ai._deadline is not None:
+                time_left_ms = max(0.0, (ai._deadline - time.perf_counter()) * 1000)
+            return self._executor.submit(search_root_move, self._search_id, state, move,
+                                         depth, alpha, time_left_ms, deterministic)
+
+        best_score, nodes, best_pv = self._collect(ai, [submit(moves[0], -INFINITY)])[0]
+        best_move = moves[0]
+        if len(moves) > 1:
+            results = self._collect(ai, [submit(move, best_score) for move in moves[1:]])
+            for move, (score, move_nodes, pv) in zip(moves[1:], results):
+                nodes += move_nodes
+                # Ties keep the earlier move, as the serial search does
+                if score > best_score:
+                    best_move, best_score, best_pv = move, score, pv
+        return best_move, best_score, nodes, best_pv
+
+    def _collect(self, ai, futures):
+        """Wait for tasks in order, ending them early on stop or timeout."""
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=_WAIT_SECONDS, return_when=FIRST_COMPLETED)
+            if pending and (ai.stop_requested() or ai._deadline is not None
+                            and time.perf_counter() >= ai._deadline):
+                self._stop_event.set()
+                wait(pending)
+                self._stop_event.clear()
+                raise SearchTimeout()
+        results = [future.result() for future in futures]
+        if any(result[0] is None for result in results):
+            raise SearchTimeout()
+        return results
+
+    def close(self):
+        """Shut the worker processes down."""
+        # Searches wait for all their tasks, so none is pending here
+        self._stop_event.set()
+        self._executor.shutdown()
@@ -0,0 +1,143 @@
+"""Background search on the opponent's time."""
+import threading
+
+from ..bitboard import FULL_MASK
+
+# Engine attributes describing its last real search, kept across pondering
+_ENGINE_STATE = ('pv', '_pv_state', 'info')
+
+
+class Ponderer:
+    """
+    Pre-compute the AI's answers while the opponent is thinking.
+
+    After the AI has moved, ``start`` searches every opponent reply in a
+    background thread, most promising replies first, and records the AI's
+    best answer to each of them. When the opponent's move is known,
+    ``lookup`` returns the prepared answer at once. Replies that were not
+    reached still benefit from the transposition table the engine filled.
+
+    The engine is shared with the normal search, so ``stop`` must be
+    called before the engine is used again, including before it is told
+    about the opponent's move. ``stop`` puts back the principal variation
+    and statistics the engine had before pondering, and the table is aged
+    once per pondering session rather than once per reply.
+
+    Attributes:
+        ai_player (BaseAI): Engine used for the searches
+        replies (dict): Position state after the opponent's move mapped to
+            the AI's answer (row, col)
+        infos (dict): Position state after the opponent's move mapped to
+            the engine's statistics of that answer, if it reports any
+    """
+
+    def __init__(self, ai_player):
+        """
+        Create a ponderer for an AI player.
+
+        Args:
+            ai_player (BaseAI): Engine used for the searches
+        """
+        self.ai_player = ai_player
+        self.replies = {}
+        self.infos = {}
+        self._saved = None
+        self._thread = None
+        self._cancelled = threading.Event()
+
+    def start(self, game):
+        """
+        Start pondering a position where the opponent is to move.
+
+        Args:
+            game (OrbitGame): Position to ponder; it is copied
+        """
+        self.stop()
+        self.replies = {}
+        self.infos = {}
+        self._saved = {name: getattr(self.ai_player, name) for name in _ENGINE_STATE
+                       if hasattr(self.ai_player, name)}
+        self._cancelled.clear()
+        self._thread = threading.Thread(target=self._ponder, args=(game.copy(),),
+                                        daemon=True)
+        self._thread.start()
+
+    def _ponder(self, game):
+        """Thread body: answer each opponent reply in turn."""
+        ai = self.ai_player
+        orderer = getattr(ai, 'orderer', None)
+        if orderer is not None:
+            moves = orderer.order(game, 0)
+        else:
+            empty = ~(game.white | game.black) & FULL_MASK
+            moves = [index for index in range(16) if empty >> index & 1]
+        try:
+            for index in moves:
+                if self._cancelled.is_set():
+                    return
+                reply = game.copy()
+                reply.push(index >> 2, index & 3)
+                if reply.move_made or reply.is_board_full():
+                    continue  # The game is over after this reply
+                move = ai.get_best_move(reply)
+                if self._cancelled.is_set():
+                    return  # The search was cut short: its move is not reliable
+                self.replies[reply.get_state()] = move
+                self.infos[reply.get_state()] = getattr(ai, 'info', None)
+                # Later replies continue the same search: the table ages once
+                if hasattr(ai, '_same_search'):
+                    ai._same_search = True
+        finally:
+            if hasattr(ai, '_same_search'):
+                ai._same_search = False
+
+    def lookup(self, game):
+        """
+        Get the prepared answer to the current position.
+
+        Args:
+            game (OrbitGame): Position after the opponent's move
+
+        Returns:
+            tuple[int, int] or None: Prepared move, None if not pondered
+        """
+        return self.replies.get(game.get_state())
+
+    def lookup_info(self, game):
+        """
+        Get the statistics of the prepared answer to the current position.
+
+        Args:
+            game (OrbitGame): Position after the opponent's move
+
+        Returns:
+            SearchInfo or None: Statistics, None if not pondered or if the
+                engine does not report any
+        """
+        return self.infos.get(game.get_state())
+
+    def is_running(self):
+        """
+        Check whether pondering is in progress.
+
+        Returns:
+            bool: True while the background thread is searching
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        """
+        Stop pondering and wait for the engine to be free.
+
+        Answers found so far are kept for ``lookup``, and the engine gets
+        back the state of its last search before pondering.
+        """
+        self._cancelled.set()
+        thread, self._thread = self._thread, None
+        while thread is not None and thread.is_alive():
+            self.ai_player.stop()
+            thread.join(0.01)
+        if self._saved is not None:
+            for name, value in self._saved.items():
+                setattr(self.ai_player, name, value)
+            self._saved = None
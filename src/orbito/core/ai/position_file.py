@@ -0,0 +1,136 @@
+"""
+Memory-mapped position database files.
+
+Tablebases and opening books are shipped as one binary file each:
+
+    offset  size        field
+    0       8           magic ``b'ORBTPDB\\0'``
+    8       2           format version
+    10      1           kind (KIND_TABLEBASE or KIND_OPENING_BOOK)
+    11      1           value size in bytes (1 or 2)
+    12      4           flags (FLAG_CANONICAL_KEYS)
+    16      8           number of positions
+    24      8           reserved, zero
+    32      4 * count   position keys, uint32, sorted ascending
+    ...     size*count  values, in key order
+
+All integers are little-endian. Files are opened with ``mmap`` and the
+key and value sections are exposed as memoryviews over the mapping, so
+opening a file reads nothing but its header and a probe only touches the
+pages its binary search visits.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+MAGIC = b'ORBTPDB\0'
+VERSION = 1
+
+KIND_TABLEBASE = 1
+KIND_OPENING_BOOK = 2
+
+# Keys are canonical representatives under the board symmetries
+FLAG_CANONICAL_KEYS = 1
+
+_HEADER = struct.Struct('<8sHBBIQ8x')
+_VALUE_FORMATS = {1: 'B', 2: 'H'}
+
+
+class PositionFileError(Exception):
+    """Raised when a file is not a valid position database."""
+
+
+def write_position_file(path, keys, values, kind, value_size=1, flags=0):
+    """
+    Write a position database file.
+
+    Args:
+        path (str): Destination file
+        keys (Iterable[int]): Position keys, sorted ascending
+        values (Iterable[int]): One value per key
+        kind (int): KIND_TABLEBASE or KIND_OPENING_BOOK
+        value_size (int): Bytes per value (1 or 2)
+        flags (int): Combination of FLAG_* values
+    """
+    keys = array('I', keys)
+    values = array(_VALUE_FORMATS[value_size], values)
+    if len(keys) != len(values):
+        raise ValueError("keys and values must have the same length")
+    if sys.byteorder != 'little':
+        keys.byteswap()
+        values.byteswap()
+    with open(path, 'wb') as handle:
+        handle.write(_HEADER.pack(MAGIC, VERSION, kind, value_size, flags, len(keys)))
+        handle.write(keys.tobytes())
+        handle.write(values.tobytes())
+
+
+class PositionFile:
+    """
+    Read-only, memory-mapped view of a position database file.
+
+    Attributes:
+        kind (int): KIND_TABLEBASE or KIND_OPENING_BOOK
+        flags (int): Combination of FLAG_* values
+        keys (Sequence[int]): Sorted position keys
+        values (Sequence[int]): Value of each key
+    """
+
+    def __init__(self, path):
+        """
+        Map a file and validate its header.
+
+        Args:
+            path (str): File to open
+
+        Raises:
+            PositionFileError: If the header or size is invalid
+        """
+        with open(path, 'rb') as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            self.close()
+            raise PositionFileError(f"{path}: file too short")
+        magic, version, kind, value_size, flags, count = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self.close()
+            raise PositionFileError(f"{path}: not an Orbito position file")
+        if version != VERSION or value_size not in _VALUE_FORMATS:
+            self.close()
+            raise PositionFileError(f"{path}: unsupported format version {version}")
+        keys_end = _HEADER.size + 4 * count
+        if len(self._mmap) != keys_end + value_size * count:
+            self.close()
+            raise PositionFileError(f"{path}: truncated file")
+
+        self.kind = kind
+        self.flags = flags
+        view = memoryview(self._mmap)
+        self._view = view
+        if sys.byteorder == 'little':
+            self.keys = view[_HEADER.size:keys_end].cast('I')
+            self.values = view[keys_end:].cast(_VALUE_FORMATS[value_size])
+        else:
+            # Big-endian hosts pay for one swapped copy
+            self.keys = array('I', view[_HEADER.size:keys_end])
+            self.values = array(_VALUE_FORMATS[value_size], view[keys_end:])
+            self.keys.byteswap()
+            self.values.byteswap()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def close(self):
+        """Release the mapping."""
+        for name in ('keys', 'values', '_view'):
+            view = self.__dict__.pop(name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,109 @@
+"""Statistics reported by a search."""
+
+
+class IterationInfo:
+    """
+    Result of one iteration of an iteratively deepened search.
+
+    Attributes:
+        depth (int): Depth of the iteration
+        score (int): Score of the best move
+        move (tuple[int, int]): Best move (row, col)
+        nodes (int): Nodes visited since the search started
+        elapsed (float): Seconds since the search started
+        duration (float): Seconds spent on this iteration alone
+    """
+
+    def __init__(self, depth, score, move, nodes, elapsed, duration):
+        self.depth = depth
+        self.score = score
+        self.move = move
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.duration = duration
+
+    def as_dict(self):
+        """
+        Convert the iteration to plain data for logs.
+
+        Returns:
+            dict: Attributes by name
+        """
+        return {'depth': self.depth, 'score': self.score, 'move': self.move,
+                'nodes': self.nodes, 'elapsed': self.elapsed, 'duration': self.duration}
+
+
+class SearchInfo:
+    """
+    Telemetry of a search, updated after every completed iteration.
+
+    Attributes:
+        depth (int): Depth of the deepest completed iteration
+        score (int): Score of the best move at that depth
+        move (tuple[int, int]): Best move (row, col), None before the
+            first iteration completes
+        pv (list[tuple[int, int]]): Principal variation, best move first
+        nodes (int): Positions visited
+        elapsed (float): Seconds spent searching
+        tt_hit_rate (float): Share of table probes that found an entry
+        cutoffs (int): Nodes that ended with a beta cutoff
+        first_move_cutoffs (int): Cutoffs produced by the first move tried
+        cutoff_rate (float): Share of ordered nodes that ended with a cutoff
+        iterations (list[IterationInfo]): Completed iterations, in order
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.score = 0
+        self.move = None
+        self.pv = []
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.tt_hit_rate = 0.0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.cutoff_rate = 0.0
+        self.iterations = []
+
+    def nodes_per_second(self):
+        """
+        Get the search speed.
+
+        Returns:
+            float: Nodes visited per second
+        """
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        """
+        Describe the search in one line, for a status bar or a log.
+
+        Returns:
+            str: Depth, score, nodes, speed and principal variation
+        """
+        pv = ' '.join(f"{row},{col}" for row, col in self.pv)
+        return (f"depth {self.depth}  score {self.score}  {self.nodes} nodes  "
+                f"{self.nodes_per_second() / 1000:.0f} kN/s  "
+                f"{self.elapsed * 1000:.0f} ms  pv {pv}")
+
+    def as_dict(self):
+        """
+        Convert the statistics to plain data for logs.
+
+        Returns:
+            dict: Attributes by name, with ``nodes_per_second``
+        """
+        return {
+            'depth': self.depth,
+            'score': self.score,
+            'move': self.move,
+            'pv': self.pv,
+            'nodes': self.nodes,
+            'nodes_per_second': self.nodes_per_second(),
+            'elapsed': self.elapsed,
+            'tt_hit_rate': self.tt_hit_rate,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoffs': self.first_move_cutoffs,
+            'cutoff_rate': self.cutoff_rate,
+            'iterations': [iteration.as_dict() for iteration in self.iterations],
+        }
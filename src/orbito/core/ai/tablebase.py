@@ -0,0 +1,406 @@
+"""
+Exact game-theoretic values of Orbito positions.
+
+A tablebase maps every reachable, unfinished position to its value for
+the player to move under perfect play: win, draw or loss, plus the number
+of turns until the game ends. It is built offline by ``generate_tablebase``
+(see ``scripts/build_tablebase.py``), stored in a memory-mapped position
+file (see ``position_file``) and probed in O(log n) with a binary search
+over the sorted position keys.
+
+Positions are keyed by ``white | black << 16``, usually of the canonical
+representative of their symmetry class. The player to move is
+implied by the ball counts (White moves when both players have the same
+number of balls), so the key does not store it.
+
+Each value is packed in one byte whose order matches the preference of
+the player to move:
+    - ``WIN_BASE - distance`` for a win in ``distance`` turns
+    - ``DRAW_VALUE`` for a draw
+    - ``distance`` for a loss in ``distance`` turns
+"""
+import os
+from array import array
+from bisect import bisect_left
+
+from ..bitboard import CELL_BITS, FULL_MASK, WIN_TABLE, orbit_mask
+from ..symmetry import SYMMETRIES, canonical_key, transform_mask
+from .position_file import (
+    FLAG_CANONICAL_KEYS, KIND_TABLEBASE, PositionFile, PositionFileError,
+    write_position_file
+)
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+WIN_BASE = 200
+DRAW_VALUE = 100
+
+DEFAULT_FILENAME = 'orbito.tb'
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))), 'data', DEFAULT_FILENAME)
+
+# Installed tablebase, opened on first use and shared by every engine
+_default_tablebase = None
+
+
+def encode_value(result, distance):
+    """
+    Pack a game result into a value byte.
+
+    Args:
+        result (int): WIN, DRAW or LOSS for the player to move
+        distance (int): Turns until the game ends
+
+    Returns:
+        int: Packed value
+    """
+    if result == WIN:
+        return WIN_BASE - distance
+    if result == LOSS:
+        return distance
+    return DRAW_VALUE
+
+
+def decode_value(value):
+    """
+    Unpack a value byte.
+
+    Args:
+        value (int): Packed value
+
+    Returns:
+        tuple[int, int]: (result, distance); draws have distance 0
+    """
+    if value > DRAW_VALUE:
+        return WIN, WIN_BASE - value
+    if value == DRAW_VALUE:
+        return DRAW, 0
+    return LOSS, value
+
+
+def parent_value(value):
+    """
+    Convert the value of a child position to the value of the move leading to it.
+
+    Args:
+        value (int): Packed value for the player to move in the child
+
+    Returns:
+        int: Packed value for the player who moved
+    """
+    if value > DRAW_VALUE:
+        return WIN_BASE - value + 1      # opponent wins in d: loss in d + 1
+    if value == DRAW_VALUE:
+        return value
+    return WIN_BASE - value - 1          # opponent loses in d: win in d + 1
+
+
+def terminal_value(white, black, mover):
+    """
+    Value of a move for the player who made it, if the move ends the game.
+
+    Args:
+        white (int): White occupancy mask after the orbit
+        black (int): Black occupancy mask after the orbit
+        mover (int): Player who made the move
+
+    Returns:
+        int or None: Packed value for the mover, None if the game goes on
+    """
+    white_wins = WIN_TABLE[white]
+    black_wins = WIN_TABLE[black]
+    if white_wins or black_wins:
+        if white_wins and black_wins:
+            return DRAW_VALUE
+        if white_wins == (mover == 1):
+            return encode_value(WIN, 1)
+        return encode_value(LOSS, 1)
+    if white | black == FULL_MASK:
+        return DRAW_VALUE
+    return None
+
+
+def side_to_move(white, black):
+    """
+    Player to move in a position of a game started by White.
+
+    Args:
+        white (int): White occupancy mask
+        black (int): Black occupancy mask
+
+    Returns:
+        int: 1 if White moves, 2 if Black moves
+    """
+    return 1 if bin(white).count('1') == bin(black).count('1') else 2
+
+
+class Tablebase:
+    """
+    Sorted position keys with their packed values.
+
+    Attributes:
+        keys (Sequence[int]): Sorted position keys
+        values (Sequence[int]): Packed value of each key
+        canonical (bool): Keys are canonical representatives, so probes
+            canonicalize the position first
+    """
+
+    def __init__(self, keys, values, canonical=False):
+        """
+        Wrap key and value sequences.
+
+        Args:
+            keys (Sequence[int]): Sorted position keys
+            values (Sequence[int]): Packed values, one per key
+            canonical (bool): Keys are canonical representatives
+        """
+        self.keys = keys
+        self.values = values
+        self.canonical = canonical
+        self._file = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def probe_value(self, white, black):
+        """
+        Look up the packed value of a position.
+
+        Args:
+            white (int): White occupancy mask
+            black (int): Black occupancy mask
+
+        Returns:
+            int or None: Packed value for the player to move, None if the
+                position is not in the tablebase
+        """
+        key = canonical_key(white, black) if self.canonical else white | black << 16
+        index = bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            return self.values[index]
+        return None
+
+    def probe(self, game):
+        """
+        Look up the value of a game position.
+
+        Args:
+            game: Game at the start of a turn
+
+        Returns:
+            tuple[int, int] or None: (result, distance) for the player to
+                move, None if the position is not covered
+        """
+        if game.move_made or side_to_move(game.white, game.black) != game.current_player:
+            return None
+        value = self.probe_value(game.white, game.black)
+        return None if value is None else decode_value(value)
+
+    def best_move(self, game):
+        """
+        Find a move with the best game-theoretic value.
+
+        Wins are played by the shortest route and losses delayed as long
+        as possible.
+
+        Args:
+            game: Game at the start of a turn
+
+        Returns:
+            tuple[tuple[int, int], tuple[int, int]] or None:
+                ((row, col), (result, distance)), None if the position is
+                not covered
+        """
+        if self.probe(game) is None:
+            return None
+        mover = game.current_player
+        best_value = -1
+        best_index = -1
+        occupied = game.white | game.black
+        for index in range(16):
+            if occupied & CELL_BITS[index]:
+                continue
+            white, black = game.white, game.black
+            if mover == 1:
+                white |= CELL_BITS[index]
+            else:
+                black |= CELL_BITS[index]
+            white, black = orbit_mask(white), orbit_mask(black)
+            value = terminal_value(white, black, mover)
+            if value is None:
+                value = self.probe_value(white, black)
+                if value is None:
+                    return None
+                value = parent_value(value)
+            if value > best_value:
+                best_value, best_index = value, index
+        return divmod(best_index, 4), decode_value(best_value)
+
+    def save(self, path):
+        """
+        Write the tablebase as a position database file.
+
+        Args:
+            path (str): Destination file
+        """
+        write_position_file(path, self.keys, self.values, KIND_TABLEBASE,
+                            flags=FLAG_CANONICAL_KEYS if self.canonical else 0)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Open a tablebase file without reading it into memory.
+
+        The file is memory-mapped and probed in place, so loading takes
+        the same time whatever the size of the file.
+
+        Args:
+            path (str): Source file
+
+        Returns:
+            Tablebase: Tablebase backed by the mapped file
+
+        Raises:
+            PositionFileError: If the file is not a tablebase
+        """
+        position_file = PositionFile(path)
+        if position_file.kind != KIND_TABLEBASE:
+            position_file.close()
+            raise PositionFileError(f"{path}: not a tablebase")
+        tablebase = cls(position_file.keys, position_file.values,
+                        bool(position_file.flags & FLAG_CANONICAL_KEYS))
+        tablebase._file = position_file
+        return tablebase
+
+    def close(self):
+        """Release the file backing a loaded tablebase."""
+        if self._file is not None:
+            self.keys = self.values = ()
+            self._file.close()
+            self._file = None
+
+
+def load_default_tablebase():
+    """
+    Open the tablebase shipped with the package, if there is one.
+
+    Looks for ``orbito/data/orbito.tb`` (DEFAULT_PATH), which PyInstaller
+    builds bundle next to the package modules. The file is mapped once
+    and the same tablebase is returned to every caller.
+
+    Returns:
+        Tablebase or None: Loaded tablebase, None if no file is installed
+    """
+    global _default_tablebase
+    if _default_tablebase is None and os.path.exists(DEFAULT_PATH):
+        _default_tablebase = Tablebase.load(DEFAULT_PATH)
+    return _default_tablebase
+
+
+def generate_tablebase(white=0, black=0, min_pieces=0, canonical=True, progress=None):
+    """
+    Solve every position reachable from a root position.
+
+    Positions are generated forward, one layer per number of balls, then
+    solved backward from the fullest layer: the value of a position is
+    the best value over its moves, and every move leads either to the
+    end of the game or to a position of the next layer.
+
+    With ``canonical``, each layer only holds one representative per
+    symmetry class (see ``symmetry``), which makes the table about four
+    times smaller.
+
+    Requires NumPy.
+
+    Args:
+        white (int): White occupancy mask of the root position
+        black (int): Black occupancy mask of the root position
+        min_pieces (int): Only keep positions with at least this many balls
+        canonical (bool): Store canonical representatives only
+        progress (callable): Called with a message after each layer
+
+    Returns:
+        Tablebase: Solved positions
+    """
+    import numpy as np
+
+    orbit_table = np.array([orbit_mask(mask) for mask in range(FULL_MASK + 1)],
+                           dtype=np.uint32)
+    win_table = np.frombuffer(bytes(WIN_TABLE), dtype=np.uint8).astype(bool)
+    bits = [np.uint32(bit) for bit in CELL_BITS]
+    root_pieces = bin(white | black).count('1')
+    symmetry_tables = [
+        np.array([transform_mask(mask, symmetry) for mask in range(FULL_MASK + 1)],
+                 dtype=np.uint32)
+        for symmetry in range(1, len(SYMMETRIES))
+    ] if canonical else []
+
+    def make_keys(white, black):
+        keys = white | black << 16
+        for table in symmetry_tables:
+            keys = np.minimum(keys, table[white] | table[black] << 16)
+        return keys
+
+    def children(keys, pieces):
+        # Yield (parents, white, black) for every cell: the positions where
+        # the cell is empty and the masks after playing it
+        white, black = keys & FULL_MASK, keys >> 16
+        for bit in bits:
+            parents = np.flatnonzero(((white | black) & bit) == 0)
+            if pieces % 2 == 0:
+                new_white = orbit_table[white[parents] | bit]
+                new_black = orbit_table[black[parents]]
+            else:
+                new_white = orbit_table[white[parents]]
+                new_black = orbit_table[black[parents] | bit]
+            yield parents, new_white, new_black
+
+    # Forward pass: unfinished positions reachable from the root
+    layers = [make_keys(np.array([white], dtype=np.uint32),
+                        np.array([black], dtype=np.uint32))]
+    for pieces in range(root_pieces, 15):
+        found = []
+        for _, new_white, new_black in children(layers[-1], pieces):
+            live = ~(win_table[new_white] | win_table[new_black])
+            found.append(make_keys(new_white[live], new_black[live]))
+        layers.append(np.unique(np.concatenate(found)))
+        if progress:
+            progress(f"layer {pieces + 1}: {len(layers[-1])} positions")
+
+    # Backward pass: best move value of every position
+    values = [None] * len(layers)
+    for depth in range(len(layers) - 1, -1, -1):
+        keys = layers[depth]
+        pieces = root_pieces + depth
+        if pieces < min_pieces:
+            break
+        best = np.zeros(len(keys), dtype=np.uint8)
+        for parents, new_white, new_black in children(keys, pieces):
+            own_wins = win_table[new_white if pieces % 2 == 0 else new_black]
+            other_wins = win_table[new_black if pieces % 2 == 0 else new_white]
+            value = np.full(len(parents), DRAW_VALUE, dtype=np.uint8)
+            value[own_wins & ~other_wins] = encode_value(WIN, 1)
+            value[other_wins & ~own_wins] = encode_value(LOSS, 1)
+            live = ~(own_wins | other_wins)
+            if pieces + 1 < 16:
+                child_keys = make_keys(new_white[live], new_black[live])
+                child_values = values[depth + 1][np.searchsorted(layers[depth + 1], child_keys)]
+                value[live] = np.where(
+                    child_values > DRAW_VALUE, (WIN_BASE + 1) - child_values,
+                    np.where(child_values == DRAW_VALUE, DRAW_VALUE,
+                             (WIN_BASE - 1) - child_values)
+                ).astype(np.uint8)
+            best[parents] = np.maximum(best[parents], value)
+        values[depth] = best
+        if progress:
+            progress(f"solved {pieces} balls: {len(keys)} positions")
+
+    first = max(0, min_pieces - root_pieces)
+    keys = np.concatenate(layers[first:])
+    packed = np.concatenate(values[first:])
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = array('I')
+    sorted_keys.frombytes(keys[order].astype(np.uint32).tobytes())
+    return Tablebase(sorted_keys, packed[order].tobytes(), canonical)
@@ -0,0 +1,111 @@
+"""Fixed-size transposition table for the search."""
+from array import array
+
+# Bound types stored with each entry (0 marks an empty slot)
+EXACT = 1
+LOWER = 2
+UPPER = 3
+
+# Bytes used by one slot: key (8) + score (4) + depth, flag, move, age (1 each)
+ENTRY_BYTES = 16
+
+
+class TranspositionTable:
+    """
+    Two-slot bucket transposition table with a fixed memory budget.
+
+    Entries live in flat typed arrays indexed by the low bits of the
+    Zobrist key, so the table never grows past the size chosen at
+    construction. Each bucket holds two slots:
+    - Slot 0 is depth-preferred: it keeps the deepest result, unless the
+      entry is left over from an earlier search
+    - Slot 1 is always-replace: it takes every result that slot 0 refused
+
+    Attributes:
+        buckets (int): Number of buckets (a power of two)
+        probes (int): Lookups since the last ``new_search``
+        hits (int): Lookups that found a matching entry
+    """
+
+    def __init__(self, size_mb=16):
+        """
+        Allocate the table.
+
+        Args:
+            size_mb (float): Memory budget in megabytes
+        """
+        slots = max(2, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.buckets = 1 << ((slots // 2).bit_length() - 1)
+        self._mask = self.buckets - 1
+        size = self.buckets * 2
+        self._keys = array('Q', bytes(8 * size))
+        self._scores = array('i', bytes(4 * size))
+        self._depths = array('b', bytes(size))
+        self._flags = array('B', bytes(size))
+        self._moves = array('b', bytes(size))
+        self._ages = array('B', bytes(size))
+        self._age = 0
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        """Start a new search: older entries become replaceable."""
+        self._age = (self._age + 1) & 0xFF
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        """Remove every entry."""
+        self._flags[:] = array('B', bytes(len(self._flags)))
+
+    def probe(self, key):
+        """
+        Look up a position.
+
+        Args:
+            key (int): 64-bit Zobrist key of the position
+
+        Returns:
+            tuple[int, int, int, int] or None: (depth, flag, score, move)
+                where move is a cell index or -1, None if not found
+        """
+        self.probes += 1
+        slot = (key & self._mask) << 1
+        for slot in (slot, slot + 1):
+            if self._flags[slot] and self._keys[slot] == key:
+                self.hits += 1
+                return (self._depths[slot], self._flags[slot],
+                        self._scores[slot], self._moves[slot])
+        return None
+
+    def store(self, key, depth, flag, score, move=-1):
+        """
+        Record a search result.
+
+        Args:
+            key (int): 64-bit Zobrist key of the position
+            depth (int): Remaining depth the score was searched to
+            flag (int): EXACT, LOWER or UPPER bound
+            score (int): Score of the position
+            move (int): Best cell index found, or -1
+        """
+        slot = (key & self._mask) << 1
+        if (self._flags[slot] and self._keys[slot] != key
+                and self._ages[slot] == self._age
+                and self._depths[slot] > depth):
+            slot += 1
+        self._keys[slot] = key
+        self._scores[slot] = score
+        self._depths[slot] = depth
+        self._flags[slot] = flag
+        self._moves[slot] = move
+        self._ages[slot] = self._age
+
+    def hit_rate(self):
+        """
+        Get the share of lookups that found an entry since ``new_search``.
+
+        Returns:
+            float: Hit rate between 0 and 1
+        """
+        return self.hits / self.probes if self.probes else 0.0
@@ -0,0 +1,210 @@
+"""
+Texel-style tuning of the evaluation weights on game outcomes.
+
+The evaluation of a position is turned into a win probability with a
+logistic curve, ``sigmoid(scale * score)``, and the weights are fitted to
+minimize the log loss against the outcomes of a dataset (see
+``dataset``). The scale is first fitted alone for the starting weights,
+so the tuned weights keep the same units as the hand-picked ones and stay
+comparable with WIN_SCORE.
+
+The score is linear in the weights (see ``batch_eval.batch_features``),
+so the fit is a regularized logistic regression, solved with Newton
+steps: every pass over the data accumulates the gradient and the Hessian
+chunk by chunk from the memory-mapped shards, and a handful of passes is
+enough. The ridge term pulls the weights towards the starting ones, which
+keeps terms that the data barely covers close to their old values.
+
+Cell weights are tied across the rotations of the board, since the
+dataset only holds one rotation of every position and the rules do not
+change under rotation.
+
+This module requires NumPy, which is an optional dependency of the
+package (``pip install orbito[numpy]``).
+"""
+import numpy as np
+
+from ..bitboard import CELL_COUNT
+from ..symmetry import SYMMETRIES
+from .batch_eval import WEIGHT_NAMES, mask_features, vector_weights, weight_vector
+
+# Positions whose features are computed at once
+CHUNK_SIZE = 1 << 18
+
+
+def _cell_classes():
+    # Orbits of the cells under the rotations, in order of their first cell
+    classes = []
+    for index in range(CELL_COUNT):
+        if not any(index in cells for cells in classes):
+            classes.append(tuple(sorted({cell_map[index] for cell_map in SYMMETRIES})))
+    return tuple(classes)
+
+
+CELL_CLASSES = _cell_classes()
+PARAMETER_NAMES = WEIGHT_NAMES[:4] + tuple(
+    'cells ' + ','.join(map(str, cells)) for cells in CELL_CLASSES)
+
+# Column j spreads parameter j over the weights in WEIGHT_NAMES order
+TIE_MATRIX = np.zeros((len(WEIGHT_NAMES), len(PARAMETER_NAMES)))
+TIE_MATRIX[np.arange(4), np.arange(4)] = 1
+for _column, _cells in enumerate(CELL_CLASSES, 4):
+    TIE_MATRIX[[4 + cell for cell in _cells], _column] = 1
+del _column, _cells
+
+
+def _sigmoid(values):
+    return 1 / (1 + np.exp(-values))
+
+
+def training_chunks(shards, chunk_size=CHUNK_SIZE):
+    """
+    Compute the features and targets of a dataset, chunk by chunk.
+
+    Args:
+        shards (list[np.ndarray]): Dataset shards, e.g. from
+            ``dataset.load_dataset``
+        chunk_size (int): Positions per chunk
+
+    Yields:
+        tuple[np.ndarray, np.ndarray]: (features, targets); features are
+            tied parameter counts as float64 of shape
+            ``(N, len(PARAMETER_NAMES))``, targets the outcome for the
+            player to move as 1 (win), 0.5 (draw) or 0 (loss)
+    """
+    for shard in shards:
+        for start in range(0, len(shard), chunk_size):
+            part = shard[start:start + chunk_size]
+            is_white = part['player'] == 1
+            own = np.where(is_white, part['white'], part['black'])
+            other = np.where(is_white, part['black'], part['white'])
+            features, own_wins, other_wins = mask_features(own, other)
+            keep = ~(own_wins | other_wins)
+            targets = (part['outcome'][keep] + 1) / 2
+            yield features[keep] @ TIE_MATRIX, targets
+
+
+def log_loss(shards, weights, scale, chunk_size=CHUNK_SIZE):
+    """
+    Measure how well the evaluation predicts the outcomes of a dataset.
+
+    Args:
+        shards (list[np.ndarray]): Dataset shards
+        weights (dict): Evaluation weights
+        scale (float): Logistic scale of the scores
+        chunk_size (int): Positions per chunk
+
+    Returns:
+        float: Mean log loss per position
+    """
+    parameters = np.linalg.lstsq(TIE_MATRIX, weight_vector(weights), rcond=None)[0]
+    total = count = 0
+    for features, targets in training_chunks(shards, chunk_size):
+        logits = scale * (features @ parameters)
+        # log(1 + e^x) - y x, written to stay finite for large |x|
+        total += (np.logaddexp(0, logits) - targets * logits).sum()
+        count += len(targets)
+    return total / count if count else 0.0
+
+
+def fit_scale(shards, weights=None, iterations=8, chunk_size=CHUNK_SIZE):
+    """
+    Fit the logistic scale of the scores of a set of weights.
+
+    Args:
+        shards (list[np.ndarray]): Dataset shards
+        weights (dict): Evaluation weights, the defaults if None
+        iterations (int): Maximum number of Newton steps
+        chunk_size (int): Positions per chunk
+
+    Returns:
+        float: Scale minimizing the log loss of ``sigmoid(scale * score)``
+    """
+    parameters = np.linalg.lstsq(TIE_MATRIX, weight_vector(weights), rcond=None)[0]
+    scale = 0.01
+    for _ in range(iterations):
+        gradient = hessian = 0.0
+        for features, targets in training_chunks(shards, chunk_size):
+            scores = features @ parameters
+            probabilities = _sigmoid(scale * scores)
+            gradient += ((probabilities - targets) * scores).sum()
+            hessian += (probabilities * (1 - probabilities) * scores ** 2).sum()
+        if not hessian:
+            break
+        step = gradient / hessian
+        scale -= step
+        if abs(step) < 1e-6 * scale:
+            break
+    return scale
+
+
+class TuningResult:
+    """
+    Outcome of a tuning run.
+
+    Attributes:
+        weights (dict): Tuned integer weights
+        scale (float): Logistic scale of the scores
+        initial_loss (float): Log loss of the starting weights
+        loss (float): Log loss of the tuned weights
+        passes (int): Newton steps taken
+    """
+
+    def __init__(self, weights, scale, initial_loss, loss, passes):
+        self.weights = weights
+        self.scale = scale
+        self.initial_loss = initial_loss
+        self.loss = loss
+        self.passes = passes
+
+
+def tune_weights(shards, weights=None, iterations=10, l2=1e-4, chunk_size=CHUNK_SIZE,
+                 progress=None):
+    """
+    Fit the evaluation weights to the outcomes of a dataset.
+
+    Args:
+        shards (list[np.ndarray]): Dataset shards, e.g. from
+            ``dataset.load_dataset``
+        weights (dict): Starting weights, the defaults if None
+        iterations (int): Maximum number of Newton steps
+        l2 (float): Strength of the pull towards the starting weights,
+            in logit units
+        chunk_size (int): Positions per chunk
+        progress (callable): Called with (step, loss) after every pass
+
+    Returns:
+        TuningResult: Tuned weights and losses
+    """
+    scale = fit_scale(shards, weights, chunk_size=chunk_size)
+    start = np.linalg.lstsq(TIE_MATRIX, weight_vector(weights), rcond=None)[0] * scale
+    parameters = start.copy()
+    size = len(PARAMETER_NAMES)
+    initial_loss = None
+    passes = 0
+    for passes in range(1, iterations + 1):
+        gradient, hessian = np.zeros(size), np.zeros((size, size))
+        total = count = 0
+        for features, targets in training_chunks(shards, chunk_size):
+            logits = features @ parameters
+            probabilities = _sigmoid(logits)
+            gradient += features.T @ (probabilities - targets)
+            hessian += (features.T * (probabilities * (1 - probabilities))) @ features
+            total += (np.logaddexp(0, logits) - targets * logits).sum()
+            count += len(targets)
+        if not count:
+            break
+        if initial_loss is None:
+            initial_loss = total / count
+        if progress:
+            progress(passes, total / count)
+        gradient = gradient / count + l2 * (parameters - start)
+        hessian = hessian / count + l2 * np.eye(size)
+        step = np.linalg.solve(hessian, gradient)
+        parameters -= step
+        if np.abs(step).max() < 1e-6:
+            break
+
+    tuned = vector_weights(TIE_MATRIX @ parameters / scale)
+    return TuningResult(tuned, scale, initial_loss or 0.0,
+                        log_loss(shards, tuned, scale, chunk_size), passes)
@@ -0,0 +1,223 @@
+# src/orbito/core/batch.py
+"""
+NumPy helpers for working on many Orbito boards at once.
+
+Boards are stored as an ``(N, 16)`` integer array using the same cell
+order as the bitboards (``row * 4 + col``) and the same cell values as
+the board matrix (0: empty, 1: white, 2: black). ``BatchOrbitGame``
+plays thousands of games in lockstep on such an array.
+
+This module requires NumPy, which is an optional dependency of the
+package (``pip install orbito[numpy]``).
+"""
+
+import numpy as np
+
+from .bitboard import CELL_COUNT, FULL_MASK, ORBIT_SOURCE, WIN_TABLE
+
+# Gathering with the source table moves every ball to its orbit target.
+ORBIT_INDEX = np.array(ORBIT_SOURCE, dtype=np.intp)
+
+_BIT_WEIGHTS = np.left_shift(1, np.arange(CELL_COUNT, dtype=np.uint32))
+
+
+def orbit_boards(boards):
+    """
+    Apply the orbit move to a batch of boards.
+
+    Args:
+        boards (np.ndarray): Array of shape ``(N, 16)``
+
+    Returns:
+        np.ndarray: New array of shape ``(N, 16)`` with every board rotated
+    """
+    return boards[:, ORBIT_INDEX]
+
+
+def boards_from_masks(white, black, dtype=np.int8):
+    """
+    Build a batch of boards from occupancy masks.
+
+    Args:
+        white (array-like): White occupancy masks, shape ``(N,)``
+        black (array-like): Black occupancy masks, shape ``(N,)``
+        dtype: Element type of the returned array
+
+    Returns:
+        np.ndarray: Boards of shape ``(N, 16)``
+    """
+    white = np.asarray(white, dtype=np.uint32)[:, None]
+    black = np.asarray(black, dtype=np.uint32)[:, None]
+    boards = ((white & _BIT_WEIGHTS) != 0).astype(dtype)
+    boards += 2 * ((black & _BIT_WEIGHTS) != 0).astype(dtype)
+    return boards
+
+
+def masks_from_boards(boards):
+    """
+    Convert a batch of boards to occupancy masks.
+
+    Args:
+        boards (np.ndarray): Array of shape ``(N, 16)``
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (white_masks, black_masks) as uint32
+    """
+    white = ((boards == 1) * _BIT_WEIGHTS).sum(axis=1, dtype=np.uint32)
+    black = ((boards == 2) * _BIT_WEIGHTS).sum(axis=1, dtype=np.uint32)
+    return white, black
+
+
+# Result codes of BatchOrbitGame.results (1 and 2 are the winning player)
+ONGOING = 0
+DRAW = 3
+
+_WIN_TABLE = np.frombuffer(bytes(WIN_TABLE), dtype=np.uint8).astype(bool)
+
+
+class BatchOrbitGame:
+    """
+    Many Orbito games played in lockstep.
+
+    Every ``step`` plays one turn in all live games at once: place the
+    ball of the player to move, orbit, check both players for a win and
+    the board for a draw, and switch player. Finished games are masked
+    out and keep their final board.
+
+    Attributes:
+        boards (np.ndarray): int8 boards of shape ``(N, 16)``
+        current_player (np.ndarray): int8 player to move, shape ``(N,)``
+        results (np.ndarray): int8 ONGOING, 1 or 2 for the winner, or DRAW
+        plies (np.ndarray): Turns played in each game
+    """
+
+    def __init__(self, count, boards=None, current_player=None):
+        """
+        Start a batch of games.
+
+        Args:
+            count (int): Number of games
+            boards (np.ndarray): Starting boards, empty boards if None;
+                they must not be finished
+            current_player (array-like): Player to move in each game,
+                White if None
+        """
+        if boards is None:
+            self.boards = np.zeros((count, CELL_COUNT), dtype=np.int8)
+        else:
+            self.boards = np.array(boards, dtype=np.int8).reshape(count, CELL_COUNT)
+        if current_player is None:
+            self.current_player = np.ones(count, dtype=np.int8)
+        else:
+            self.current_player = np.array(current_player, dtype=np.int8).reshape(count)
+        self.results = np.zeros(count, dtype=np.int8)
+        self.plies = np.zeros(count, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.boards)
+
+    def live(self):
+        """
+        Get the games still in progress.
+
+        Returns:
+            np.ndarray: Boolean mask of shape ``(N,)``
+        """
+        return self.results == ONGOING
+
+    def is_over(self):
+        """
+        Check whether every game is finished.
+
+        Returns:
+            bool: True if no game is in progress
+        """
+        return not self.live().any()
+
+    def legal_moves(self):
+        """
+        Get the legal moves of every game.
+
+        Returns:
+            np.ndarray: Boolean mask of shape ``(N, 16)``; all False for
+                finished games
+        """
+        return (self.boards == 0) & self.live()[:, None]
+
+    def select_moves(self, scores):
+        """
+        Pick the legal move with the highest score in every live game.
+
+        Args:
+            scores (np.ndarray): Move scores of shape ``(N, 16)``, e.g. the
+                output of a policy
+
+        Returns:
+            np.ndarray: Cell index per game, -1 for finished games
+        """
+        scores = np.where(self.legal_moves(), scores, -np.inf)
+        moves = scores.argmax(axis=1)
+        moves[~self.live()] = -1
+        return moves
+
+    def random_moves(self, rng):
+        """
+        Pick a uniformly random legal move in every live game.
+
+        Args:
+            rng (np.random.Generator): Random generator
+
+        Returns:
+            np.ndarray: Cell index per game, -1 for finished games
+        """
+        return self.select_moves(rng.random(self.boards.shape))
+
+    def step(self, moves):
+        """
+        Play one turn in every live game.
+
+        Args:
+            moves (array-like): Cell index per game; entries of finished
+                games are ignored
+
+        Raises:
+            ValueError: If a move of a live game targets an occupied cell
+        """
+        games = np.flatnonzero(self.live())
+        if not len(games):
+            return
+        cells = np.asarray(moves)[games]
+        if (self.boards[games, cells] != 0).any():
+            raise ValueError("move on an occupied cell")
+        boards = self.boards[games]
+        boards[np.arange(len(games)), cells] = self.current_player[games]
+        boards = boards[:, ORBIT_INDEX]
+        self.boards[games] = boards
+
+        white, black = masks_from_boards(boards)
+        white_wins = _WIN_TABLE[white]
+        black_wins = _WIN_TABLE[black]
+        full = (white | black) == FULL_MASK
+        results = np.where(white_wins & black_wins, DRAW,
+                           np.where(white_wins, 1,
+                                    np.where(black_wins, 2,
+                                             np.where(full, DRAW, ONGOING))))
+        self.results[games] = results
+        self.plies[games] += 1
+        # As in OrbitGame, the player to move only stays after a win
+        switch = games[~(white_wins | black_wins)]
+        self.current_player[switch] = 3 - self.current_player[switch]
+
+    def play_random(self, rng):
+        """
+        Finish every game with uniformly random moves.
+
+        Args:
+            rng (np.random.Generator): Random generator
+
+        Returns:
+            np.ndarray: Final results
+        """
+        while not self.is_over():
+            self.step(self.random_moves(rng))
+        return self.results
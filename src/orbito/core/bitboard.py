@@ -0,0 +1,212 @@
+# src/orbito/core/bitboard.py
+"""
+Bitboard primitives for the Orbito board.
+
+The 4x4 board is stored as two 16-bit occupancy masks, one per player.
+Cell (row, col) maps to bit ``row * 4 + col``, so bit 0 is the top-left
+cell and bit 15 the bottom-right one.
+
+Every rule of the game reduces to a handful of integer operations on
+these masks:
+    - Placing a ball sets one bit
+    - The orbit move is a fixed permutation of the 16 bits
+    - A win is a mask containing one of the 10 winning lines
+
+Constants:
+    FULL_MASK: Mask with all 16 cells set
+    CELL_BITS: Bit for every cell index
+    ORBIT_TARGET: Destination cell of every cell under the orbit move
+    ORBIT_SOURCE: Source cell of every cell under the orbit move
+    WIN_MASKS: The 10 winning lines (4 rows, 4 columns, 2 diagonals)
+    WIN_TABLE: Byte per 16-bit mask, 1 when the mask contains a winning line
+"""
+
+BOARD_SIZE = 4
+CELL_COUNT = BOARD_SIZE * BOARD_SIZE
+FULL_MASK = (1 << CELL_COUNT) - 1
+
+CELL_BITS = tuple(1 << index for index in range(CELL_COUNT))
+
+
+def cell_index(row, col):
+    """
+    Convert board coordinates to a cell index.
+
+    Args:
+        row (int): Row index (0-3) from top
+        col (int): Column index (0-3) from left
+
+    Returns:
+        int: Cell index (0-15)
+    """
+    return row * BOARD_SIZE + col
+
+
+def cell_coords(index):
+    """
+    Convert a cell index to board coordinates.
+
+    Args:
+        index (int): Cell index (0-15)
+
+    Returns:
+        tuple[int, int]: (row, col) of the cell
+    """
+    return divmod(index, BOARD_SIZE)
+
+
+def _line_mask(cells):
+    mask = 0
+    for row, col in cells:
+        mask |= CELL_BITS[cell_index(row, col)]
+    return mask
+
+
+WIN_MASKS = tuple(
+    [_line_mask([(i, j) for j in range(4)]) for i in range(4)]      # Horizontal lines
+    + [_line_mask([(j, i) for j in range(4)]) for i in range(4)]    # Vertical lines
+    + [
+        _line_mask([(i, i) for i in range(4)]),                     # Main diagonal
+        _line_mask([(i, 3 - i) for i in range(4)]),                 # Other diagonal
+    ]
+)
+
+# Orbit move as a cell mapping: outer ring clockwise, inner square
+# counterclockwise. Compiled below into index and mask lookup tables.
+ORBIT_MOVES = {
+    # Outer ring clockwise rotation
+    (0,0): (1,0), (1,0): (2,0), (2,0): (3,0),  # Left side down
+    (3,0): (3,1), (3,1): (3,2), (3,2): (3,3),  # Bottom right
+    (3,3): (2,3), (2,3): (1,3), (1,3): (0,3),  # Right side up
+    (0,3): (0,2), (0,2): (0,1), (0,1): (0,0),  # Top left
+    # Inner square counterclockwise rotation
+    (1,1): (2,1), (2,1): (2,2), (2,2): (1,2), (1,2): (1,1)
+}
+
+# ORBIT_TARGET[i] is where the ball on cell i lands after the orbit,
+# ORBIT_SOURCE[i] is the cell whose ball lands on cell i.
+ORBIT_TARGET = tuple(
+    cell_index(*ORBIT_MOVES[cell_coords(index)]) for index in range(CELL_COUNT)
+)
+ORBIT_SOURCE = tuple(
+    ORBIT_TARGET.index(index) for index in range(CELL_COUNT)
+)
+
+
+def _permute_byte_table(target, shift):
+    table = []
+    for byte in range(256):
+        mask = 0
+        for bit in range(8):
+            if byte >> bit & 1:
+                mask |= CELL_BITS[target[bit + shift]]
+        table.append(mask)
+    return table
+
+
+# Byte-wise lookup tables: the rotated mask is the union of the images of
+# its low and high bytes.
+_ORBIT_LOW = _permute_byte_table(ORBIT_TARGET, 0)
+_ORBIT_HIGH = _permute_byte_table(ORBIT_TARGET, 8)
+_UNORBIT_LOW = _permute_byte_table(ORBIT_SOURCE, 0)
+_UNORBIT_HIGH = _permute_byte_table(ORBIT_SOURCE, 8)
+
+
+def orbit_mask(mask):
+    """
+    Apply the orbit move to an occupancy mask.
+
+    Outer ring rotates clockwise, inner square rotates counterclockwise.
+
+    Args:
+        mask (int): 16-bit occupancy mask
+
+    Returns:
+        int: Mask after rotation
+    """
+    return _ORBIT_LOW[mask & 0xFF] | _ORBIT_HIGH[mask >> 8]
+
+
+def unorbit_mask(mask):
+    """
+    Undo the orbit move on an occupancy mask.
+
+    Args:
+        mask (int): 16-bit occupancy mask
+
+    Returns:
+        int: Mask before rotation
+    """
+    return _UNORBIT_LOW[mask & 0xFF] | _UNORBIT_HIGH[mask >> 8]
+
+
+def _win_table():
+    table = bytearray(FULL_MASK + 1)
+    for line in WIN_MASKS:
+        # Mark every superset of the line
+        rest = FULL_MASK ^ line
+        subset = rest
+        while True:
+            table[line | subset] = 1
+            if not subset:
+                break
+            subset = (subset - 1) & rest
+    return table
+
+
+# WIN_TABLE[mask] is 1 when the mask contains a winning line
+WIN_TABLE = _win_table()
+
+
+def has_win(mask):
+    """
+    Check whether an occupancy mask contains a winning line.
+
+    Args:
+        mask (int): 16-bit occupancy mask of one player
+
+    Returns:
+        bool: True if the mask covers a full row, column or diagonal
+    """
+    return WIN_TABLE[mask] == 1
+
+
+def board_to_masks(board):
+    """
+    Convert a 4x4 board matrix to occupancy masks.
+
+    Args:
+        board (list[list[int]]): Board using 0 (empty), 1 (white), 2 (black)
+
+    Returns:
+        tuple[int, int]: (white_mask, black_mask)
+    """
+    white = black = 0
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            cell = board[row][col]
+            if cell == 1:
+                white |= CELL_BITS[cell_index(row, col)]
+            elif cell == 2:
+                black |= CELL_BITS[cell_index(row, col)]
+    return white, black
+
+
+def masks_to_board(white, black):
+    """
+    Convert occupancy masks to a 4x4 board matrix.
+
+    Args:
+        white (int): White occupancy mask
+        black (int): Black occupancy mask
+
+    Returns:
+        list[list[int]]: Board using 0 (empty), 1 (white), 2 (black)
+    """
+    return [
+        [1 if white >> (row * BOARD_SIZE + col) & 1
+         else 2 if black >> (row * BOARD_SIZE + col) & 1
+         else 0
+         for col in range(BOARD_SIZE)]
+        for row in range(BOARD_SIZE)
+    ]
@@ -12,10 +12,19 @@ The game is played on a 4x4 board where:
     - The goal is to align 4 balls horizontally, vertically, or diagonally
     - First player to achieve alignment wins
 
+The board state is kept as two 16-bit occupancy masks (see ``bitboard``),
+so every rule check is a handful of integer operations.
+
 Classes:
     OrbitGame: Main class handling game logic and state management
 """
 
+from .bitboard import (
+    CELL_BITS, FULL_MASK, board_to_masks, has_win, masks_to_board, orbit_mask,
+    unorbit_mask
+)
+from .zobrist import CELL_KEYS, SIDE_KEYS, board_key
+
 class OrbitGame:
     """
     Main class implementing Orbito game logic.
@@ -28,12 +37,16 @@ class OrbitGame:
     - Board rotation mechanics
     
     Attributes:
-        board (list[list[int]]): 4x4 matrix representing game state where:
+        white (int): 16-bit occupancy mask of White's balls
+        black (int): 16-bit occupancy mask of Black's balls
+        board (list[list[int]]): 4x4 matrix view of the masks where:
             - 0: Empty cell
             - 1: White player's ball
             - 2: Black player's ball
         current_player (int): Identifier for current player (1: White, 2: Black)
         move_made (bool): Tracks if a move has been made in current turn
+        history (list[int]): Cells placed by ``push``, used by ``pop``
+        zobrist (int): Zobrist key of the board, kept in sync with the masks
     
     Example:
         >>> game = OrbitGame()
@@ -50,9 +63,12 @@ class OrbitGame:
         Creates an empty 4x4 board, sets White as first player, and initializes
         game state tracking variables.
         """
-        self.board = self.init_game()
+        self.white = 0
+        self.black = 0
         self.current_player = 1  # 1 for White, 2 for Black
         self.move_made = False
+        self.history = []
+        self.zobrist = 0
         
     @staticmethod
     def init_game():
@@ -69,6 +85,21 @@ class OrbitGame:
             - 2: Black player's ball
         """
         return [[0 for _ in range(4)] for _ in range(4)]
+
+    @property
+    def board(self):
+        """
+        list[list[int]]: 4x4 matrix view built from the occupancy masks.
+
+        Assigning a matrix replaces the masks, so existing code can keep
+        setting up positions with ``game.board = [[...], ...]``.
+        """
+        return masks_to_board(self.white, self.black)
+
+    @board.setter
+    def board(self, board):
+        self.white, self.black = board_to_masks(board)
+        self.zobrist = board_key(self.white, self.black)
     
     def make_move(self, row, col):
         """
@@ -88,7 +119,12 @@ class OrbitGame:
             - Coordinates are within board bounds
         """
         if not self.move_made and self.is_valid_move(row, col):
-            self.board[row][col] = self.current_player
+            index = row * 4 + col
+            if self.current_player == 1:
+                self.white |= CELL_BITS[index]
+            else:
+                self.black |= CELL_BITS[index]
+            self.zobrist ^= CELL_KEYS[self.current_player][index]
             self.move_made = True
             return True
         return False
@@ -109,7 +145,8 @@ class OrbitGame:
             - Position is within board bounds (0-3 for both coordinates)
             - Target cell is empty (contains 0)
         """
-        return 0 <= row < 4 and 0 <= col < 4 and self.board[row][col] == 0
+        return (0 <= row < 4 and 0 <= col < 4
+                and not (self.white | self.black) & CELL_BITS[row * 4 + col])
     
     def orbit_move(self):
         """
@@ -130,25 +167,7 @@ class OrbitGame:
         if not self.move_made:
             return False, False
             
-        # Create new board for rotated state
-        new_board = [[0 for _ in range(4)] for _ in range(4)]
-        
-        # Define rotation movements for all affected positions
-        moves = {
-            # Outer ring clockwise rotation
-            (0,0): (1,0), (1,0): (2,0), (2,0): (3,0),  # Left side down
-            (3,0): (3,1), (3,1): (3,2), (3,2): (3,3),  # Bottom right
-            (3,3): (2,3), (2,3): (1,3), (1,3): (0,3),  # Right side up
-            (0,3): (0,2), (0,2): (0,1), (0,1): (0,0),  # Top left
-            # Inner square counterclockwise rotation
-            (1,1): (2,1), (2,1): (2,2), (2,2): (1,2), (1,2): (1,1)
-        }
-        
-        # Apply rotation movements to create new board state
-        for (old_row, old_col), (new_row, new_col) in moves.items():
-            new_board[new_row][new_col] = self.board[old_row][old_col]
-        
-        self.board = new_board
+        self._orbit()
         
         # Check win conditions
         white_wins = self.check_win_for_player(1)
@@ -160,6 +179,71 @@ class OrbitGame:
             self.move_made = False
             
         return white_wins, black_wins
+
+    def _orbit(self):
+        """Rotate both occupancy masks and refresh the Zobrist key."""
+        self.white = orbit_mask(self.white)
+        self.black = orbit_mask(self.black)
+        self.zobrist = board_key(self.white, self.black)
+
+    def push(self, row, col):
+        """
+        Play a full turn: place a ball and orbit the board.
+
+        This is the reversible counterpart of ``make_move`` followed by
+        ``orbit_move``: the placed cell is recorded so that ``pop`` can
+        restore the exact prior state, including ``current_player`` and
+        ``move_made``. No board copy is made.
+
+        Args:
+            row (int): Row index (0-3) from top
+            col (int): Column index (0-3) from left
+
+        Returns:
+            bool: True if the turn was played, False if the move was invalid
+
+        Note:
+            As with ``orbit_move``, the player only switches when nobody
+            has won; after a winning turn ``move_made`` stays True.
+        """
+        if self.move_made or not self.is_valid_move(row, col):
+            return False
+        index = row * 4 + col
+        if self.current_player == 1:
+            self.white |= CELL_BITS[index]
+        else:
+            self.black |= CELL_BITS[index]
+        self.history.append(index)
+        self._orbit()
+        if has_win(self.white) or has_win(self.black):
+            self.move_made = True
+        else:
+            self.current_player = 3 - self.current_player
+        return True
+
+    def pop(self):
+        """
+        Undo the last turn played with ``push``.
+
+        Returns:
+            tuple[int, int]: (row, col) of the ball that was removed
+
+        Raises:
+            IndexError: If there is no pushed turn to undo
+        """
+        index = self.history.pop()
+        self.white = unorbit_mask(self.white)
+        self.black = unorbit_mask(self.black)
+        if self.move_made:
+            self.move_made = False
+        else:
+            self.current_player = 3 - self.current_player
+        if self.current_player == 1:
+            self.white &= ~CELL_BITS[index]
+        else:
+            self.black &= ~CELL_BITS[index]
+        self.zobrist = board_key(self.white, self.black)
+        return divmod(index, 4)
     
     def check_win_for_player(self, player):
         """
@@ -177,20 +261,7 @@ class OrbitGame:
             - 4 vertical lines
             - 2 diagonals
         """
-        # Define all possible winning combinations
-        winning_conditions = [
-            [(i,j) for j in range(4)] for i in range(4)  # Horizontal lines
-        ] + [
-            [(j,i) for j in range(4)] for i in range(4)  # Vertical lines
-        ] + [
-            [(i,i) for i in range(4)],                   # Main diagonal
-            [(i,3-i) for i in range(4)]                  # Other diagonal
-        ]
-        
-        # Check if any winning condition is met
-        return any(all(self.board[row][col] == player 
-                      for row, col in condition)
-                  for condition in winning_conditions)
+        return has_win(self.white if player == 1 else self.black)
     
     def get_board(self):
         """
@@ -198,6 +269,10 @@ class OrbitGame:
         
         Returns:
             list[list[int]]: Current game board matrix
+        
+        Note:
+            The matrix is a fresh view of the occupancy masks; editing it
+            does not change the game state.
         """
         return self.board
 
@@ -209,7 +284,53 @@ class OrbitGame:
             int: Current player (1: White, 2: Black)
         """
         return self.current_player
-    
+
+    def get_state(self):
+        """
+        Get the compact game state.
+
+        Returns:
+            tuple[int, int, int]: (white_mask, black_mask, current_player)
+        """
+        return self.white, self.black, self.current_player
+
+    def hash_key(self):
+        """
+        Get the Zobrist key of the position, including the side to move.
+
+        Returns:
+            int: 64-bit position key
+        """
+        return self.zobrist ^ SIDE_KEYS[self.current_player]
+
+    def copy(self):
+        """
+        Create an independent game with the same position.
+
+        Returns:
+            OrbitGame: New game at the same state, with an empty push history
+        """
+        game = OrbitGame()
+        game.set_state(self.white, self.black, self.current_player)
+        game.move_made = self.move_made
+        return game
+
+    def set_state(self, white, black, current_player):
+        """
+        Load a compact game state at the start of a turn.
+
+        Args:
+            white (int): White occupancy mask
+            black (int): Black occupancy mask
+            current_player (int): Player to move (1: White, 2: Black)
+        """
+        self.white = white
+        self.black = black
+        self.current_player = current_player
+        self.move_made = False
+        self.history = []
+        self.zobrist = board_key(white, black)
+
     def is_board_full(self):
         """
         Check if the board is full (no empty cells).
@@ -217,7 +338,7 @@ class OrbitGame:
         Returns:
             bool: True if all cells are occupied, False otherwise
         """
-        return all(all(cell != 0 for cell in row) for row in self.board)
+        return (self.white | self.black) == FULL_MASK
         
     def reset_game(self):
         """
@@ -228,6 +349,9 @@ class OrbitGame:
         - Setting White as first player
         - Resetting move tracking
         """
-        self.board = self.init_game()
+        self.white = 0
+        self.black = 0
         self.current_player = 1
-        self.move_made = False
\ No newline at end of file
+        self.move_made = False
+        self.history = []
+        self.zobrist = 0
\ No newline at end of file
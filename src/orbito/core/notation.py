@@ -0,0 +1,109 @@
+# src/orbito/core/notation.py
+"""
+Text notation for cells, moves and positions.
+
+Cells are named like chess squares: a file letter for the column (``a``
+to ``d`` from left to right) and a rank digit for the row (``1`` at the
+bottom to ``4`` at the top), so ``a4`` is the top-left cell (0, 0).
+
+Positions are written as the four rows from top to bottom separated by
+``/``, one character per cell (``W`` white, ``B`` black, ``.`` empty),
+then a space and the player to move (``w`` or ``b``)::
+
+    ..../.B../..W./.... w
+
+Functions:
+    cell_to_text, text_to_cell: Convert (row, col) pairs
+    position_to_text, position_from_text: Convert whole positions
+"""
+
+from .bitboard import BOARD_SIZE, CELL_BITS, cell_index
+from .game import OrbitGame
+
+FILES = 'abcd'
+START_POSITION = '..../..../..../.... w'
+
+_PIECES = {'.': 0, 'W': 1, 'B': 2}
+_SIDES = {'w': 1, 'b': 2}
+
+
+def cell_to_text(row, col):
+    """
+    Name a cell.
+
+    Args:
+        row (int): Row index (0-3) from top
+        col (int): Column index (0-3) from left
+
+    Returns:
+        str: Cell name, e.g. ``'a4'`` for (0, 0)
+    """
+    return f"{FILES[col]}{BOARD_SIZE - row}"
+
+
+def text_to_cell(text):
+    """
+    Parse a cell name.
+
+    Args:
+        text (str): Cell name such as ``'c2'``
+
+    Returns:
+        tuple[int, int]: (row, col)
+
+    Raises:
+        ValueError: If the text is not a cell name
+    """
+    text = text.strip().lower()
+    if len(text) != 2 or text[0] not in FILES or text[1] not in '1234':
+        raise ValueError(f"invalid cell: {text!r}")
+    return BOARD_SIZE - int(text[1]), FILES.index(text[0])
+
+
+def position_to_text(game):
+    """
+    Write a game position in text notation.
+
+    Args:
+        game (OrbitGame): Game at the start of a turn
+
+    Returns:
+        str: Position text
+    """
+    symbols = {0: '.', 1: 'W', 2: 'B'}
+    board = game.get_board()
+    rows = '/'.join(''.join(symbols[cell] for cell in row) for row in board)
+    return f"{rows} {'w' if game.current_player == 1 else 'b'}"
+
+
+def position_from_text(text):
+    """
+    Build a game from a position in text notation.
+
+    Args:
+        text (str): Position text
+
+    Returns:
+        OrbitGame: Game at the start of a turn in that position
+
+    Raises:
+        ValueError: If the text is not a valid position
+    """
+    parts = text.split()
+    if len(parts) != 2 or parts[1] not in _SIDES:
+        raise ValueError(f"invalid position: {text!r}")
+    rows = parts[0].split('/')
+    if len(rows) != BOARD_SIZE or any(len(row) != BOARD_SIZE for row in rows):
+        raise ValueError(f"invalid position: {text!r}")
+    white = black = 0
+    for row, symbols in enumerate(rows):
+        for col, symbol in enumerate(symbols):
+            if symbol not in _PIECES:
+                raise ValueError(f"invalid position: {text!r}")
+            if _PIECES[symbol] == 1:
+                white |= CELL_BITS[cell_index(row, col)]
+            elif _PIECES[symbol] == 2:
+                black |= CELL_BITS[cell_index(row, col)]
+    game = OrbitGame()
+    game.set_state(white, black, _SIDES[parts[1]])
+    return game
@@ -0,0 +1,164 @@
+# src/orbito/core/symmetry.py
+"""
+Board symmetries that preserve the rules of Orbito.
+
+A symmetry of the square maps positions to equivalent positions only if
+it maps winning lines to winning lines and commutes with the orbit move:
+rotating the board then orbiting must give the same result as orbiting
+then rotating. Reflections reverse the direction of both rings, so they
+fail the second test; the four rotations pass both. ``find_symmetries``
+derives this from the rule tables instead of hard-coding it.
+
+Positions that differ by a symmetry have the same game-theoretic value,
+so caches and databases can store only one representative per class:
+``canonical`` returns the representative with the smallest key
+``white | black << 16`` and the symmetry that produces it.
+
+Constants:
+    D4_TRANSFORMS: The 8 symmetries of the square as (name, cell map)
+    SYMMETRIES: Cell maps of the symmetries that preserve the rules,
+        identity first
+    INVERSES: Index in SYMMETRIES of the inverse of each symmetry
+"""
+
+from .bitboard import CELL_BITS, CELL_COUNT, ORBIT_TARGET, WIN_MASKS, cell_index
+
+
+def _cell_map(transform):
+    return tuple(cell_index(*transform(row, col))
+                 for row in range(4) for col in range(4))
+
+
+# Each cell map sends the cell index i to cell_map[i]
+D4_TRANSFORMS = (
+    ('identity', _cell_map(lambda r, c: (r, c))),
+    ('rotate_90', _cell_map(lambda r, c: (c, 3 - r))),
+    ('rotate_180', _cell_map(lambda r, c: (3 - r, 3 - c))),
+    ('rotate_270', _cell_map(lambda r, c: (3 - c, r))),
+    ('flip_horizontal', _cell_map(lambda r, c: (r, 3 - c))),
+    ('flip_vertical', _cell_map(lambda r, c: (3 - r, c))),
+    ('transpose', _cell_map(lambda r, c: (c, r))),
+    ('anti_transpose', _cell_map(lambda r, c: (3 - c, 3 - r))),
+)
+
+
+def map_mask(mask, cell_map):
+    """
+    Apply a cell map to an occupancy mask.
+
+    Args:
+        mask (int): 16-bit occupancy mask
+        cell_map (tuple[int]): Destination of every cell index
+
+    Returns:
+        int: Transformed mask
+    """
+    result = 0
+    for index in range(CELL_COUNT):
+        if mask >> index & 1:
+            result |= CELL_BITS[cell_map[index]]
+    return result
+
+
+def preserves_rules(cell_map):
+    """
+    Check whether a cell map is a symmetry of the game.
+
+    Args:
+        cell_map (tuple[int]): Destination of every cell index
+
+    Returns:
+        bool: True if the map keeps the set of winning lines and commutes
+            with the orbit move
+    """
+    commutes = all(cell_map[ORBIT_TARGET[index]] == ORBIT_TARGET[cell_map[index]]
+                   for index in range(CELL_COUNT))
+    lines = {map_mask(line, cell_map) for line in WIN_MASKS}
+    return commutes and lines == set(WIN_MASKS)
+
+
+def find_symmetries():
+    """
+    List the symmetries of the square that preserve the rules.
+
+    Returns:
+        list[tuple[str, tuple[int]]]: (name, cell map) pairs, identity first
+    """
+    return [(name, cell_map) for name, cell_map in D4_TRANSFORMS
+            if preserves_rules(cell_map)]
+
+
+SYMMETRY_NAMES = tuple(name for name, _ in find_symmetries())
+SYMMETRIES = tuple(cell_map for _, cell_map in find_symmetries())
+INVERSES = tuple(
+    next(j for j, other in enumerate(SYMMETRIES)
+         if all(other[cell_map[index]] == index for index in range(CELL_COUNT)))
+    for cell_map in SYMMETRIES
+)
+
+
+def _byte_tables(cell_map):
+    low, high = [], []
+    for byte in range(256):
+        low.append(map_mask(byte, cell_map))
+        high.append(map_mask(byte << 8, cell_map))
+    return low, high
+
+
+_TABLES = tuple(_byte_tables(cell_map) for cell_map in SYMMETRIES)
+
+
+def transform_mask(mask, symmetry):
+    """
+    Apply a symmetry to an occupancy mask with two table lookups.
+
+    Args:
+        mask (int): 16-bit occupancy mask
+        symmetry (int): Index in SYMMETRIES
+
+    Returns:
+        int: Transformed mask
+    """
+    low, high = _TABLES[symmetry]
+    return low[mask & 0xFF] | high[mask >> 8]
+
+
+def canonical(white, black):
+    """
+    Find the canonical representative of a position.
+
+    Args:
+        white (int): White occupancy mask
+        black (int): Black occupancy mask
+
+    Returns:
+        tuple[int, int, int]: (white, black, symmetry) where the masks are
+            those of the representative and ``symmetry`` is the index in
+            SYMMETRIES that maps the position onto it
+    """
+    best_key = white | black << 16
+    best = (white, black, 0)
+    for symmetry in range(1, len(_TABLES)):
+        low, high = _TABLES[symmetry]
+        new_white = low[white & 0xFF] | high[white >> 8]
+        new_black = low[black & 0xFF] | high[black >> 8]
+        key = new_white | new_black << 16
+        if key < best_key:
+            best_key = key
+            best = (new_white, new_black, symmetry)
+    return best
+
+
+def canonical_key(white, black):
+    """
+    Get the key ``white | black << 16`` of the canonical representative.
+
+    Args:
+        white (int): White occupancy mask
+        black (int): Black occupancy mask
+
+    Returns:
+        int: Canonical position key
+    """
+    white, black, _ = canonical(white, black)
+    return white | black << 16
@@ -0,0 +1,62 @@
+# src/orbito/core/zobrist.py
+"""
+Zobrist keys for Orbito positions.
+
+Each (player, cell) pair gets a fixed random 64-bit key and the key of a
+board is the XOR of the keys of its balls. Placing a ball therefore
+updates the key with a single XOR.
+
+The orbit move relocates every ball at once, so instead of 16 XORs the
+key of a rotated board is rebuilt from its occupancy masks with four
+byte-table lookups; the tables hold the XOR of the cell keys for every
+possible byte of a mask.
+
+Constants:
+    CELL_KEYS: ``CELL_KEYS[player][cell]`` key of a ball (index 0 unused)
+    SIDE_KEYS: ``SIDE_KEYS[player]`` key mixed in for the player to move
+"""
+
+import random
+
+from .bitboard import CELL_COUNT
+
+_rng = random.Random(0x0B17)
+
+CELL_KEYS = (
+    (0,) * CELL_COUNT,
+    tuple(_rng.getrandbits(64) for _ in range(CELL_COUNT)),
+    tuple(_rng.getrandbits(64) for _ in range(CELL_COUNT)),
+)
+SIDE_KEYS = (0, _rng.getrandbits(64), _rng.getrandbits(64))
+
+
+def _byte_table(keys, shift):
+    table = []
+    for byte in range(256):
+        key = 0
+        for bit in range(8):
+            if byte >> bit & 1:
+                key ^= keys[bit + shift]
+        table.append(key)
+    return table
+
+
+_WHITE_LOW = _byte_table(CELL_KEYS[1], 0)
+_WHITE_HIGH = _byte_table(CELL_KEYS[1], 8)
+_BLACK_LOW = _byte_table(CELL_KEYS[2], 0)
+_BLACK_HIGH = _byte_table(CELL_KEYS[2], 8)
+
+
+def board_key(white, black):
+    """
+    Compute the Zobrist key of a board from its occupancy masks.
+
+    Args:
+        white (int): White occupancy mask
+        black (int): Black occupancy mask
+
+    Returns:
+        int: 64-bit key of the board, without the side to move
+    """
+    return (_WHITE_LOW[white & 0xFF] ^ _WHITE_HIGH[white >> 8]
+            ^ _BLACK_LOW[black & 0xFF] ^ _BLACK_HIGH[black >> 8])
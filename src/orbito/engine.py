@@ -0,0 +1,288 @@
+"""
+Headless Orbito engine speaking a line-based protocol on stdin/stdout.
+
+The protocol is modelled on UCI. Cells and positions use the notation of
+``orbito.core.notation``. Commands:
+
+    orbito                      Identify; answered by ``id`` lines and ``orbitook``
+    isready                     Answered by ``readyok``
+    setoption name N value V    Engine (minimax, mcts), Difficulty, Hash (MB),
+                                Workers, Weights (parameter file, or <empty>)
+    newgame                     Forget what the engine kept from the last game
+    position startpos [moves c2 a4 ...]
+    position text <rows> <side> [moves ...]
+    go [depth N] [movetime MS] [playouts N] [infinite]
+                                Search in the background; ``info`` lines are
+                                streamed, then ``bestmove <cell>`` (or
+                                ``bestmove none``) is sent
+    stop                        End the search now; its ``bestmove`` follows
+    d                           Print the current position
+    quit                        Exit
+
+The engine never imports tkinter, so it runs on servers without a display.
+"""
+import sys
+import threading
+
+from . import __author__, __version__
+from .core.ai.evaluator import load_weights
+from .core.ai.mcts import MCTSAI
+from .core.ai.minmax import MATE_BOUND, MATE_SCORE, MinimaxAI
+from .core.notation import (
+    START_POSITION, cell_to_text, position_from_text, position_to_text, text_to_cell
+)
+
+ENGINES = {'minimax': MinimaxAI, 'mcts': MCTSAI}
+
+# Time given to "go infinite" searches of engines that need a budget
+INFINITE_MS = 24 * 3600 * 1000
+
+
+def format_score(score):
+    """
+    Write a minimax score for ``info`` lines.
+
+    Args:
+        score (int): Score for the engine
+
+    Returns:
+        str: ``cp <score>`` for evaluations, ``win <plies>`` or
+            ``loss <plies>`` for forced results
+    """
+    if score > MATE_BOUND:
+        return f"win {MATE_SCORE - score}"
+    if score < -MATE_BOUND:
+        return f"loss {MATE_SCORE + score}"
+    return f"cp {score}"
+
+
+class EngineProtocol:
+    """
+    State of a protocol session: options, position and running search.
+
+    Attributes:
+        options (dict): Current option values by lower-case name
+        game (OrbitGame): Position set by the last ``position`` command
+        moves (list[str]): Moves of that command, as cell names
+        ai (BaseAI): Engine searching the position, created on demand
+    """
+
+    def __init__(self, output=None):
+        """
+        Start a session.
+
+        Args:
+            output (TextIO): Stream receiving the responses, stdout if None
+        """
+        self.output = output if output is not None else sys.stdout
+        self.options = {'engine': 'minimax', 'difficulty': 'hard', 'hash': 16, 'workers': 1,
+                        'weights': None}
+        self.game = position_from_text(START_POSITION)
+        self.moves = []
+        self.ai = None
+        self._start = START_POSITION
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def send(self, line):
+        """Write one response line, safely from any thread."""
+        with self._lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def handle(self, line):
+        """
+        Execute one command.
+
+        Args:
+            line (str): Command line
+
+        Returns:
+            bool: False when the session must end
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        try:
+            if command == 'quit':
+                self.stop()
+                return False
+            if command == 'orbito':
+                self.send(f"id name Orbito {__version__}")
+                self.send(f"id author {__author__}")
+                self.send("option name Engine type combo default minimax var minimax var mcts")
+                self.send("option name Difficulty type combo default hard "
+                          "var easy var medium var hard")
+                self.send("option name Hash type spin default 16")
+                self.send("option name Workers type spin default 1")
+                self.send("option name Weights type string default <empty>")
+                self.send("orbitook")
+            elif command == 'isready':
+                self.send("readyok")
+            elif command == 'setoption':
+                self.set_option(args)
+            elif command == 'newgame':
+                self.stop()
+                if self.ai is not None:
+                    self.ai.new_game()
+            elif command == 'position':
+                self.set_position(args)
+            elif command == 'go':
+                self.go(args)
+            elif command == 'stop':
+                self.stop()
+            elif command == 'd':
+                self.send(position_to_text(self.game))
+            else:
+                self.send(f"info string unknown command: {command}")
+        except ValueError as error:
+            self.send(f"info string error: {error}")
+        return True
+
+    def set_option(self, args):
+        """Handle ``setoption name <name> value <value>``."""
+        if len(args) < 4 or args[0] != 'name' or args[2] != 'value':
+            raise ValueError("usage: setoption name <name> value <value>")
+        name, value = args[1].lower(), args[3].lower()
+        if name == 'engine' and value in ENGINES or name == 'difficulty' and value in (
+                'easy', 'medium', 'hard'):
+            self.options[name] = value
+        elif name in ('hash', 'workers'):
+            self.options[name] = int(value)
+        elif name == 'weights':
+            path = ' '.join(args[3:])
+            try:
+                self.options[name] = None if path == '<empty>' else load_weights(path)
+            except OSError as error:
+                raise ValueError(f"cannot read weights: {error}") from None
+        else:
+            raise ValueError(f"invalid option: {args[1]} {args[3]}")
+        self.stop()
+        if self.ai is not None:
+            self.ai.close()
+        self.ai = None  # Rebuilt with the new options by the next "go"
+
+    def set_position(self, args):
+        """Handle ``position startpos|text ... [moves ...]``."""
+        if 'moves' in args:
+            split = args.index('moves')
+            setup, moves = args[:split], args[split + 1:]
+        else:
+            setup, moves = args, []
+        if setup == ['startpos']:
+            start = START_POSITION
+        elif setup[:1] == ['text'] and len(setup) == 3:
+            start = ' '.join(setup[1:])
+        else:
+            raise ValueError("usage: position startpos|text <rows> <side> [moves ...]")
+        game = position_from_text(start)
+        for move in moves:
+            row, col = text_to_cell(move)
+            if game.move_made or not game.push(row, col):
+                raise ValueError(f"illegal move: {move}")
+        self.stop()
+        # The engine keeps its results when the new position follows the old one
+        if self.ai is not None:
+            if start == self._start and moves[:len(self.moves)] == self.moves:
+                for move in moves[len(self.moves):]:
+                    self.ai.notify_move(*text_to_cell(move))
+            else:
+                self.ai.new_game()
+        self.game, self.moves, self._start = game, moves, start
+
+    def make_ai(self):
+        """Create the engine for the player to move, with the current options."""
+        player = self.game.current_player
+        if self.ai is None or self.ai.player != player:
+            if self.ai is not None:
+                self.ai.close()
+            if self.options['engine'] == 'mcts':
+                self.ai = MCTSAI(player, self.options['difficulty'])
+            else:
+                self.ai = MinimaxAI(player, self.options['difficulty'],
+                                    tt_size_mb=self.options['hash'],
+                                    workers=self.options['workers'],
+                                    info_callback=self.send_info,
+                                    weights=self.options['weights'])
+        return self.ai
+
+    def go(self, args):
+        """Handle ``go``: configure the limits and start the search thread."""
+        self.stop()
+        if self.game.move_made or self.game.is_board_full():
+            self.send("bestmove none")
+            return
+        ai = self.make_ai()
+        limits = {'depth': None, 'movetime': None, 'playouts': None}
+        infinite = False
+        index = 0
+        while index < len(args):
+            if args[index] == 'infinite':
+                infinite = True
+                index += 1
+            elif args[index] in limits and index + 1 < len(args):
+                limits[args[index]] = int(args[index + 1])
+                index += 2
+            else:
+                raise ValueError(f"invalid go argument: {args[index]}")
+        ai.time_limit_ms = limits['movetime']
+        if isinstance(ai, MinimaxAI):
+            ai.max_depth = 16 if infinite else limits['depth']
+        else:
+            ai.max_playouts = limits['playouts']
+            if infinite:
+                ai.time_limit_ms = INFINITE_MS
+        self._thread = threading.Thread(target=self._search, args=(ai, self.game.copy()),
+                                        daemon=True)
+        self._thread.start()
+
+    def _search(self, ai, game):
+        """Thread body: search and send the best move."""
+        move = ai.get_best_move(game)
+        if isinstance(ai, MCTSAI):
+            self.send(f"info playouts {ai.playouts} pps {ai.playouts_per_second:.0f}")
+        self.send(f"bestmove {cell_to_text(*move) if move else 'none'}")
+
+    def send_info(self, info):
+        """Stream the statistics of a completed minimax iteration."""
+        pv = ' '.join(cell_to_text(row, col) for row, col in info.pv)
+        self.send(f"info depth {info.depth} score {format_score(info.score)} "
+                  f"nodes {info.nodes} nps {info.nodes_per_second():.0f} "
+                  f"time {info.elapsed * 1000:.0f} hashhit {info.tt_hit_rate:.3f} "
+                  f"pv {pv}")
+
+    def stop(self):
+        """Stop the running search, if any, and wait for its ``bestmove``."""
+        thread, self._thread = self._thread, None
+        while thread is not None and thread.is_alive():
+            self.ai.stop()
+            thread.join(0.01)
+
+    def wait(self):
+        """Wait for the running search to finish by itself."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main():
+    """
+    Run the engine on stdin/stdout until ``quit`` or end of input.
+
+    Returns:
+        int: Exit status
+    """
+    protocol = EngineProtocol()
+    for line in sys.stdin:
+        if not protocol.handle(line):
+            break
+    else:
+        protocol.wait()
+    if protocol.ai is not None:
+        protocol.ai.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# src/orbito/gui/ai_worker.py
+"""
+Background AI search for the graphical interface.
+
+Tkinter is not thread-safe, so the search thread never touches widgets:
+it searches a private copy of the game and posts its result on a queue
+that the interface polls from the Tk event loop with ``window.after``.
+
+Classes:
+    AIWorker: Runs one AI search at a time in a daemon thread
+"""
+
+import queue
+import threading
+
+
+class AIWorker:
+    """
+    Run AI searches off the Tk main thread.
+
+    Every search gets a new identifier. Cancelling a search stops the
+    engine and forgets the identifier, so a result that arrives after a
+    cancellation is dropped instead of being played.
+
+    Attributes:
+        ai_player (BaseAI): Engine used for the searches
+        results (queue.Queue): (search_id, move) pairs posted by searches
+    """
+
+    def __init__(self, ai_player):
+        """
+        Create a worker for an AI player.
+
+        Args:
+            ai_player (BaseAI): Engine used for the searches
+        """
+        self.ai_player = ai_player
+        self.results = queue.Queue()
+        self._search_id = 0
+        self._thread = None
+
+    def start(self, game):
+        """
+        Start searching a position in the background.
+
+        Args:
+            game (OrbitGame): Position to search; it is copied, so the
+                caller may keep changing it
+        """
+        self.cancel()
+        self._search_id += 1
+        self._thread = threading.Thread(
+            target=self._search,
+            args=(self._search_id, game.copy()),
+            daemon=True
+        )
+        self._thread.start()
+
+    def _search(self, search_id, game):
+        """Thread body: search and post the result."""
+        move = self.ai_player.get_best_move(game)
+        self.results.put((search_id, move))
+
+    def is_busy(self):
+        """
+        Check whether a search is outstanding.
+
+        Returns:
+            bool: True from ``start`` until its result is collected by
+                ``poll`` or the search is cancelled
+        """
+        return self._thread is not None
+
+    def poll(self):
+        """
+        Collect the result of the current search, if it is ready.
+
+        Returns:
+            tuple[bool, tuple[int, int] or None]: (ready, move); stale
+                results of cancelled searches are discarded
+        """
+        while True:
+            try:
+                search_id, move = self.results.get_nowait()
+            except queue.Empty:
+                return False, None
+            if search_id == self._search_id and self._thread is not None:
+                self._thread = None
+                return True, move
+
+    def cancel(self):
+        """
+        Stop the current search and discard its result.
+
+        Waits for the search thread to exit, which takes a few
+        milliseconds, so that the engine is never used by two searches.
+        """
+        thread, self._thread = self._thread, None
+        while thread is not None and thread.is_alive():
+            # Repeat the request in case the search had not started yet
+            self.ai_player.stop()
+            thread.join(0.01)
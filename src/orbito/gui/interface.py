@@ -22,6 +22,10 @@ import tkinter as tk
 from tkinter import messagebox
 from ..core.game import OrbitGame
 from ..core.ai import MinimaxAI
+from ..core.ai.ponder import Ponderer
+from ..core.ai.tablebase import load_default_tablebase
+from ..core.records import GameRecord, GameWriter, game_result
+from .ai_worker import AIWorker
 
 class OrbitInterface:
     """
@@ -45,6 +49,12 @@ class OrbitInterface:
         main_frame (tk.Frame): Main container frame
         orbit_button (tk.Button): Button for rotation move
         player_label (tk.Label): Label showing current player
+        engine_label (tk.Label): Label showing statistics of the AI search
+        moves (list[int]): Cell indices played in the current game
+        recorder (GameWriter): Writer logging finished games, or None
+        tablebase (Tablebase): Installed tablebase the 'hard' AI plays
+            from, or None
+        difficulty (tk.StringVar): Difficulty of the AI opponent
         CELL_SIZE (int): Size of each board cell in pixels
         CIRCLE_PADDING (int): Space between ball and cell edge
         SHADOW_OFFSET (int): Offset for shadow effects
@@ -55,15 +65,23 @@ class OrbitInterface:
         HIGHLIGHT (str): Hex color code for hover highlight
     """
     
-    def __init__(self):
+    def __init__(self, record_path=None):
         """
         Initialize the game interface.
         
         Creates the main window, sets up the game logic instance,
         initializes all visual elements, and configures the wooden theme.
         All GUI components are created and arranged in the window.
+
+        Args:
+            record_path (str): Game record file every game is appended
+                to, or None to keep no record
         """
         self.game = OrbitGame()
+        self.moves = []
+        self.recorder = GameWriter(record_path) if record_path else None
+        # Memory-mapped, so opening it at startup is instant
+        self.tablebase = load_default_tablebase()
         self.window = tk.Tk()
         self.window.title("Orbito")
         self.window.configure(bg='#8B4513')  # Dark wooden brown
@@ -75,7 +93,11 @@ class OrbitInterface:
         self.create_gui()
 
         self.ai_player = None
+        self.ai_worker = None
+        self.ponderer = None
         self.against_ai = False
+        # Summary of the latest completed iteration, set by the search thread
+        self._live_summary = None
         
     def setup_constants(self):
         """
@@ -100,6 +122,9 @@ class OrbitInterface:
         self.BLACK_PIECE = '#0C0C0C'    # Almost black for player 2
         self.HIGHLIGHT = '#CD853F'      # Peru brown for hover effect
         
+        # AI search polling
+        self.AI_POLL_MS = 50            # Delay between checks for the AI move
+        
     def create_gui(self):
         """
         Create and arrange all GUI elements.
@@ -132,6 +157,16 @@ class OrbitInterface:
             fg='#4A3210'
         )
         self.player_label.grid(row=5, column=0, columnspan=4, pady=15)
+
+        # AI search statistics
+        self.engine_label = tk.Label(
+            self.main_frame,
+            text="",
+            font=('Arial', 9),
+            bg='#DEB887',
+            fg='#4A3210'
+        )
+        self.engine_label.grid(row=6, column=0, columnspan=4)
         
     def create_board(self):
         """
@@ -278,7 +313,8 @@ class OrbitInterface:
         Sets up:
         - Orbit (rotation) button - initially disabled
         - New Game button
-        Both buttons use consistent wooden styling.
+        - AI toggle button and difficulty menu
+        All controls use consistent wooden styling.
         """
         button_frame = tk.Frame(self.main_frame, bg='#DEB887')
         button_frame.grid(row=4, column=0, columnspan=4, pady=15)
@@ -313,6 +349,19 @@ class OrbitInterface:
             **button_style
         )
         self.ai_button.pack(side=tk.LEFT, padx=10)
+
+        # AI difficulty menu
+        self.difficulty = tk.StringVar(self.window, value='medium')
+        difficulty_menu = tk.OptionMenu(
+            button_frame, self.difficulty, 'easy', 'medium', 'hard',
+            command=self.change_difficulty
+        )
+        difficulty_menu.config(
+            font=('Arial', 12, 'bold'), bg='#8B4513', fg='#FFE4B5',
+            activebackground='#A0522D', activeforeground='#FFE4B5',
+            width=8, bd=4, relief='raised', highlightthickness=0
+        )
+        difficulty_menu.pack(side=tk.LEFT, padx=10)
         
     def on_enter(self, canvas):
         """
@@ -363,16 +412,58 @@ class OrbitInterface:
     
     def toggle_ai(self):
         """Toggle AI opponent on/off."""
+        if self.ai_worker:
+            self.ai_worker.cancel()
+            self.ponderer.stop()
         self.against_ai = not self.against_ai
         if self.against_ai:
             self.ai_button.config(text="Play vs Human")
-            # Créer une IA avec difficulté moyenne par défaut
-            self.ai_player = MinimaxAI(2, difficulty='medium')
+            self.create_ai()
         else:
             self.ai_button.config(text="Play vs AI")
             self.ai_player = None
+            self.ai_worker = None
+            self.ponderer = None
+        self.new_game()
+
+    def create_ai(self):
+        """
+        Create the AI opponent at the selected difficulty.
+
+        Only the 'hard' AI plays from the tablebase: with it, the other
+        difficulties would play perfectly too.
+        """
+        difficulty = self.difficulty.get()
+        tablebase = self.tablebase if difficulty == 'hard' else None
+        self.ai_player = MinimaxAI(2, difficulty=difficulty, tablebase=tablebase,
+                                   info_callback=self.on_search_info)
+        self.ai_worker = AIWorker(self.ai_player)
+        self.ponderer = Ponderer(self.ai_player)
+
+    def change_difficulty(self, difficulty):
+        """
+        Switch the AI opponent to a new difficulty and start a new game.
+
+        Args:
+            difficulty (str): 'easy', 'medium', or 'hard'
+        """
+        if not self.against_ai:
+            return
+        self.ai_worker.cancel()
+        self.ponderer.stop()
+        self.create_ai()
         self.new_game()
 
+    def is_ai_turn(self):
+        """
+        Check whether the AI is to play.
+
+        Returns:
+            bool: True if playing against the AI and it is the AI's turn
+        """
+        return (self.against_ai
+                and self.game.get_current_player() == self.ai_player.player)
+
     def orbit_move(self):
         """
         Handle the orbit (rotation) move.
@@ -380,7 +471,10 @@ class OrbitInterface:
         white_wins, black_wins = self.game.orbit_move()
         self.update_display()
         
-        if white_wins:
+        if white_wins and black_wins:
+            messagebox.showinfo("Draw!", "Both players aligned: draw!")
+            self.new_game()
+        elif white_wins:
             messagebox.showinfo("Victory", "White player wins!")
             self.new_game()
         elif black_wins:
@@ -398,12 +492,21 @@ class OrbitInterface:
             # If it's AI's turn after orbiting, make AI move
             if self.against_ai and self.game.get_current_player() == self.ai_player.player:
                 self.window.after(500, self.make_ai_move)  # 500ms delay for better UX
+            elif self.against_ai:
+                self.ponderer.start(self.game)  # Think on the human's time
 
     def make_move(self, row, col):
         """
         Handle a move attempt at specified position and automatically orbit.
         """
+        if self.is_ai_turn():
+            return  # Clicks are ignored while the AI plays
         if self.game.make_move(row, col):
+            self.moves.append(row * 4 + col)
+            if self.against_ai:
+                # The engine must be free, with its own line restored, first
+                self.ponderer.stop()
+                self.ai_player.notify_move(row, col)
             color = self.WHITE_PIECE if self.game.get_current_player() == 1 else self.BLACK_PIECE
             canvas = self.canvases[row][col]
             circle = self.circles[row][col]
@@ -422,7 +525,10 @@ class OrbitInterface:
             white_wins, black_wins = self.game.orbit_move()
             self.update_display()
             
-            if white_wins:
+            if white_wins and black_wins:
+                messagebox.showinfo("Draw!", "Both players aligned: draw!")
+                self.new_game()
+            elif white_wins:
                 messagebox.showinfo("Victory", "White player wins!")
                 self.new_game()
             elif black_wins:
@@ -441,27 +547,101 @@ class OrbitInterface:
                 # Si c'est le tour de l'IA après l'orbitage
                 if self.against_ai and self.game.get_current_player() == self.ai_player.player:
                     self.window.after(500, self.make_ai_move)
+                elif self.against_ai:
+                    self.ponderer.start(self.game)  # Think on the human's time
         
         # Execute orbit after animation
         self.window.after(360, complete_orbit)  # Time matched to animation duration
 
     def make_ai_move(self):
         """
-        Execute AI's move and trigger orbit automatically.
+        Start the AI search in the background.
+
+        If pondering already prepared an answer to the human's move, it is
+        played at once. Otherwise the search runs in a worker thread so the
+        window keeps repainting and animating; ``poll_ai_move`` picks up
+        the result.
         """
-        if self.ai_player and not self.game.is_board_full():
-            move = self.ai_player.get_best_move(self.game)
+        if (self.ai_player and self.is_ai_turn() and not self.game.move_made
+                and not self.game.is_board_full()):
+            self.ponderer.stop()
+            move = self.ponderer.lookup(self.game)
             if move:
-                row, col = move
-                if self.game.make_move(row, col):
-                    # Update display for AI move
-                    color = self.WHITE_PIECE if self.game.get_current_player() == 1 else self.BLACK_PIECE
-                    canvas = self.canvases[row][col]
-                    circle = self.circles[row][col]
-                    self.add_shine_effect(canvas, circle, color)
-                    
-                    # Trigger orbit after AI move
-                    self.window.after(500, self.auto_orbit)
+                info = self.ponderer.lookup_info(self.game)
+                self.engine_label.config(text=info.summary() if info is not None else "")
+                self.play_ai_move(move)
+                return
+            self._live_summary = None
+            self.ai_worker.start(self.game)
+            self.thinking_dots = 0
+            self.window.config(cursor='watch')
+            self.window.after(self.AI_POLL_MS, self.poll_ai_move)
+
+    def on_search_info(self, info):
+        """
+        Keep the statistics of the AI search after every iteration.
+
+        Runs in the search thread, where Tk must not be touched, so the
+        summary is only stored; ``poll_ai_move`` shows it.
+
+        Args:
+            info (SearchInfo): Telemetry of the running search
+        """
+        self._live_summary = info.summary()
+
+    def poll_ai_move(self):
+        """
+        Check for the AI move, play it when ready and orbit automatically.
+
+        Shows a "thinking" indicator and the statistics of the iterations
+        completed so far while the search runs. Stops polling when the
+        search was cancelled by a new game or by disabling the AI.
+        """
+        if not self.ai_worker:
+            return
+        ready, move = self.ai_worker.poll()
+        if not ready:
+            if self.ai_worker.is_busy():
+                self.thinking_dots = (self.thinking_dots + 1) % 12
+                self.player_label.config(
+                    text=f"{'White' if self.ai_player.player == 1 else 'Black'} is thinking"
+                         + "." * (self.thinking_dots // 3 + 1)
+                )
+                if self._live_summary is not None:
+                    self.engine_label.config(text=self._live_summary)
+                self.window.after(self.AI_POLL_MS, self.poll_ai_move)
+            return
+        
+        self.window.config(cursor='')
+        self.player_label.config(
+            text=f"{'White' if self.game.get_current_player() == 1 else 'Black'} player's turn"
+        )
+        info = getattr(self.ai_player, 'info', None)
+        if info is not None:
+            self.engine_label.config(text=info.summary())
+        if move:
+            self.play_ai_move(move)
+
+    def play_ai_move(self, move):
+        """
+        Place the AI's ball and trigger orbit automatically.
+
+        Args:
+            move (tuple[int, int]): (row, col) chosen by the AI
+        """
+        if move:
+            row, col = move
+            if self.game.make_move(row, col):
+                self.moves.append(row * 4 + col)
+                self.ai_player.notify_move(row, col)
+                # Update display for AI move
+                color = self.WHITE_PIECE if self.game.get_current_player() == 1 else self.BLACK_PIECE
+                canvas = self.canvases[row][col]
+                circle = self.circles[row][col]
+                self.add_shine_effect(canvas, circle, color)
+                
+                # Trigger orbit after AI move
+                self.window.after(500, self.auto_orbit)
          
     def add_shine_effect(self, canvas, circle, color):
         """
@@ -508,16 +688,15 @@ class OrbitInterface:
                 else:
                     self.add_shine_effect(canvas, circle, self.BLACK_PIECE)
     
-    def new_game(self):
+    def record_game(self):
         """
-        Start a new game.
-        
-        Resets:
-        - Game logic
-        - Board display
-        - Button states
-        - Turn indicator
+        Append the current game to the record file, if one is open.
+
+        Unfinished games are kept too, with an unknown result.
         """
+        if self.recorder and self.moves:
+            self.recorder.write(GameRecord(self.moves, game_result(self.game)))
+
     def new_game(self):
         """
         Start a new game.
@@ -528,7 +707,17 @@ class OrbitInterface:
         - Animation states
         - Turn indicator
         """
-        # Reset game logic
+        # Stop any AI search on the old position
+        if self.ai_worker:
+            self.ai_worker.cancel()
+            self.ponderer.stop()
+            self.ai_player.new_game()
+        self.window.config(cursor='')
+        self.engine_label.config(text="")
+        
+        # Log the game before resetting game logic
+        self.record_game()
+        self.moves = []
         self.game.reset_game()
         
         # Reset animation state
@@ -560,4 +749,9 @@ class OrbitInterface:
         - Updates display
         - Processes game logic
         """
-        self.window.mainloop()
\ No newline at end of file
+        try:
+            self.window.mainloop()
+        finally:
+            if self.recorder:
+                self.record_game()
+                self.recorder.close()
\ No newline at end of file
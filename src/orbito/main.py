@@ -2,6 +2,7 @@
 Main entry point for the Orbito game.
 """
 
+import argparse
 import sys
 import traceback
 import tkinter as tk
@@ -11,13 +12,21 @@ from tkinter import messagebox
 from orbito.gui.interface import OrbitInterface
 from orbito.core.game import OrbitGame
 
-def main():
+def main(argv=None):
     """
     Launch the Orbito game application.
+
+    Args:
+        argv (list[str]): Command line arguments, sys.argv if None
     """
+    parser = argparse.ArgumentParser(description="Play Orbito")
+    parser.add_argument('--record', metavar='FILE',
+                        help="Append every game to this game record file")
+    args = parser.parse_args(argv)
+
     try:
         # Create and run game interface
-        game = OrbitInterface()
+        game = OrbitInterface(record_path=args.record)
         game.run()
         return 0
         
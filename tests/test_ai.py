@@ -0,0 +1,303 @@
+"""Test suite for the Orbito AI players."""
+
+import pytest
+from orbito.core.game import OrbitGame
+from orbito.core.ai import MinimaxAI
+
+
+def test_search_leaves_game_unchanged():
+    """Test the search restores the game it explores."""
+    game = OrbitGame()
+    game.board = [[1,0,2,0],[0,2,1,0],[0,0,0,0],[1,0,0,2]]
+    ai = MinimaxAI(1, difficulty='easy')
+    before = (game.get_state(), game.move_made, list(game.history))
+    assert ai.get_best_move(game) is not None
+    assert (game.get_state(), game.move_made, list(game.history)) == before
+    assert ai.nodes > 0
+
+def test_search_finds_winning_turn():
+    """Test the AI plays a move that wins after the orbit."""
+    game = OrbitGame()
+    game.board = [[0,0,0,0],[0,0,0,2],[0,0,0,2],[1,1,1,0]]
+    ai = MinimaxAI(1, difficulty='easy')
+    row, col = ai.get_best_move(game)
+    game.push(row, col)
+    assert game.check_win_for_player(1) == True
+
+def test_search_blocks_opponent_win():
+    """Test the AI stops a win the opponent would get on its next turn."""
+    game = OrbitGame()
+    # Every white move but one lets black complete the left column
+    game.board = [[0,0,0,0],[2,0,0,0],[2,0,1,0],[2,0,0,1]]
+    ai = MinimaxAI(1, difficulty='easy')
+    row, col = ai.get_best_move(game)
+    game.push(row, col)
+    for reply_row in range(4):
+        for reply_col in range(4):
+            if game.push(reply_row, reply_col):
+                assert game.check_win_for_player(2) == False
+                game.pop()
+
+def test_deeper_search_visits_more_nodes():
+    """Test difficulty levels search real plies."""
+    game = OrbitGame()
+    game.push(0, 0)
+    game.push(1, 1)
+    nodes = []
+    for difficulty in ('easy', 'medium'):
+        ai = MinimaxAI(1, difficulty=difficulty)
+        ai.get_best_move(game)
+        nodes.append(ai.nodes)
+    assert nodes[1] > nodes[0] > 100
+
+def test_zobrist_key_follows_moves():
+    """Test the incremental Zobrist key matches a fresh computation."""
+    from orbito.core.zobrist import board_key
+    game = OrbitGame()
+    keys = {game.hash_key()}
+    for row, col in [(0, 0), (1, 2), (3, 3), (2, 2)]:
+        assert game.make_move(row, col) == True
+        assert game.zobrist == board_key(game.white, game.black)
+        game.orbit_move()
+        assert game.zobrist == board_key(game.white, game.black)
+        keys.add(game.hash_key())
+    assert len(keys) == 5
+
+def test_transposition_table_replacement():
+    """Test depth-preferred and always-replace slots of a bucket."""
+    from orbito.core.ai.transposition import EXACT, LOWER, TranspositionTable
+    tt = TranspositionTable(size_mb=0.001)
+    key, other, third = 5, 5 + tt.buckets, 5 + 2 * tt.buckets
+    tt.store(key, 6, EXACT, 42, 3)
+    tt.store(other, 2, LOWER, -7, 1)
+    assert tt.probe(key) == (6, EXACT, 42, 3)
+    assert tt.probe(other) == (2, LOWER, -7, 1)
+    tt.store(third, 1, EXACT, 0, 0)
+    assert tt.probe(key) == (6, EXACT, 42, 3)
+    assert tt.probe(other) is None
+    tt.new_search()
+    tt.store(other, 1, EXACT, 9, 2)
+    assert tt.probe(key) is None
+    assert tt.probe(other) == (1, EXACT, 9, 2)
+
+def test_time_limited_search_returns_in_budget():
+    """Test iterative deepening respects the wall-clock budget."""
+    import time
+    game = OrbitGame()
+    game.push(0, 0)
+    ai = MinimaxAI(2, time_limit_ms=100)
+    start = time.perf_counter()
+    row, col = ai.get_best_move(game)
+    assert time.perf_counter() - start < 0.5
+    assert game.is_valid_move(row, col)
+    assert ai.depth_reached >= 1
+    assert game.history == [0]
+
+def test_heuristic_orderer_puts_wins_first():
+    """Test winning and blocking moves are searched before quiet moves."""
+    from orbito.core.ai.ordering import HeuristicOrderer
+    game = OrbitGame()
+    game.board = [[0,1,1,1],[0,0,0,0],[2,0,0,0],[2,2,0,0]]
+    moves = HeuristicOrderer().order(game, 0)
+    assert sorted(moves) == [index for index in range(16)
+                             if game.is_valid_move(index >> 2, index & 3)]
+    # White (1,3) completes the top row after the orbit. Black would then
+    # complete the bottom row by playing (2,0) and orbiting, unless white
+    # plays (1,0), whose ball lands on (2,0) first
+    assert moves[:2] == [7, 4]
+
+def test_search_reports_cutoff_statistics():
+    """Test the orderer collects cutoff statistics during a search."""
+    game = OrbitGame()
+    game.push(0, 0)
+    ai = MinimaxAI(2, difficulty='medium')
+    ai.get_best_move(game)
+    assert ai.orderer.nodes > 0
+    assert 0 < ai.orderer.cutoff_rate() <= 1
+    assert 0 < ai.orderer.first_move_cutoff_rate() <= 1
+
+def test_stop_ends_search_early():
+    """Test a stop request makes the search return at once."""
+    import threading
+    import time
+    game = OrbitGame()
+    ai = MinimaxAI(1, time_limit_ms=60000)
+    timer = threading.Timer(0.05, ai.stop)
+    start = time.perf_counter()
+    timer.start()
+    row, col = ai.get_best_move(game)
+    timer.join()
+    assert time.perf_counter() - start < 1
+    assert game.is_valid_move(row, col)
+    assert game.history == []
+
+def test_ponderer_prepares_answers():
+    """Test pondering answers the opponent's replies in the background."""
+    import time
+    from orbito.core.ai.ponder import Ponderer
+    game = OrbitGame()
+    game.push(0, 0)
+    game.push(1, 1)
+    ai = MinimaxAI(2, difficulty='easy')
+    ai.get_best_move(game.copy())
+    pv, info, age = ai.pv, ai.info, ai.tt._age
+    ponderer = Ponderer(ai)
+    ponderer.start(game)  # White, the opponent, is to move
+    deadline = time.perf_counter() + 10
+    while ponderer.is_running() and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    ponderer.stop()
+    assert len(ponderer.replies) > 1
+    for state, move in ponderer.replies.items():
+        reply = OrbitGame()
+        reply.set_state(*state)
+        assert reply.is_valid_move(*move)
+        assert ponderer.infos[state].move == move
+    assert game.history == [0, 5]
+    # The table aged once, and the engine got its own line back
+    assert ai.tt._age == age + 1
+    assert ai.pv == pv and ai.info is info
+
+def test_pattern_table_matches_window_scan():
+    """Test the table evaluation against a full scan of the board."""
+    import random
+    from orbito.core.ai.evaluator import (
+        CENTER_CELLS, WIN_SCORE, count_aligned_pieces, evaluate_position
+    )
+    rng = random.Random(7)
+    for _ in range(300):
+        game = OrbitGame()
+        for _ in range(rng.randrange(12)):
+            row, col = rng.choice([(r, c) for r in range(4) for c in range(4)
+                                   if game.is_valid_move(r, c)])
+            game.push(row, col)
+            if game.move_made:
+                break
+        board = game.get_board()
+        for player in (1, 2):
+            opponent = 3 - player
+            ai_wins = game.check_win_for_player(player)
+            opponent_wins = game.check_win_for_player(opponent)
+            if ai_wins or opponent_wins:
+                expected = 0 if ai_wins and opponent_wins else (
+                    WIN_SCORE if ai_wins else -WIN_SCORE)
+            else:
+                expected = (50 * count_aligned_pieces(board, player, 3)
+                            + 10 * count_aligned_pieces(board, player, 2)
+                            - 50 * count_aligned_pieces(board, opponent, 3)
+                            - 10 * count_aligned_pieces(board, opponent, 2))
+                for index in CENTER_CELLS:
+                    cell = board[index // 4][index % 4]
+                    expected += 5 if cell == player else -5 if cell == opponent else 0
+            assert evaluate_position(game, player) == expected
+
+def test_canonical_table_needs_symmetric_weights(tmp_path):
+    """Test weights that tell rotated positions apart disable the canonical table."""
+    from orbito.core.ai.evaluator import save_weights
+    path = str(tmp_path / 'weights.json')
+    cells = [0] * 16
+    cells[0] = 7
+    save_weights(path, {'cells': cells})
+    assert MinimaxAI(1).canonical_tt
+    assert not MinimaxAI(1, weights=path).canonical_tt
+    # The rotations only swap the corners among themselves
+    cells[3] = cells[12] = cells[15] = 7
+    assert MinimaxAI(1, weights={'cells': cells}).canonical_tt
+
+def test_parallel_search_is_deterministic():
+    """Test a deterministic parallel search does not depend on the workers."""
+    game = OrbitGame()
+    game.push(0, 0)
+    moves = []
+    for workers in (2, 3):
+        ai = MinimaxAI(2, difficulty='hard', workers=workers, deterministic=True)
+        try:
+            moves.append(ai.get_best_move(game))
+            moves.append(ai.get_best_move(game))
+            # The line comes from the workers, not the engine's own table
+            assert ai.info.pv[0] == moves[-1]
+            assert len(ai.info.pv) == ai.depth_reached
+        finally:
+            ai.close()
+    assert game.is_valid_move(*moves[0])
+    assert moves == [moves[0]] * 4
+    assert game.history == [0]
+
+def test_mcts_finds_winning_turn():
+    """Test the MCTS engine plays a move that wins after the orbit."""
+    from orbito.core.ai import MCTSAI
+    game = OrbitGame()
+    game.board = [[0,0,0,0],[0,0,0,2],[0,0,0,2],[1,1,1,0]]
+    ai = MCTSAI(1, playouts=2000, seed=0)
+    row, col = ai.get_best_move(game)
+    assert ai.playouts == 2000
+    assert ai.playouts_per_second > 0
+    game.push(row, col)
+    assert game.check_win_for_player(1) == True
+
+def test_mcts_reuses_tree():
+    """Test the next MCTS search starts from the subtree of the reached position."""
+    from orbito.core.ai import MCTSAI
+    game = OrbitGame()
+    ai = MCTSAI(1, playouts=3000, seed=0)
+    game.push(*ai.get_best_move(game))
+    reply = max(ai.root.children, key=lambda child: child.visits)
+    reply = max(reply.children, key=lambda child: child.visits)
+    game.push(*divmod(reply.move, 4))
+    visits = reply.visits
+    ai.get_best_move(game)
+    assert ai.root is reply
+    assert reply.visits == visits + 3000
+
+def test_notify_move_follows_principal_variation():
+    """Test the principal variation survives the moves that follow it."""
+    game = OrbitGame()
+    game.push(0, 0)
+    ai = MinimaxAI(2, difficulty='hard')
+    row, col = ai.get_best_move(game)
+    pv = list(ai.pv)
+    assert len(pv) > 2 and pv[0] == row * 4 + col
+    for index in pv[:2]:
+        game.push(index >> 2, index & 3)
+        ai.notify_move(index >> 2, index & 3)
+    assert ai.pv == pv[2:]
+    assert ai._pv_state == game.get_state()
+    ai.notify_move(*divmod(next(i for i in range(16) if i != ai.pv[0]), 4))
+    assert ai.pv == []
+
+def test_mcts_notify_move_reroots_tree():
+    """Test notified moves re-root the MCTS tree and drop the siblings."""
+    from orbito.core.ai import MCTSAI
+    game = OrbitGame()
+    ai = MCTSAI(1, playouts=2000, seed=0)
+    row, col = ai.get_best_move(game)
+    ai.notify_move(row, col)
+    game.push(row, col)
+    assert ai.root.state() == game.get_state()
+    assert ai.root.parent is None
+    ai.new_game()
+    assert ai.root is None
+
+def test_search_info_reports_iterations():
+    """Test the search statistics and the iteration callback."""
+    game = OrbitGame()
+    game.push(0, 0)
+    seen = []
+    ai = MinimaxAI(2, difficulty='hard',
+                   info_callback=lambda info: seen.append(info.depth))
+    row, col = ai.get_best_move(game)
+    info = ai.info
+    assert seen == [1, 2, 3, 4, 5]
+    assert [iteration.depth for iteration in info.iterations] == seen
+    assert info.move == (row, col) and info.pv[0] == (row, col)
+    assert info.depth == ai.depth_reached == 5
+    assert info.nodes == ai.nodes
+    assert info.nodes_per_second() > 0
+    assert 0 < info.tt_hit_rate <= 1
+    assert info.cutoffs == ai.orderer.cutoffs
+    elapsed = [iteration.elapsed for iteration in info.iterations]
+    assert elapsed == sorted(elapsed) and elapsed[-1] <= info.elapsed
+    durations = [iteration.duration for iteration in info.iterations]
+    assert all(duration >= 0 for duration in durations)
+    assert sum(durations) == pytest.approx(elapsed[-1])
+    assert info.as_dict()['depth'] == 5
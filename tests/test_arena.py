@@ -0,0 +1,62 @@
+"""Test suite for the self-play arena."""
+
+import math
+
+import pytest
+
+from orbito.arena import (
+    DRAW, LOSS, WIN, MatchResult, parse_spec, play_game, run_match, sprt_bounds
+)
+from orbito.core.game import OrbitGame
+
+
+def test_parse_spec():
+    """Test engine specs are parsed into constructor arguments."""
+    assert parse_spec('minimax') == {'engine': 'minimax'}
+    assert parse_spec('mcts:playouts=200,difficulty=easy') == {
+        'engine': 'mcts', 'playouts': 200, 'difficulty': 'easy'}
+    with pytest.raises(ValueError):
+        parse_spec('random')
+    with pytest.raises(ValueError):
+        parse_spec('minimax:hard')
+
+
+def test_play_game_replays_to_the_result():
+    """Test a game record replays to the reported result."""
+    result, moves = play_game({'engine': 'minimax', 'difficulty': 'easy'},
+                              {'engine': 'mcts', 'playouts': 200, 'seed': 1},
+                              [5, 10], a_is_white=False)
+    assert moves[:2] == [5, 10]
+    game = OrbitGame()
+    for index in moves:
+        assert game.push(index >> 2, index & 3)
+    white_wins = game.check_win_for_player(1)
+    black_wins = game.check_win_for_player(2)
+    expected = DRAW if white_wins == black_wins else (WIN if black_wins else LOSS)
+    assert result == expected
+
+
+def test_match_statistics():
+    """Test Elo, its interval and the SPRT log-likelihood ratio."""
+    result = MatchResult()
+    for game_result in [WIN] * 60 + [DRAW] * 20 + [LOSS] * 20:
+        result.add(game_result)
+    assert result.games == 100
+    assert result.score() == pytest.approx(0.7)
+    assert result.elo() == pytest.approx(400 * math.log10(0.7 / 0.3))
+    low, high = result.elo_interval()
+    assert low < result.elo() < high
+    lower, upper = sprt_bounds()
+    assert result.llr(0, 50) > upper
+    assert result.llr(250, 300) < lower
+
+
+def test_run_match_alternates_colours():
+    """Test a small match plays every opening with both colours."""
+    seen = []
+    result, decision = run_match({'engine': 'minimax', 'difficulty': 'easy'},
+                                 {'engine': 'minimax', 'difficulty': 'easy'},
+                                 games=4, workers=1,
+                                 on_game=lambda *game: seen.append(game[2]))
+    assert result.games == 4 and decision is None
+    assert sorted(seen) == [False, False, True, True]
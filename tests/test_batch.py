@@ -0,0 +1,92 @@
+"""Test suite for the NumPy batch helpers."""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from orbito.core.batch import boards_from_masks, masks_from_boards, orbit_boards
+from orbito.core.bitboard import orbit_mask
+
+
+def random_masks(count, seed=0):
+    rng = random.Random(seed)
+    white, black = [], []
+    for _ in range(count):
+        cells = rng.sample(range(16), rng.randint(0, 16))
+        split = len(cells) // 2
+        white.append(sum(1 << c for c in cells[:split]))
+        black.append(sum(1 << c for c in cells[split:]))
+    return white, black
+
+
+def test_masks_round_trip():
+    """Test conversion between masks and board arrays."""
+    white, black = random_masks(200)
+    boards = boards_from_masks(white, black)
+    assert boards.shape == (200, 16)
+    new_white, new_black = masks_from_boards(boards)
+    assert new_white.tolist() == white
+    assert new_black.tolist() == black
+
+
+def test_orbit_boards_matches_orbit_mask():
+    """Test batched rotation against the single-board lookup tables."""
+    white, black = random_masks(500, seed=1)
+    rotated = orbit_boards(boards_from_masks(white, black))
+    new_white, new_black = masks_from_boards(rotated)
+    assert new_white.tolist() == [orbit_mask(m) for m in white]
+    assert new_black.tolist() == [orbit_mask(m) for m in black]
+
+
+def test_evaluate_batch_matches_evaluate_position():
+    """Test batched evaluation against the single-position evaluator."""
+    from orbito.core.ai.batch_eval import evaluate_batch
+    from orbito.core.ai.evaluator import evaluate_position
+    from orbito.core.game import OrbitGame
+    white, black = random_masks(500, seed=2)
+    boards = boards_from_masks(white, black)
+    tuned = {'three': 40, 'two': 12, 'center': 3, 'cells': range(-8, 8),
+             'open_two': 4, 'open_three': 25}
+    for player in (1, 2):
+        for weights in (None, tuned):
+            scores = evaluate_batch(boards, player, weights)
+            expected = []
+            for w, b in zip(white, black):
+                game = OrbitGame()
+                game.white, game.black = w, b
+                expected.append(evaluate_position(game, player, weights))
+            assert scores.tolist() == expected
+
+
+def test_batch_game_matches_orbit_game():
+    """Test lockstep random games against the single-game rules."""
+    from orbito.core.batch import DRAW, BatchOrbitGame
+    from orbito.core.game import OrbitGame
+    rng = np.random.default_rng(3)
+    batch = BatchOrbitGame(300)
+    history = []
+    while not batch.is_over():
+        moves = batch.random_moves(rng)
+        history.append(moves)
+        batch.step(moves)
+    history = np.array(history)
+    for index in range(len(batch)):
+        game = OrbitGame()
+        for move in history[:, index]:
+            if move < 0:
+                break
+            assert game.push(move >> 2, move & 3)
+        assert batch.plies[index] == len(game.history)
+        white, black = masks_from_boards(batch.boards[index:index + 1])
+        assert (white[0], black[0]) == (game.white, game.black)
+        assert batch.current_player[index] == game.current_player
+        white_wins = game.check_win_for_player(1)
+        black_wins = game.check_win_for_player(2)
+        if white_wins != black_wins:
+            assert batch.results[index] == (1 if white_wins else 2)
+        else:
+            assert batch.results[index] == DRAW
+    with pytest.raises(ValueError):
+        BatchOrbitGame(1, boards=[[1] + [0] * 15]).step([0])
@@ -0,0 +1,62 @@
+"""Test suite for the training-data exporter."""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from orbito.core.ai.dataset import (
+    NO_SCORE, canonical_masks, export_dataset, load_dataset, random_positions,
+    record_positions
+)
+from orbito.core.game import OrbitGame
+from orbito.core.records import (
+    BLACK_WINS, DRAW, ONGOING, WHITE_WINS, GameRecord, game_result
+)
+from orbito.core.symmetry import canonical
+
+
+def test_record_positions_label_outcomes():
+    """Test game records give the positions before every move."""
+    rng = random.Random(3)
+    game = OrbitGame()
+    moves = []
+    while not (game.move_made or game.is_board_full()):
+        index = rng.choice([i for i in range(16) if not (game.white | game.black) >> i & 1])
+        game.push(index >> 2, index & 3)
+        moves.append(index)
+    record = GameRecord(moves, game_result(game))
+    assert record.result in (WHITE_WINS, BLACK_WINS, DRAW)
+
+    (chunk,) = record_positions([GameRecord([5, 10, 0], ONGOING), record])
+    assert len(chunk) == len(moves)
+    assert chunk['player'].tolist() == [1 + turn % 2 for turn in range(len(moves))]
+    winner = {WHITE_WINS: 1, BLACK_WINS: 2}.get(record.result)
+    assert chunk['outcome'].tolist() == [
+        0 if winner is None else (1 if player == winner else -1) for player in chunk['player']]
+    assert (chunk['white'][0], chunk['black'][0]) == (0, 0)
+    assert (chunk['score'] == NO_SCORE).all()
+
+
+def test_export_deduplicates_and_memory_maps(tmp_path):
+    """Test shards hold each canonical position once and load lazily."""
+    chunks = list(random_positions(300, np.random.default_rng(1), batch_size=100))
+    white = np.concatenate([chunk['white'] for chunk in chunks])
+    black = np.concatenate([chunk['black'] for chunk in chunks])
+    canonical_white, canonical_black = canonical_masks(white, black)
+    for index in range(0, len(white), 37):
+        assert canonical(int(white[index]), int(black[index]))[:2] == (
+            canonical_white[index], canonical_black[index])
+
+    writer = export_dataset(chunks, tmp_path, shard_size=500, search_depth=2)
+    distinct = set(zip(canonical_white.tolist(), canonical_black.tolist()))
+    assert writer.positions == len(distinct)
+    assert writer.positions + writer.duplicates == len(white)
+
+    shards = load_dataset(tmp_path)
+    assert len(shards) == len(writer.shards) == -(-len(distinct) // 500)
+    assert isinstance(shards[0], np.memmap)
+    data = np.concatenate(shards)
+    assert set(zip(data['white'].tolist(), data['black'].tolist())) == distinct
+    assert (data['score'] != NO_SCORE).all()
@@ -0,0 +1,60 @@
+"""Test suite for the headless engine protocol."""
+
+import io
+import subprocess
+import sys
+
+from orbito.core.notation import cell_to_text, text_to_cell
+from orbito.engine import EngineProtocol
+
+
+def run(commands):
+    output = io.StringIO()
+    protocol = EngineProtocol(output)
+    for command in commands:
+        protocol.handle(command)
+    protocol.wait()
+    return output.getvalue().splitlines()
+
+
+def test_go_streams_info_and_bestmove():
+    """Test a depth-limited search reports every iteration and a legal move."""
+    lines = run(['position startpos moves a4 b3', 'go depth 3'])
+    assert [line.split()[2] for line in lines if line.startswith('info depth')] == ['1', '2', '3']
+    assert lines[-1].startswith('bestmove ')
+    row, col = text_to_cell(lines[-1].split()[1])
+    protocol = EngineProtocol(io.StringIO())
+    protocol.handle('position startpos moves a4 b3')
+    assert protocol.game.is_valid_move(row, col)
+
+
+def test_position_errors_are_reported():
+    """Test invalid commands answer with an info string instead of failing."""
+    lines = run(['position startpos moves a4 a4 e9', 'frobnicate', 'isready'])
+    assert lines[0].startswith('info string error')
+    assert lines[1] == 'info string unknown command: frobnicate'
+    assert lines[2] == 'readyok'
+
+
+def test_mcts_engine_and_finished_games():
+    """Test the MCTS option and a search on a finished game."""
+    lines = run(['setoption name Engine value mcts', 'go playouts 300'])
+    assert lines[0] == 'info playouts 300' or lines[0].startswith('info playouts 300 ')
+    assert text_to_cell(lines[1].split()[1]) is not None
+    lines = run(['position text ..../...B/...B/WWW. w moves a2', 'go depth 2'])
+    assert lines == ['bestmove none']
+
+
+def test_engine_does_not_import_tkinter():
+    """Test the engine module can run without a display."""
+    code = "import sys, orbito.engine; sys.exit('tkinter' in sys.modules)"
+    assert subprocess.run([sys.executable, '-c', code]).returncode == 0
+
+
+def test_cell_notation_round_trip():
+    """Test cell names: a4 is the top-left cell."""
+    assert cell_to_text(0, 0) == 'a4'
+    assert cell_to_text(3, 3) == 'd1'
+    for row in range(4):
+        for col in range(4):
+            assert text_to_cell(cell_to_text(row, col)) == (row, col)
@@ -129,4 +129,94 @@ def test_win_condition_diagonal():
         [0,0,1,0],
         [0,0,0,1]
     ]
-    assert game.check_win_for_player(1) == True
\ No newline at end of file
+    assert game.check_win_for_player(1) == True
+
+def test_orbit_matches_reference_rotation():
+    """Test bitboard orbit against the reference cell-by-cell rotation."""
+    moves = {
+        (0,0): (1,0), (1,0): (2,0), (2,0): (3,0),
+        (3,0): (3,1), (3,1): (3,2), (3,2): (3,3),
+        (3,3): (2,3), (2,3): (1,3), (1,3): (0,3),
+        (0,3): (0,2), (0,2): (0,1), (0,1): (0,0),
+        (1,1): (2,1), (2,1): (2,2), (2,2): (1,2), (1,2): (1,1)
+    }
+    board = [[1,2,0,1],[0,2,1,0],[2,0,0,1],[1,0,2,0]]
+    expected = [[0 for _ in range(4)] for _ in range(4)]
+    for (old_row, old_col), (new_row, new_col) in moves.items():
+        expected[new_row][new_col] = board[old_row][old_col]
+
+    game = OrbitGame()
+    game.board = board
+    game.move_made = True
+    game.orbit_move()
+    assert game.get_board() == expected
+
+def test_board_full():
+    """Test full board detection."""
+    game = OrbitGame()
+    game.board = [[1,2,1,2],[2,1,2,1],[1,2,1,2],[2,1,2,0]]
+    assert game.is_board_full() == False
+    game.board = [[1,2,1,2],[2,1,2,1],[1,2,1,2],[2,1,2,1]]
+    assert game.is_board_full() == True
+
+def test_push_matches_make_move_and_orbit():
+    """Test push plays the same turn as make_move followed by orbit_move."""
+    game = OrbitGame()
+    reference = OrbitGame()
+    for row, col in [(0, 0), (1, 2), (3, 3), (2, 1)]:
+        if not game.is_valid_move(row, col):
+            continue
+        assert game.push(row, col) == True
+        reference.make_move(row, col)
+        reference.orbit_move()
+        assert game.get_board() == reference.get_board()
+        assert game.current_player == reference.current_player
+
+def test_pop_restores_previous_state():
+    """Test pop undoes pushed turns in reverse order."""
+    game = OrbitGame()
+    states = []
+    for row, col in [(0, 0), (1, 2), (3, 3), (2, 1), (0, 3)]:
+        if not game.is_valid_move(row, col):
+            continue
+        states.append((game.get_state(), game.move_made))
+        game.push(row, col)
+    while states:
+        game.pop()
+        assert (game.get_state(), game.move_made) == states.pop()
+
+def test_push_winning_turn_keeps_player():
+    """Test push and pop around a winning turn."""
+    game = OrbitGame()
+    # After the orbit the bottom row moves right, completing the last row
+    game.board = [[0,0,0,0],[0,0,0,0],[0,0,0,2],[1,1,1,0]]
+    assert game.push(2, 0) == True
+    assert game.check_win_for_player(1) == True
+    assert game.current_player == 1
+    assert game.move_made == True
+    assert game.push(0, 0) == False
+    game.pop()
+    assert game.get_board() == [[0,0,0,0],[0,0,0,0],[0,0,0,2],[1,1,1,0]]
+    assert game.move_made == False
+
+def test_rule_symmetries_are_the_rotations():
+    """Test only the rotations of the board commute with the orbit."""
+    from orbito.core.symmetry import SYMMETRY_NAMES
+    assert SYMMETRY_NAMES == ('identity', 'rotate_90', 'rotate_180', 'rotate_270')
+
+def test_canonical_form_is_shared_by_rotations():
+    """Test rotated positions have the same canonical form and play alike."""
+    from orbito.core.bitboard import orbit_mask, has_win
+    from orbito.core.symmetry import SYMMETRIES, canonical, transform_mask
+    white, black = 0b0000_0110_0010_1001, 0b1001_0000_1100_0000
+    forms = set()
+    for symmetry in range(len(SYMMETRIES)):
+        new_white = transform_mask(white, symmetry)
+        new_black = transform_mask(black, symmetry)
+        canonical_white, canonical_black, used = canonical(new_white, new_black)
+        assert (transform_mask(new_white, used), transform_mask(new_black, used)) \
+            == (canonical_white, canonical_black)
+        forms.add((canonical_white, canonical_black))
+        assert transform_mask(orbit_mask(white), symmetry) == orbit_mask(new_white)
+        assert has_win(transform_mask(white | black, symmetry)) == has_win(white | black)
+    assert len(forms) == 1
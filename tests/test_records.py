@@ -0,0 +1,69 @@
+"""Test suite for game records."""
+
+import pytest
+
+from orbito.arena import game_record, play_game
+from orbito.core.records import (
+    BLACK_WINS, DRAW, FLAG_EVALS, FLAG_TIMES, ONGOING, WHITE_WINS, GameRecord,
+    GameWriter, RecordError, game_result, read_games
+)
+
+
+def test_records_round_trip(tmp_path):
+    """Test games are appended and streamed back unchanged."""
+    path = tmp_path / 'games.orb'
+    games = [
+        GameRecord([5, 10, 0], ONGOING, [12, -40, 32767], [150, 0, 65535]),
+        GameRecord([], DRAW, [], []),
+        GameRecord(list(range(16)), BLACK_WINS, range(-8, 8), range(16)),
+    ]
+    with GameWriter(path, FLAG_EVALS | FLAG_TIMES) as writer:
+        writer.write(games[0])
+    with GameWriter(path, FLAG_EVALS | FLAG_TIMES) as writer:
+        for record in games[1:]:
+            writer.write(record)
+    assert list(read_games(path)) == games
+    assert path.stat().st_size == 16 + sum(2 + 5 * len(game.moves) for game in games)
+
+    with pytest.raises(RecordError):
+        GameWriter(path, 0)
+
+    with open(path, 'ab') as handle:
+        handle.write(bytes([3, WHITE_WINS, 1]))
+    reader = read_games(path)
+    assert [next(reader) for _ in games] == games
+    with pytest.raises(RecordError):
+        next(reader)
+
+
+def test_invalid_record_file_is_rejected(tmp_path, capsys):
+    """Test a file that is not a record file is refused, also by the arena."""
+    from orbito.arena import main
+    path = tmp_path / 'notes.txt'
+    path.write_bytes(b'not a game record')
+    with pytest.raises(RecordError):
+        GameWriter(path)
+    with pytest.raises(SystemExit):
+        main(['minimax', 'mcts', '--games', '1', '--record', str(path)])
+    assert 'not an Orbito game record file' in capsys.readouterr().err
+    assert path.read_bytes() == b'not a game record'
+
+
+def test_record_text_conversion():
+    """Test records convert to text and back, and replay to their result."""
+    record = GameRecord([5, 10, 0], WHITE_WINS, [3, -7, 0])
+    assert record.to_text() == 'b3/3 c2/-7 a4/0 1-0'
+    assert GameRecord.from_text(record.to_text()) == record
+    timed = GameRecord([15], ONGOING, times=[250])
+    assert timed.to_text() == 'd1//250 *'
+    assert GameRecord.from_text(timed.to_text()) == timed
+    for line in ('a4 b3', 'e5 1-0', 'a4/1 b3 0-1'):
+        with pytest.raises(RecordError):
+            GameRecord.from_text(line)
+
+    result, moves = play_game({'engine': 'minimax', 'difficulty': 'easy'},
+                              {'engine': 'minimax', 'difficulty': 'medium'},
+                              [5, 10], a_is_white=True)
+    record = game_record(result, moves, True)
+    assert game_result(record.replay()) == record.result
+    assert GameRecord.from_text(record.to_text()) == record
@@ -0,0 +1,146 @@
+"""Test suite for the tablebase solver."""
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from orbito.core.game import OrbitGame
+from orbito.core.ai import MinimaxAI
+from orbito.core.ai.tablebase import (
+    DRAW, LOSS, WIN, Tablebase, decode_value, generate_tablebase,
+    parent_value, terminal_value
+)
+from orbito.core.bitboard import orbit_mask
+
+
+def play_random(game, turns, seed):
+    """Play random turns that do not end the game."""
+    rng = random.Random(seed)
+    for _ in range(turns):
+        moves = []
+        for index in range(16):
+            if game.push(index >> 2, index & 3):
+                if not game.move_made:
+                    moves.append(index)
+                game.pop()
+        index = rng.choice(moves)
+        game.push(index >> 2, index & 3)
+    return game
+
+
+def solve(white, black, mover, cache):
+    """Brute-force negamax over packed values."""
+    key = (white, black)
+    if key not in cache:
+        best = -1
+        for index in range(16):
+            if (white | black) >> index & 1:
+                continue
+            new_white = orbit_mask(white | (1 << index if mover == 1 else 0))
+            new_black = orbit_mask(black | (1 << index if mover == 2 else 0))
+            value = terminal_value(new_white, new_black, mover)
+            if value is None:
+                value = parent_value(solve(new_white, new_black, 3 - mover, cache))
+            best = max(best, value)
+        cache[key] = best
+    return cache[key]
+
+
+@pytest.fixture(scope="module")
+def midgame():
+    return play_random(OrbitGame(), 8, seed=3)
+
+
+@pytest.fixture(scope="module")
+def tablebase(midgame):
+    return generate_tablebase(midgame.white, midgame.black)
+
+
+def test_tablebase_matches_brute_force(midgame, tablebase):
+    """Test every solved position against a brute-force search."""
+    cache = {}
+    for key, value in zip(tablebase.keys.tolist(), tablebase.values):
+        white, black = key & 0xFFFF, key >> 16
+        mover = 1 if bin(white).count('1') == bin(black).count('1') else 2
+        assert solve(white, black, mover, cache) == value
+
+def test_tablebase_save_and_load(tmp_path, midgame, tablebase):
+    """Test a saved tablebase probes the same values."""
+    path = tmp_path / "orbito.tb"
+    tablebase.save(str(path))
+    loaded = Tablebase.load(str(path))
+    assert loaded.keys.tolist() == tablebase.keys.tolist()
+    assert len(loaded) == len(tablebase)
+    assert loaded.probe(midgame) == tablebase.probe(midgame)
+    assert loaded.best_move(midgame) == tablebase.best_move(midgame)
+
+def test_probe_requires_matching_side(midgame, tablebase):
+    """Test positions are only probed for the side implied by the counts."""
+    game = OrbitGame()
+    game.set_state(midgame.white, midgame.black, 2)
+    assert tablebase.probe(game) is None
+    assert tablebase.probe(midgame)[0] in (WIN, DRAW, LOSS)
+
+def test_full_depth_search_agrees_with_tablebase():
+    """Test exhaustive minimax picks moves of the optimal value."""
+    for seed in (0, 2, 3):
+        game = play_random(OrbitGame(), 10, seed=seed)
+        endgame = generate_tablebase(game.white, game.black)
+        expected = endgame.best_move(game)[1]
+
+        ai = MinimaxAI(game.current_player, difficulty='hard')
+        ai.depth_map['hard'] = 16
+        row, col = ai.get_best_move(game)
+        game.push(row, col)
+        if game.move_made:
+            value = terminal_value(game.white, game.black, ai.player)
+        else:
+            value = parent_value(endgame.probe_value(game.white, game.black))
+        assert decode_value(value) == expected
+
+def test_minimax_plays_tablebase_move(midgame, tablebase):
+    """Test MinimaxAI plays the tablebase move when one is available."""
+    ai = MinimaxAI(midgame.current_player, tablebase=tablebase)
+    assert ai.get_best_move(midgame) == tablebase.best_move(midgame)[0]
+    assert ai.nodes == 0
+
+def test_hard_engine_uses_installed_tablebase(tmp_path, monkeypatch, midgame, tablebase):
+    """Test a default hard engine opens the installed tablebase."""
+    from orbito.core.ai import tablebase as tablebase_module
+    path = tmp_path / 'orbito.tb'
+    tablebase.save(path)
+    monkeypatch.setattr(tablebase_module, 'DEFAULT_PATH', str(path))
+    monkeypatch.setattr(tablebase_module, '_default_tablebase', None)
+    ai = MinimaxAI(midgame.current_player, difficulty='hard')
+    assert ai.tablebase is not None
+    assert ai.get_best_move(midgame) == tablebase.best_move(midgame)[0]
+    assert ai.nodes == 0
+    assert MinimaxAI(midgame.current_player, difficulty='medium').tablebase is None
+    assert MinimaxAI(midgame.current_player, 'hard', tablebase=None).tablebase is None
+    ai.tablebase.close()
+    # A path opens that file, whatever the difficulty
+    ai = MinimaxAI(midgame.current_player, difficulty='medium', tablebase=str(path))
+    assert ai.get_best_move(midgame) == tablebase.best_move(midgame)[0]
+    ai.tablebase.close()
+
+def test_position_file_rejects_bad_files(tmp_path):
+    """Test the header is validated when opening a file."""
+    from orbito.core.ai.position_file import (
+        KIND_OPENING_BOOK, PositionFile, PositionFileError, write_position_file
+    )
+    path = tmp_path / "book.bin"
+    write_position_file(str(path), [3, 7, 42], [1, 500, 65535],
+                        KIND_OPENING_BOOK, value_size=2)
+    with PositionFile(str(path)) as book:
+        assert list(book.keys) == [3, 7, 42]
+        assert list(book.values) == [1, 500, 65535]
+    with pytest.raises(PositionFileError):
+        Tablebase.load(str(path))
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(PositionFileError):
+        PositionFile(str(path))
+    path.write_bytes(b"not a position file at all, clearly" * 2)
+    with pytest.raises(PositionFileError):
+        PositionFile(str(path))
@@ -0,0 +1,38 @@
+"""Test suite for the evaluation tuner."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from orbito.core.ai.dataset import export_dataset, load_dataset, random_positions
+from orbito.core.ai.evaluator import evaluate_position, load_weights, save_weights
+from orbito.core.ai.minmax import MinimaxAI
+from orbito.core.ai.tuning import CELL_CLASSES, tune_weights
+from orbito.core.game import OrbitGame
+
+
+def test_tuned_weights_fit_outcomes(tmp_path):
+    """Test tuning lowers the loss and its weights load into the evaluator."""
+    export_dataset(random_positions(2000, np.random.default_rng(5)), tmp_path / 'data',
+                   deduplicate=False)
+    result = tune_weights(load_dataset(tmp_path / 'data'), chunk_size=5000)
+    assert result.loss < result.initial_loss
+    for cells in CELL_CLASSES:
+        assert len({result.weights['cells'][cell] for cell in cells}) == 1
+
+    path = str(tmp_path / 'weights.json')
+    save_weights(path, result.weights)
+    weights = load_weights(path)
+    assert weights == result.weights
+    game = OrbitGame()
+    for row, col in [(1, 1), (0, 3), (2, 2)]:
+        game.push(row, col)
+    ai = MinimaxAI(1, weights=path)
+    assert ai.weights == weights
+    assert evaluate_position(game, 1, weights) != evaluate_position(game, 1)
+    assert ai.get_best_move(game) is not None
+
+    with open(path, 'w') as handle:
+        handle.write('{"three": 40, "four": 1}')
+    with pytest.raises(ValueError):
+        load_weights(path)